@@ -18,9 +18,22 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-from mdms.database.models import Base
+from mdms.database.models import Base, MOVIE_FTS_TABLE
 target_metadata = Base.metadata
 
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """
+    autogenerate 时忽略：
+    - SQLite FTS5 虚拟表及其影子表（由 DDL 创建，不在模型元数据中）；
+    - 仅 MySQL 创建的全文索引（模型中以 ddl_if 限定方言，autogenerate 比较时不会识别）
+    """
+    if type_ == 'table' and reflected and name.startswith(MOVIE_FTS_TABLE):
+        return False
+    if type_ == 'index' and name == 'ft_movies_title_synopsis' and context.get_context().dialect.name != 'mysql':
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -43,6 +56,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -66,7 +80,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
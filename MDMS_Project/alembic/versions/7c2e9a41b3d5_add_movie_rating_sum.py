@@ -0,0 +1,33 @@
+"""add movie rating_sum
+
+Revision ID: 7c2e9a41b3d5
+Revises: 20318da1d804
+Create Date: 2026-10-17 09:12:40.518233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e9a41b3d5'
+down_revision: Union[str, Sequence[str], None] = '20318da1d804'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movies', sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+    # 用现有影评回填评分总和
+    op.execute(
+        "UPDATE movies SET rating_sum = COALESCE("
+        "(SELECT SUM(reviews.rating) FROM reviews WHERE reviews.movie_id = movies.movie_id), 0)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('movies', 'rating_sum')
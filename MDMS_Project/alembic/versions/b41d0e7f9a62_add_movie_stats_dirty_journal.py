@@ -0,0 +1,48 @@
+"""add movie_stats_dirty journal
+
+Revision ID: b41d0e7f9a62
+Revises: 7c2e9a41b3d5
+Create Date: 2026-10-17 10:03:17.204981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from mdms.database.models import REVIEW_DIRTY_TRIGGERS, review_dirty_trigger_sql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41d0e7f9a62'
+down_revision: Union[str, Sequence[str], None] = '7c2e9a41b3d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'movie_stats_dirty',
+        sa.Column('entry_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('movie_id', sa.String(length=36), nullable=False),
+        sa.Column('marked_at', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('entry_id')
+    )
+    op.create_index(op.f('ix_movie_stats_dirty_movie_id'), 'movie_stats_dirty', ['movie_id'], unique=False)
+
+    dialect_name = op.get_bind().dialect.name
+    for trigger_name in REVIEW_DIRTY_TRIGGERS:
+        op.execute(review_dirty_trigger_sql(trigger_name, dialect_name))
+
+    # 首次升级时登记全部电影，下一次启动检查会完成一次全量校准
+    op.execute("INSERT INTO movie_stats_dirty (movie_id) SELECT movie_id FROM movies")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger_name in REVIEW_DIRTY_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+
+    op.drop_index(op.f('ix_movie_stats_dirty_movie_id'), table_name='movie_stats_dirty')
+    op.drop_table('movie_stats_dirty')
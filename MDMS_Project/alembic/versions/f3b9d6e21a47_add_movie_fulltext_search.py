@@ -0,0 +1,41 @@
+"""add movie fulltext search
+
+Revision ID: f3b9d6e21a47
+Revises: e5a8c3d17f20
+Create Date: 2026-10-17 14:08:41.517302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from mdms.database.models import MOVIE_FTS_DROP_DDL, create_movie_fts
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d6e21a47'
+down_revision: Union[str, Sequence[str], None] = 'e5a8c3d17f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'mysql':
+        op.create_index('ft_movies_title_synopsis', 'movies', ['title', 'synopsis'], unique=False,
+                        mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+    elif dialect_name == 'sqlite':
+        # FTS5 虚拟表、同步触发器，并为已有电影建立索引
+        create_movie_fts(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'mysql':
+        op.drop_index('ft_movies_title_synopsis', table_name='movies')
+    elif dialect_name == 'sqlite':
+        for statement in MOVIE_FTS_DROP_DDL:
+            op.execute(statement)
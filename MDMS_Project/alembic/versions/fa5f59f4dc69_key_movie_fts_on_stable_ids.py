@@ -0,0 +1,58 @@
+"""key movie fts on stable ids
+
+Revision ID: fa5f59f4dc69
+Revises: 5b547b6ff5d4
+Create Date: 2026-10-17 20:12:37.804153
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from mdms.database.models import MOVIE_FTS_DROP_DDL, MOVIE_FTS_KEYS_TABLE, create_movie_fts
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fa5f59f4dc69'
+down_revision: Union[str, Sequence[str], None] = '5b547b6ff5d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 旧版以 movies 的隐式 rowid 作为索引行号（VACUUM 后可能错位），仅用于降级
+LEGACY_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5("
+    "title, synopsis, content='movies', content_rowid='rowid', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS trg_movies_fts_insert AFTER INSERT ON movies BEGIN "
+    "INSERT INTO movies_fts (rowid, title, synopsis) VALUES (NEW.rowid, NEW.title, NEW.synopsis); END",
+    "CREATE TRIGGER IF NOT EXISTS trg_movies_fts_delete AFTER DELETE ON movies BEGIN "
+    "INSERT INTO movies_fts (movies_fts, rowid, title, synopsis) "
+    "VALUES ('delete', OLD.rowid, OLD.title, OLD.synopsis); END",
+    "CREATE TRIGGER IF NOT EXISTS trg_movies_fts_update AFTER UPDATE OF title, synopsis ON movies BEGIN "
+    "INSERT INTO movies_fts (movies_fts, rowid, title, synopsis) "
+    "VALUES ('delete', OLD.rowid, OLD.title, OLD.synopsis); "
+    "INSERT INTO movies_fts (rowid, title, synopsis) VALUES (NEW.rowid, NEW.title, NEW.synopsis); END",
+    "INSERT INTO movies_fts (movies_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite' or sa.inspect(bind).has_table(MOVIE_FTS_KEYS_TABLE):
+        return
+    # 删除按 rowid 关联的虚拟表与触发器，改为映射表编号后重新建立索引
+    for statement in MOVIE_FTS_DROP_DDL:
+        op.execute(statement)
+    create_movie_fts(bind)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in MOVIE_FTS_DROP_DDL:
+        op.execute(statement)
+    for statement in LEGACY_FTS_DDL:
+        op.execute(statement)
@@ -0,0 +1,180 @@
+import sys
+import os
+import time
+import uuid
+import random
+import argparse
+
+# ==========================================
+# 1. 环境配置 (确保能找到 mdms 模块)
+# ==========================================
+sys.path.append(os.getcwd())
+
+from sqlalchemy import insert, update, delete
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+from mdms.database.session import DATABASE_URL, create_db_engine
+from mdms.database.models import Base, Movie, User, Review, MovieStatsDirty
+from mdms.common.review_manager import review_manager
+
+# ==========================================
+# 2. 配置参数
+# ==========================================
+# 默认数据规模：1 万 / 10 万 / 100 万部电影
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+# 逐部电影重算（旧实现）在超过该规模时跳过，否则单次测试耗时过长
+DEFAULT_LEGACY_MAX = 100_000
+# 批量插入时每批的行数
+INSERT_BATCH = 5_000
+# 日志式检查中模拟的影评变动比例
+DIRTY_RATIO = 0.01
+# 参与评论的虚拟用户数（唯一约束要求同一用户对同一电影只能评论一次）
+BENCH_USER_COUNT = 20
+
+
+def default_bench_url():
+    """
+    基于 config.ini 的连接信息生成独立的压测库地址
+    MySQL 为 <db_name>_bench，SQLite 为 <文件名>_bench.db
+    压测会删除并重建所有表，因此绝不能直接指向业务库。
+    """
+    url = make_url(DATABASE_URL)
+    if url.get_backend_name() == 'sqlite':
+        root, _ = os.path.splitext(url.database)
+        return url.set(database=f"{root}_bench.db")
+    return url.set(database=f"{url.database}_bench")
+
+
+def seed(session_factory, movie_count, reviews_per_movie):
+    """
+    生成压测数据：movie_count 部电影，每部随机 0 ~ reviews_per_movie*2 条影评
+    """
+    with session_factory() as session:
+        user_ids = [str(uuid.uuid4()) for _ in range(BENCH_USER_COUNT)]
+        session.execute(insert(User), [
+            {'user_id': uid, 'username': f'bench_{i}', 'email': f'bench_{i}@bench.local',
+             'password_hash': '-', 'role': 'user'}
+            for i, uid in enumerate(user_ids)
+        ])
+
+        movie_rows, review_rows = [], []
+        for i in range(movie_count):
+            movie_id = str(uuid.uuid4())
+            movie_rows.append({'movie_id': movie_id, 'title': f'Bench Movie {i:07d}'})
+
+            k = min(random.randint(0, reviews_per_movie * 2), BENCH_USER_COUNT)
+            for uid in random.sample(user_ids, k):
+                review_rows.append({'review_id': str(uuid.uuid4()), 'movie_id': movie_id,
+                                    'user_id': uid, 'rating': random.randint(1, 10)})
+
+            if len(movie_rows) >= INSERT_BATCH:
+                session.execute(insert(Movie), movie_rows)
+                session.execute(insert(Review), review_rows)
+                movie_rows, review_rows = [], []
+
+        if movie_rows:
+            session.execute(insert(Movie), movie_rows)
+        if review_rows:
+            session.execute(insert(Review), review_rows)
+        session.commit()
+
+
+def reset_stats(session_factory):
+    """ 将所有电影的统计字段清零，使每轮重算都有同样的工作量 """
+    with session_factory() as session:
+        session.execute(update(Movie).values(rating_count=0, rating_sum=0, average_rating=0))
+        session.commit()
+
+
+def bench_sync_legacy(session_factory):
+    """ 旧实现：逐部电影调用 update_movie_status """
+    with session_factory() as session:
+        start = time.perf_counter()
+        for (mid,) in session.query(Movie.movie_id).all():
+            review_manager.update_movie_status(session, mid)
+        session.commit()
+        return time.perf_counter() - start
+
+
+def bench_sync_set_based(session_factory):
+    """ 新实现：集合式批量 UPDATE """
+    with session_factory() as session:
+        start = time.perf_counter()
+        review_manager.recompute_all_movie_stats(session)
+        session.commit()
+        return time.perf_counter() - start
+
+
+def bench_sync_journal(session_factory):
+    """ 日志式实现：随机登记 DIRTY_RATIO 比例的电影后，只重算这些电影 """
+    with session_factory() as session:
+        session.execute(delete(MovieStatsDirty))
+        movie_ids = [mid for (mid,) in session.query(Movie.movie_id).all()]
+        sample = random.sample(movie_ids, max(1, int(len(movie_ids) * DIRTY_RATIO)))
+        review_manager.mark_movies_dirty(session, sample)
+        session.commit()
+
+        start = time.perf_counter()
+        review_manager.reconcile_dirty_movie_stats(session)
+        session.commit()
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MDMS 数据库性能压测（启动评分同步）")
+    parser.add_argument('--url', action='append', default=None,
+                        help="压测库连接地址，可重复指定以依次压测多个后端（如 MySQL 与 SQLite）；"
+                             "默认为 config.ini 中的库加 _bench 后缀（MySQL 需预先创建）")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="电影数量规模列表")
+    parser.add_argument('--reviews-per-movie', type=int, default=3,
+                        help="每部电影的平均影评数")
+    parser.add_argument('--legacy-max', type=int, default=DEFAULT_LEGACY_MAX,
+                        help="超过该规模时跳过逐部重算的旧实现")
+    args = parser.parse_args()
+
+    urls = [make_url(u) for u in args.url] if args.url else [default_bench_url()]
+    for url in urls:
+        run_suite(url, args)
+
+
+def run_suite(url, args):
+    """ 针对单个数据库后端执行全部压测用例 """
+    production_url = make_url(DATABASE_URL)
+    if url.database == production_url.database and url.host == production_url.host:
+        print("[错误] 压测库不能与业务库相同，压测会清空所有表。")
+        return
+
+    # 使用与应用相同的引擎构建逻辑（连接池、SQLite PRAGMA 调优等）
+    engine = create_db_engine(url)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    print(f"\n压测库: {url.render_as_string(hide_password=True)}")
+    print(f"{'电影数':>10} | {'逐部重算 (s)':>14} | {'集合式重算 (s)':>16} | {'日志式检查 (s)':>16}")
+    print("-" * 67)
+
+    for size in args.sizes:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        seed(session_factory, size, args.reviews_per_movie)
+
+        legacy = "skipped"
+        if size <= args.legacy_max:
+            reset_stats(session_factory)
+            legacy = f"{bench_sync_legacy(session_factory):.3f}"
+
+        reset_stats(session_factory)
+        set_based = f"{bench_sync_set_based(session_factory):.3f}"
+
+        reset_stats(session_factory)
+        journal = f"{bench_sync_journal(session_factory):.3f}"
+
+        print(f"{size:>10} | {legacy:>14} | {set_based:>16} | {journal:>16}")
+
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# mdms/common/card_pool.py
+
+
+class CardPool:
+    """
+    画廊卡片复用池
+    翻页时不再 deleteLater 整页卡片再重新创建，而是把已有卡片重新绑定到新数据上：
+    数量不足时才创建新卡片，多余的卡片隐藏备用（布局需设置 isTight=True 以跳过隐藏控件）。
+    一批数据绑定期间暂停容器的重绘与布局计算，结束后只做一次布局。
+    """
+
+    def __init__(self, container, layout, factory):
+        """
+        :param container: 承载卡片的控件（FlowLayout 所在的 scrollWidget）
+        :param layout: 卡片所在的布局
+        :param factory: 无参函数，创建一张新卡片（parent 应为 container）
+        """
+        self.container = container
+        self.layout = layout
+        self.factory = factory
+        # 已创建的全部卡片，按布局顺序排列
+        self.cards = []
+
+    def update(self, items, bind):
+        """
+        将一批数据绑定到卡片上
+        :param items: 数据列表
+        :param bind: 绑定函数 bind(card, item)
+        :return: 当前显示的卡片列表
+        """
+        self.container.setUpdatesEnabled(False)
+        self.layout.setEnabled(False)
+        try:
+            while len(self.cards) < len(items):
+                card = self.factory()
+                self.layout.addWidget(card)
+                self.cards.append(card)
+
+            for card, item in zip(self.cards, items):
+                bind(card, item)
+                card.setVisible(True)
+
+            for card in self.cards[len(items):]:
+                card.setVisible(False)
+        finally:
+            self.layout.setEnabled(True)
+            self.layout.invalidate()
+            self.container.setUpdatesEnabled(True)
+
+        return self.cards[:len(items)]
@@ -0,0 +1,100 @@
+# mdms/common/count_cache.py
+import traceback
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from sqlalchemy import select, func
+
+from mdms.database.session import SessionLocal
+from mdms.database.instrumentation import sql_instrumentation
+
+
+class _CountTask(QRunnable):
+    """ 在线程池中使用独立会话执行一次 COUNT 查询 """
+
+    def __init__(self, cache, key, statement, generation):
+        super().__init__()
+        self.cache = cache
+        self.key = key
+        self.statement = statement
+        self.generation = generation
+
+    def run(self):
+        session = SessionLocal()
+        try:
+            # 去掉排序后包一层子查询计数，兼容带 JOIN / DISTINCT 的过滤条件
+            count_stmt = select(func.count()).select_from(self.statement.order_by(None).subquery())
+            with sql_instrumentation.action(f"{self.key[0]}.count"):
+                total = session.execute(count_stmt).scalar() or 0
+            # 跨线程发射信号，由 Qt 以队列方式投递回 GUI 线程
+            self.cache._taskFinished.emit(self.key, total, self.generation)
+        except Exception as e:
+            print(f"后台统计总数失败: {e}")
+            traceback.print_exc()
+            self.cache._taskFinished.emit(self.key, -1, self.generation)
+        finally:
+            session.close()
+
+
+class CountCache(QObject):
+    """
+    分页总数缓存服务类
+    画廊翻页时不再同步执行 query.count()（带 ilike 与 JOIN 时为全表扫描），
+    而是按“过滤条件组合”缓存总数：未命中时在后台线程池中计算，算完后通过 countReady 信号通知界面。
+    缓存键约定为元组，首个元素为命名空间（如 'movie_gallery'），其余为过滤条件。
+    电影、人员数据发生增删改时由对应的 Manager 调用 invalidate() 使缓存失效。
+    """
+
+    # 信号：后台计数完成，参数为 (缓存键, 总数)
+    countReady = Signal(object, int)
+    # 内部信号：线程池任务完成，参数为 (缓存键, 总数, 缓存代次)，总数为 -1 表示失败
+    _taskFinished = Signal(object, int, int)
+
+    def __init__(self):
+        super().__init__()
+        self._counts = {}
+        self._pending = set()
+        # 缓存代次：invalidate 后递增，丢弃失效前发起的计数结果
+        self._generation = 0
+        self._taskFinished.connect(self._on_task_finished)
+
+    def get(self, key):
+        """ 返回已缓存的总数，未缓存时返回 None """
+        return self._counts.get(key)
+
+    def put(self, key, total: int):
+        """ 直接写入已知的总数（例如翻到末页时可由行数精确推算） """
+        self._counts[key] = total
+
+    def request(self, key, statement):
+        """
+        获取总数：命中缓存直接返回；否则在后台计算并返回 None，结果通过 countReady 信号送达
+        :param statement: 已应用过滤条件的查询语句（如 query.statement）
+        """
+        if key in self._counts:
+            return self._counts[key]
+        if key not in self._pending:
+            self._pending.add(key)
+            QThreadPool.globalInstance().start(_CountTask(self, key, statement, self._generation))
+        return None
+
+    def invalidate(self, namespace=None):
+        """ 清空缓存；指定命名空间时只清空该命名空间下的条目 """
+        self._generation += 1
+        self._pending.clear()
+        if namespace is None:
+            self._counts.clear()
+        else:
+            self._counts = {k: v for k, v in self._counts.items() if k[0] != namespace}
+
+    def _on_task_finished(self, key, total, generation):
+        if generation != self._generation:
+            return
+        self._pending.discard(key)
+        if total < 0:
+            return
+        self._counts[key] = total
+        self.countReady.emit(key, total)
+
+
+# 单例实例
+count_cache = CountCache()
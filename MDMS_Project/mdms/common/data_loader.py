@@ -0,0 +1,107 @@
+# mdms/common/data_loader.py
+import traceback
+from contextlib import nullcontext
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from mdms.database.session import SessionLocal
+from mdms.database.instrumentation import sql_instrumentation
+
+
+class _LoadTask(QRunnable):
+    """ 线程池任务：使用独立会话执行查询函数，并把纯数据结果投递回 GUI 线程 """
+
+    def __init__(self, loader, channel, ticket, job, args, action):
+        super().__init__()
+        self.loader = loader
+        self.channel = channel
+        self.ticket = ticket
+        self.job = job
+        self.args = args
+        self.action = action
+
+    def run(self):
+        # 排队期间已被更新的请求取代：直接放弃，不再访问数据库
+        if not self.loader.is_current(self.channel, self.ticket):
+            return
+
+        session = SessionLocal()
+        try:
+            scope = sql_instrumentation.action(self.action) if self.action else nullcontext()
+            with scope:
+                result = self.job(session, *self.args)
+            error = None
+        except Exception as e:
+            traceback.print_exc()
+            result, error = None, str(e)
+        finally:
+            session.close()
+
+        try:
+            # 跨线程发射信号，由 Qt 以队列方式投递到 loader 所在的 GUI 线程
+            self.loader._taskFinished.emit(self.channel, self.ticket, result, error)
+        except RuntimeError:
+            # 发起请求的界面已被销毁（loader 随之释放），结果直接丢弃
+            pass
+
+
+class DataLoader(QObject):
+    """
+    后台数据加载服务
+    界面把查询函数 job(session, *args) 提交到全局线程池，job 在工作线程中使用独立的
+    SessionLocal 会话执行，并且只能返回与会话无关的纯数据（元组、字典等），
+    结果通过信号回到 GUI 线程后再交给回调刷新界面。
+
+    同一通道 (channel) 内“后来者优先”：新的请求会使旧请求失效，尚未开始的旧任务直接跳过，
+    已在执行的旧任务其结果会被丢弃，因此快速连续翻页不会堆积查询，也不会出现旧数据覆盖新数据。
+
+    通常每个界面持有一个以自身为 parent 的 DataLoader，界面销毁时未完成的结果自动作废。
+    """
+
+    # 内部信号：任务结束，参数为 (通道, 请求序号, 结果, 错误信息)
+    _taskFinished = Signal(str, int, object, object)
+
+    # 线程池优先级：空闲优先级的任务（如相邻页预取）排在普通加载之后执行
+    IDLE_PRIORITY = -1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tickets = {}
+        self._callbacks = {}
+        self._taskFinished.connect(self._on_task_finished)
+
+    def submit(self, channel: str, job, callback, *args, on_error=None, action=None, priority=0):
+        """
+        提交一次加载请求
+        :param channel: 请求通道，同一通道内只保留最新一次请求的结果
+        :param job: 在工作线程中执行的函数，签名为 job(session, *args)
+        :param callback: 在 GUI 线程中接收结果的回调
+        :param on_error: 在 GUI 线程中接收错误信息的回调（可选）
+        :param action: SQL 监测中的动作名称（可选）
+        :param priority: 线程池优先级，数值越大越先执行
+        :return: 本次请求的序号
+        """
+        ticket = self._tickets.get(channel, 0) + 1
+        self._tickets[channel] = ticket
+        self._callbacks[channel] = (callback, on_error)
+        QThreadPool.globalInstance().start(_LoadTask(self, channel, ticket, job, args, action), priority)
+        return ticket
+
+    def cancel(self, channel: str):
+        """ 作废该通道上所有未完成的请求 """
+        self._tickets[channel] = self._tickets.get(channel, 0) + 1
+        self._callbacks.pop(channel, None)
+
+    def is_current(self, channel: str, ticket: int) -> bool:
+        return self._tickets.get(channel) == ticket
+
+    def _on_task_finished(self, channel, ticket, result, error):
+        if not self.is_current(channel, ticket):
+            return
+        callback, on_error = self._callbacks.pop(channel, (None, None))
+        if error is not None:
+            print(f"后台加载数据失败 [{channel}]: {error}")
+            if on_error:
+                on_error(error)
+        elif callback:
+            callback(result)
@@ -10,6 +10,11 @@ class FluentPaginator(QWidget):
     """
     基于 QFluentWidgets 风格的自定义数字分页器
     替代收费的 Pager 组件，提供上一页、下一页及数字跳转功能。
+
+    支持两种模式：
+    - 精确模式：调用 set_total_items 设置总条数，显示完整页码；
+    - 免计数模式：总数尚未统计出来时调用 set_open_ended，只显示已浏览到的页码，
+      末尾以 “... 更多” 代替总页数，待后台统计完成后再调用 set_total_items 切换回精确模式。
     """
 
     # 信号：当页码发生改变时触发，参数为新的页码 (int)
@@ -23,6 +28,9 @@ class FluentPaginator(QWidget):
         self._page_size = 20
         self._current_page = 1
         self._total_pages = 1
+        # 免计数模式标志：为 True 时 _total_pages 仅表示已知存在的页数
+        self._open_ended = False
+        self._has_more = False
 
         # === UI 布局 ===
         self.hLayout = QHBoxLayout(self)
@@ -39,15 +47,47 @@ class FluentPaginator(QWidget):
 
     def set_total_items(self, total: int):
         """设置数据总条数"""
+        self._open_ended = False
+        self._has_more = False
         self._total_items = total
         self._calculate_pages()
         self._update_ui()
 
+    def set_open_ended(self, page: int, has_next: bool):
+        """
+        进入免计数模式：总数未知，只根据当前页是否存在下一页来扩展可跳转的页码
+        :param page: 当前页码
+        :param has_next: 当前页之后是否还有数据
+        """
+        if not self._open_ended:
+            self._open_ended = True
+            self._total_pages = 1
+        self._current_page = max(page, 1)
+        self._total_pages = max(self._total_pages, self._current_page)
+        # 只有已知的最后一页才需要关心“后面还有没有”
+        if self._current_page == self._total_pages:
+            self._has_more = has_next
+        self._update_ui()
+
+    def reset_open_ended(self):
+        """ 过滤条件变化后清空免计数模式下已浏览的页码 """
+        self._open_ended = False
+        self._has_more = False
+        self._total_pages = 1
+        self._current_page = 1
+
+    def is_open_ended(self) -> bool:
+        return self._open_ended
+
     def set_page_size(self, size: int):
         """设置每页显示的数量"""
         if size < 1: size = 1
         self._page_size = size
-        self._calculate_pages()
+        if self._open_ended:
+            # 免计数模式下已浏览的页码按旧的每页数量计算，换算后不再成立，回到第 1 页重新探测
+            self.reset_open_ended()
+        else:
+            self._calculate_pages()
         self._update_ui()
 
     def get_page_size(self) -> int:
@@ -83,11 +123,15 @@ class FluentPaginator(QWidget):
             new_page -= 1
         elif val == "next":
             new_page += 1
+        elif val == "more":
+            new_page = self._total_pages + 1
         elif isinstance(val, int):
             new_page = val
 
+        # 免计数模式下允许越过已知页数一页（即“更多”）
+        max_page = self._total_pages + 1 if self._open_ended and self._has_more else self._total_pages
         if new_page < 1: new_page = 1
-        if new_page > self._total_pages: new_page = self._total_pages
+        if new_page > max_page: new_page = max_page
 
         if new_page != self._current_page:
             self._current_page = new_page
@@ -145,7 +189,14 @@ class FluentPaginator(QWidget):
         curr = self._current_page
 
         # 逻辑：最多显示 7 个数字位 (不含上一页/下一页)
-        if total <= 7:
+        if self._open_ended:
+            # 免计数模式：首页 + 当前页附近 + 已知的最后一页，如 1 2 3 ... 更多
+            visible = sorted(p for p in {1, curr - 1, curr, curr + 1, total} if 1 <= p <= total)
+            for p in visible:
+                if page_nums and p - page_nums[-1] > 1:
+                    page_nums.append(0)
+                page_nums.append(p)
+        elif total <= 7:
             # 页数很少，全部显示: 1 2 3 4 5 6 7
             page_nums = list(range(1, total + 1))
         else:
@@ -178,5 +229,19 @@ class FluentPaginator(QWidget):
                     is_active=(num == self._current_page)
                 )
 
-        # 5. 下一页
-        self._create_icon_button(FIF.RIGHT_ARROW, "next", enabled=(self._current_page < self._total_pages))
\ No newline at end of file
+        # 5. 免计数模式下的 “... 更多” 入口
+        if self._open_ended and self._has_more:
+            dots = CaptionLabel("...", self)
+            dots.setAlignment(Qt.AlignCenter)
+            dots.setFixedWidth(20)
+            self.hLayout.addWidget(dots)
+
+            more_btn = TransparentPushButton("更多", self)
+            more_btn.setFixedSize(56, 32)
+            more_btn.setProperty("page_num", "more")
+            self.hLayout.addWidget(more_btn)
+            self.buttonGroup.addButton(more_btn)
+
+        # 6. 下一页
+        has_next_page = self._current_page < self._total_pages or (self._open_ended and self._has_more)
+        self._create_icon_button(FIF.RIGHT_ARROW, "next", enabled=has_next_page)
\ No newline at end of file
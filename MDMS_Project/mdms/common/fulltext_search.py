@@ -0,0 +1,145 @@
+# mdms/common/fulltext_search.py
+import threading
+
+from sqlalchemy import Table, Column, Integer, Text, MetaData, case, func, inspect, literal_column, select
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.orm import aliased
+
+from mdms.database.session import engine
+from mdms.database.models import Movie, MOVIE_FTS_TABLE, MOVIE_FTS_KEYS_TABLE
+
+
+# FTS5 虚拟表的轻量映射：仅用于构造查询，不属于 Base.metadata（表由 DDL 创建）
+movies_fts = Table(
+    MOVIE_FTS_TABLE, MetaData(),
+    Column('rowid', Integer),
+    Column('title', Text),
+    Column('synopsis', Text),
+)
+# 电影编号映射表：FTS5 行号 -> movie_id
+movies_fts_keys = Table(
+    MOVIE_FTS_KEYS_TABLE, MetaData(),
+    Column('fts_id', Integer),
+    Column('movie_id', Text),
+)
+
+
+class FullTextSearch:
+    """
+    电影标题 / 简介全文检索
+    Movie.title.ilike('%…%') 无法使用索引且只能搜索标题，该服务改用数据库的全文索引：
+    - MySQL：movies 上的 FULLTEXT(title, synopsis) 索引，ngram 分词器，布尔模式短语匹配；
+    - SQLite：FTS5 外部内容表 movies_fts，trigram 分词器，支持中文子串匹配；经映射表 movies_fts_keys 与电影关联。
+    结果按相关度排序：标题命中的电影排在前面，其余按全文相关度（MySQL 的 MATCH 得分 / SQLite 的 bm25）。
+
+    关键词短于分词长度（ngram 为 2，trigram 为 3）时全文索引无法匹配，调用方应回退为标题模糊搜索；
+    索引尚未创建（未执行迁移）或数据库不支持时同样回退。
+    """
+
+    # 各方言可使用全文索引的最短关键词长度
+    MIN_LENGTH = {'mysql': 2, 'sqlite': 3}
+    # bm25 列权重 (title, synopsis)：标题命中的权重更高
+    SQLITE_WEIGHTS = (10.0, 1.0)
+
+    def __init__(self, bind=engine):
+        self.bind = bind
+        self.dialect = bind.dialect.name
+        self._available = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """ 全文索引是否已创建（首次调用时检查数据库，结果缓存） """
+        with self._lock:
+            if self._available is None:
+                self._available = self._check_index()
+            return self._available
+
+    def usable(self, text: str) -> bool:
+        """ 该关键词能否走全文索引 """
+        min_length = self.MIN_LENGTH.get(self.dialect)
+        return bool(text) and min_length is not None and len(text) >= min_length and self.available()
+
+    def apply(self, query, text: str):
+        """ 为查询添加全文匹配条件 """
+        if self.dialect == 'sqlite':
+            return (query.join(movies_fts_keys, movies_fts_keys.c.movie_id == Movie.movie_id)
+                    .join(movies_fts, movies_fts.c.rowid == movies_fts_keys.c.fts_id)
+                    .filter(literal_column(MOVIE_FTS_TABLE).match(self._phrase(text))))
+        return query.filter(self._mysql_score(text))
+
+    def contains(self, text: str):
+        """
+        全文匹配的独立过滤条件（movie_id IN 子查询），可与其他条件 OR 组合
+        apply 的连接与 MATCH 条件不能放进 OR 中，需要组合时使用该方法；结果不提供相关度排序
+        """
+        if self.dialect == 'sqlite':
+            matched = (select(movies_fts_keys.c.movie_id)
+                       .join(movies_fts, movies_fts.c.rowid == movies_fts_keys.c.fts_id)
+                       .where(literal_column(MOVIE_FTS_TABLE).match(self._phrase(text))))
+            return Movie.movie_id.in_(matched)
+        # 子查询使用别名，避免与外层的 movies 自动关联
+        movie = aliased(Movie)
+        score = mysql_match(movie.title, movie.synopsis, against=self._phrase(text)).in_boolean_mode()
+        return Movie.movie_id.in_(select(movie.movie_id).where(score))
+
+    def rank_order(self, text: str):
+        """
+        相关度排序表达式列表（需与 apply 后的查询一起使用）
+        标题命中优先，其次按全文相关度
+        """
+        title_hit = case((Movie.title.ilike(f"%{text}%"), 0), else_=1)
+        if self.dialect == 'sqlite':
+            # bm25 越小越相关
+            return [title_hit, func.bm25(literal_column(MOVIE_FTS_TABLE), *self.SQLITE_WEIGHTS)]
+        return [title_hit, self._mysql_score(text).desc()]
+
+    def _mysql_score(self, text):
+        return mysql_match(Movie.title, Movie.synopsis, against=self._phrase(text)).in_boolean_mode()
+
+    def _phrase(self, text):
+        # 作为短语整体匹配；FTS5 中双引号以两个双引号转义，MySQL 布尔模式中直接去除
+        if self.dialect == 'sqlite':
+            return '"' + text.replace('"', '""') + '"'
+        return '"' + text.replace('"', ' ') + '"'
+
+    def _check_index(self):
+        try:
+            inspector = inspect(self.bind)
+            if self.dialect == 'sqlite':
+                return inspector.has_table(MOVIE_FTS_TABLE) and inspector.has_table(MOVIE_FTS_KEYS_TABLE)
+            if self.dialect == 'mysql':
+                return any(ix['name'] == 'ft_movies_title_synopsis' for ix in inspector.get_indexes('movies'))
+        except Exception as e:
+            print(f"检查全文索引失败，搜索将回退为标题模糊匹配: {e}")
+        return False
+
+
+class RankedPager:
+    """
+    相关度排序结果的分页器，接口与 KeysetPager 相同
+    相关度得分是查询时计算的表达式，无法作为键集锚点，这里使用 OFFSET 分页；
+    全文检索的结果集通常较小，用户也很少翻到很深的页。
+    """
+
+    def __init__(self, order_by):
+        """
+        :param order_by: 排序表达式列表，最后一项应为唯一列（通常为主键），以保证顺序稳定
+        """
+        self.order_by = list(order_by)
+
+    def reset(self):
+        pass
+
+    def fetch_page(self, query, page: int, page_size: int, total_items=None):
+        return self._query(query, page, page_size).limit(page_size).all()
+
+    def probe_page(self, query, page: int, page_size: int):
+        rows = self._query(query, page, page_size).limit(page_size + 1).all()
+        return rows[:page_size], len(rows) > page_size
+
+    def _query(self, query, page, page_size):
+        return query.order_by(*self.order_by).offset((max(page, 1) - 1) * page_size)
+
+
+# 单例实例
+fulltext_search = FullTextSearch()
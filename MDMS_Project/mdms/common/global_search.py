@@ -0,0 +1,195 @@
+# mdms/common/global_search.py
+from collections import namedtuple
+from functools import partial
+
+from PySide6.QtCore import QObject, Signal
+from sqlalchemy import or_, select
+
+from mdms.database.models import Movie, Person, MoviePerson, Review, User
+from mdms.common.data_loader import DataLoader
+from mdms.common.fulltext_search import fulltext_search
+from mdms.common.pinyin_search import pinyin_search
+
+
+# 一条搜索结果（纯数据，可跨线程传递）
+# source：结果来源（类型标签），target / target_id：点击后打开的详情页类型（'movie' / 'person'）与 ID，
+# score：合并排序用的得分，rank：在所属来源内的名次
+SearchHit = namedtuple('SearchHit', ['source', 'title', 'subtitle', 'target', 'target_id', 'score', 'rank'])
+
+# 影评匹配的范围：最近发布的影评篇数
+REVIEW_WINDOW = 5000
+
+
+def search_movies(session, text, limit):
+    """ 电影：标题 / 简介全文索引，拼音关键词（见 is_pinyin_query）同时按拼音检索键前缀匹配 """
+    query = session.query(Movie.movie_id, Movie.title, Movie.release_date)
+    if pinyin_search.is_pinyin_query(text):
+        # 短关键词只做检索键前缀匹配，不 OR 上 '%…%'，保证走索引范围扫描
+        pinyin_match = pinyin_search.prefix_match(Movie.title_pinyin, Movie.title_initials, text)
+        if fulltext_search.usable(text):
+            pinyin_match = or_(pinyin_match, fulltext_search.contains(text))
+        query = query.filter(pinyin_match).order_by(Movie.title)
+    elif fulltext_search.usable(text):
+        query = fulltext_search.apply(query, text).order_by(*fulltext_search.rank_order(text), Movie.movie_id)
+    else:
+        query = query.filter(Movie.title.ilike(f"%{text}%")).order_by(Movie.title)
+    return [
+        (title, str(release_date.year) if release_date else '', 'movie', movie_id)
+        for movie_id, title, release_date in query.limit(limit)
+    ]
+
+
+def search_people(session, text, limit):
+    """ 人员：拼音关键词按拼音检索键前缀匹配（走索引），其余按姓名模糊匹配 """
+    if pinyin_search.is_pinyin_query(text):
+        name_match = pinyin_search.prefix_match(Person.name_pinyin, Person.name_initials, text)
+    else:
+        name_match = Person.name.ilike(f"%{text}%")
+    query = session.query(Person.person_id, Person.name, Person.birthdate).filter(name_match).order_by(Person.name)
+    return [
+        (name, f"{birthdate.year} 年生" if birthdate else '', 'person', person_id)
+        for person_id, name, birthdate in query.limit(limit)
+    ]
+
+
+def search_characters(session, text, limit):
+    """
+    角色：演职员关联中的角色名，点击打开所属电影
+    按角色名顺序读取覆盖索引 idx_movies_people_character，凑满 limit 条即停止；
+    罕见关键词最多读完整个索引（不回表、不排序），代价与关联表的行数成正比
+    """
+    query = (
+        session.query(MoviePerson.character_name, MoviePerson.movie_id, Person.name, Movie.title)
+        .join(MoviePerson.person).join(MoviePerson.movie)
+        .filter(MoviePerson.character_name.ilike(f"%{text}%"))
+        .order_by(MoviePerson.character_name)
+    )
+    return [
+        (character, f"{name} 饰 ·《{title}》", 'movie', movie_id)
+        for character, movie_id, name, title in query.limit(limit)
+    ]
+
+
+def search_reviews(session, text, limit):
+    """
+    影评：评论内容，点击打开被评论的电影
+    只在最近的 REVIEW_WINDOW 篇影评中匹配：沿 idx_reviews_created_at 倒序读取固定数量的影评后再做模糊匹配，
+    罕见关键词也不会扫描、排序整张影评表
+    """
+    recent = (
+        select(Review.comment, Review.movie_id, Review.user_id, Review.created_at)
+        .order_by(Review.created_at.desc())
+        .limit(REVIEW_WINDOW)
+        .subquery()
+    )
+    query = (
+        session.query(recent.c.comment, recent.c.movie_id, User.username, Movie.title)
+        .join(User, User.user_id == recent.c.user_id)
+        .join(Movie, Movie.movie_id == recent.c.movie_id)
+        .filter(recent.c.comment.ilike(f"%{text}%"))
+        .order_by(recent.c.created_at.desc())
+    )
+    return [
+        (snippet(comment, text), f"{username} 评《{title}》", 'movie', movie_id)
+        for comment, movie_id, username, title in query.limit(limit)
+    ]
+
+
+def snippet(text, needle, width=40):
+    """ 截取关键词附近的一段文字 """
+    text = ' '.join((text or '').split())
+    if len(text) <= width:
+        return text
+    start = max(text.lower().find(needle.lower()) - width // 3, 0)
+    return ('…' if start else '') + text[start:start + width] + ('…' if start + width < len(text) else '')
+
+
+class GlobalSearch(QObject):
+    """
+    全局搜索服务
+    一个关键词同时查询电影、人员、角色、影评四个来源：每个来源是一个独立的后台任务，在线程池中并发执行，
+    各自使用该实体已有的索引（电影的全文索引与拼音检索键、人员的拼音检索键）；
+    角色名与影评内容没有文本索引：角色名沿覆盖索引顺序匹配，凑满结果数即停止；
+    影评只匹配最近的 REVIEW_WINDOW 篇（按发布时间索引读取），每次按键的代价有固定上限。
+
+    任一来源返回后立即与已到达的结果合并、按得分排序并通过 resultsUpdated 发出，
+    界面可以先展示最快返回的结果，较慢的来源完成后再补充。
+    得分 = 来源权重 × 匹配程度（名称与关键词相同 > 以关键词开头 > 包含关键词 > 其他方式命中，如拼音、简介）。
+    新的搜索发出后，旧搜索尚未返回的结果由 DataLoader 作废。
+    """
+
+    # 信号：结果更新，参数为 (请求序号, 合并后的结果列表, 是否所有来源均已返回)
+    resultsUpdated = Signal(int, list, bool)
+
+    # 来源：名称 -> (查询函数, 权重)，顺序即同分时的展示顺序
+    SOURCES = {
+        'movie': (search_movies, 1.0),
+        'person': (search_people, 0.95),
+        'character': (search_characters, 0.8),
+        'review': (search_reviews, 0.6),
+    }
+    # 每个来源最多返回的结果数
+    LIMIT = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.loader = DataLoader(self)
+        self._request = 0
+        self._hits = []
+        self._pending = set()
+
+    def search(self, text: str) -> int:
+        """
+        发起一次搜索
+        :return: 请求序号，resultsUpdated 中据此区分结果属于哪一次搜索
+        """
+        self._request += 1
+        self._hits = []
+        self._pending = set(self.SOURCES)
+        for source, (job, _) in self.SOURCES.items():
+            self.loader.submit(
+                f'global_{source}', job, partial(self._on_source_loaded, self._request, source, text),
+                text, self.LIMIT,
+                on_error=partial(self._on_source_failed, self._request, source),
+                action=f'global_search.{source}'
+            )
+        return self._request
+
+    def cancel(self):
+        """ 作废尚未返回的结果 """
+        self._request += 1
+        self._pending = set()
+        for source in self.SOURCES:
+            self.loader.cancel(f'global_{source}')
+
+    def _on_source_loaded(self, request, source, text, rows):
+        if request != self._request:
+            return
+        weight = self.SOURCES[source][1]
+        self._hits.extend(
+            SearchHit(source, title, subtitle, target, target_id, weight * self.match_quality(title, text), rank)
+            for rank, (title, subtitle, target, target_id) in enumerate(rows)
+        )
+        order = list(self.SOURCES)
+        self._hits.sort(key=lambda hit: (-hit.score, order.index(hit.source), hit.rank))
+        self._finish_source(request, source)
+
+    def _on_source_failed(self, request, source, error):
+        if request == self._request:
+            self._finish_source(request, source)
+
+    def _finish_source(self, request, source):
+        self._pending.discard(source)
+        self.resultsUpdated.emit(request, list(self._hits), not self._pending)
+
+    @staticmethod
+    def match_quality(title, text):
+        """ 名称与关键词的匹配程度 """
+        title, text = title.lower(), text.lower()
+        if title == text:
+            return 1.0
+        if title.startswith(text):
+            return 0.9
+        if text in title:
+            return 0.8
+        return 0.6
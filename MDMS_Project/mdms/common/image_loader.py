@@ -0,0 +1,208 @@
+# mdms/common/image_loader.py
+from collections import OrderedDict
+from functools import partial
+
+from PySide6.QtCore import QObject, QRunnable, QThread, QThreadPool, QSize, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader, QColor
+
+from mdms.common.thumbnail_cache import thumbnail_cache, DEFAULT_IMAGE
+
+
+class _DecodeTask(QRunnable):
+    """ 线程池任务：取得缩略图并按目标分辨率解码为 QImage """
+
+    def __init__(self, loader, key, ticket, path, tier, size, scale):
+        super().__init__()
+        # 由 loader 持有引用并负责释放，便于在排队期间通过 tryTake 取消
+        self.setAutoDelete(False)
+        self.loader = loader
+        self.key = key
+        self.ticket = ticket
+        self.path = path
+        self.tier = tier
+        self.size = size
+        self.scale = scale
+
+    def run(self):
+        # 排队期间卡片已被销毁或重新请求了其他图片
+        if not self.loader.is_current(self.key, self.ticket):
+            return
+
+        image = self.decode(thumbnail_cache.get(self.path, self.tier, self.scale))
+        if image.isNull():
+            # 文件缺失或已损坏：与同步加载时一样显示默认图片，结果照常写入内存缓存
+            image = self.decode(DEFAULT_IMAGE)
+
+        try:
+            self.loader._taskFinished.emit(self.key, self.ticket, image)
+        except RuntimeError:
+            pass
+
+    def decode(self, source):
+        reader = QImageReader(source)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        box = self.size * self.scale
+        if size.isValid() and (size.width() > box.width() or size.height() > box.height()):
+            # 直接以目标分辨率解码，不产生整幅原图
+            reader.setScaledSize(size.scaled(box, Qt.KeepAspectRatio))
+        return reader.read()
+
+
+class ImageLoader(QObject):
+    """
+    卡片图片异步加载服务
+    卡片创建时先显示占位图，海报 / 照片在专用线程池中解码（QImageReader.setScaledSize 按目标尺寸解码），
+    完成后在 GUI 线程中交给回调替换图片，翻页时不再同步解码整页 JPEG。
+
+    请求以显示图片的控件（owner）为单位：
+    - 同一控件再次请求时，旧请求作废（供复用卡片重新绑定数据时使用）；
+    - 控件销毁时，尚在排队的解码任务从线程池中移除，正在执行的任务结果被丢弃。
+
+    最近解码的图片保存在有限容量的内存 LRU 中，命中时回调同步执行；
+    prefetch() 以空闲优先级提前解码即将显示的图片（如相邻页的海报），翻页时直接从内存渲染。
+    """
+
+    # 内部信号：解码完成，参数为 (控件键, 请求序号, 图片)
+    _taskFinished = Signal(object, int, QImage)
+
+    # 占位图颜色
+    PLACEHOLDER_COLOR = QColor(0, 0, 0, 15)
+    # 内存中保留的已解码图片数量上限
+    MEMORY_CACHE_SIZE = 240
+    # 预取任务的线程池优先级，排在界面当前需要的解码之后
+    PREFETCH_PRIORITY = -1
+
+    def __init__(self):
+        super().__init__()
+        # 专用线程池：图片解码不占用数据库加载所用的全局线程池
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(2, min(4, QThread.idealThreadCount())))
+        self._requests = {}
+        self._tickets = {}
+        self._watched = set()
+        self._placeholders = {}
+        # (路径, 宽, 高, 倍率, 档位) -> 已解码图片，按最近使用排序
+        self._memory = OrderedDict()
+        self._taskFinished.connect(self._on_task_finished)
+
+    def placeholder(self, size: QSize) -> QImage:
+        """ 返回指定尺寸的纯色占位图（按尺寸缓存） """
+        key = (size.width(), size.height())
+        image = self._placeholders.get(key)
+        if image is None:
+            image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+            image.fill(self.PLACEHOLDER_COLOR)
+            self._placeholders[key] = image
+        return image
+
+    def load(self, owner, path, size: QSize, callback, tier='card'):
+        """
+        异步加载一张图片
+        :param owner: 显示图片的控件，用于取消与去重
+        :param path: 原图路径（数据库中的 poster_url / photo_url）
+        :param size: 目标显示尺寸（逻辑像素），解码结果不超过该尺寸乘以屏幕像素比
+        :param callback: 在 GUI 线程中接收解码后 QImage 的回调
+        :param tier: 缩略图档位
+        """
+        key = id(owner)
+        if key not in self._watched:
+            self._watched.add(key)
+            owner.destroyed.connect(partial(self._on_owner_destroyed, key))
+
+        scale = 2 if owner.devicePixelRatioF() > 1 else 1
+        self.request(key, path, size, callback, scale, tier)
+
+    def request(self, key, path, size: QSize, callback, scale=1, tier='card'):
+        """
+        以任意可哈希的键发起请求，供没有独立控件的调用方（如列表模型中的条目）使用
+        同一键再次请求时旧请求作废；调用方不再需要该键时应调用 release()
+        """
+        self._cancel_task(key)
+
+        ticket = self._tickets.get(key, 0) + 1
+        self._tickets[key] = ticket
+
+        cache_key = self._cache_key(path, size, scale, tier)
+        image = self._memory.get(cache_key)
+        if image is not None:
+            # 内存命中：不再经过线程池，直接交给回调
+            self._memory.move_to_end(cache_key)
+            callback(image)
+            return
+
+        task = _DecodeTask(self, key, ticket, path, tier, QSize(size), scale)
+        self._requests[key] = (task, callback, cache_key)
+        self.pool.start(task)
+
+    def prefetch(self, group, path, size: QSize, scale=1, tier='card'):
+        """
+        以空闲优先级预先解码一张图片到内存缓存
+        :param group: 预取分组（通常为发起预取的界面），可通过 cancel_prefetch 整组取消
+        """
+        cache_key = self._cache_key(path, size, scale, tier)
+        key = ('prefetch', group, cache_key)
+        if cache_key in self._memory or key in self._requests:
+            return
+
+        ticket = self._tickets.get(key, 0) + 1
+        self._tickets[key] = ticket
+        task = _DecodeTask(self, key, ticket, path, tier, QSize(size), scale)
+        self._requests[key] = (task, None, cache_key)
+        self.pool.start(task, self.PREFETCH_PRIORITY)
+
+    def cancel_prefetch(self, group):
+        """ 取消该分组中尚未完成的预取 """
+        for key in [k for k in self._requests if isinstance(k, tuple) and k[:2] == ('prefetch', group)]:
+            self.release(key)
+
+    def cancel(self, owner):
+        """ 取消控件上未完成的图片请求 """
+        self._cancel_task(id(owner))
+
+    def release(self, key):
+        """ 取消该键上未完成的请求并清除其状态 """
+        self._cancel_task(key)
+        self._tickets.pop(key, None)
+
+    def is_current(self, key, ticket) -> bool:
+        return self._tickets.get(key) == ticket
+
+    def _cancel_task(self, key):
+        entry = self._requests.pop(key, None)
+        if entry is None:
+            return
+        self._tickets[key] = self._tickets.get(key, 0) + 1
+        # 尚未开始执行的任务直接从队列中移除
+        self.pool.tryTake(entry[0])
+
+    def _on_owner_destroyed(self, key, *args):
+        self.release(key)
+        self._watched.discard(key)
+
+    def _on_task_finished(self, key, ticket, image):
+        if not self.is_current(key, ticket):
+            return
+        entry = self._requests.pop(key, None)
+        if entry is None or image.isNull():
+            return
+        _, callback, cache_key = entry
+
+        self._memory[cache_key] = image
+        self._memory.move_to_end(cache_key)
+        while len(self._memory) > self.MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+
+        if callback:
+            callback(image)
+        else:
+            # 预取任务没有接收者，完成后清除其状态
+            self._tickets.pop(key, None)
+
+    @staticmethod
+    def _cache_key(path, size, scale, tier):
+        return (path, size.width(), size.height(), scale, tier)
+
+
+# 单例实例
+image_loader = ImageLoader()
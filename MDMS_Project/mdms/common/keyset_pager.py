@@ -0,0 +1,117 @@
+import threading
+
+from sqlalchemy import and_, or_
+
+
+class KeysetPager:
+    """
+    键集（Seek）分页器
+    以稳定的排序键（如 (title, movie_id)）记录每页的起始锚点，翻页时使用
+    WHERE (排序键) > 锚点 ORDER BY 排序键 LIMIT n 代替 OFFSET，深页查询无需跳过前面所有行。
+
+    为了让 FluentPaginator 仍然可以跳转到任意页码，分页器维护一个“页码 -> 锚点”缓存：
+    - 目标页的锚点已知：直接 seek；
+    - 目标页的锚点未知：从最近的已知锚点 seek 后只跳过两页之间的行（近似 seek）；
+    - 目标页更靠近末尾且已知总数：按倒序从末尾 seek，跳转“最后一页”同样是常数代价。
+    过滤条件或每页数量变化时必须调用 reset() 清空锚点。
+
+    总数未知时使用 probe_page：多取一行（limit+1）判断是否存在下一页。
+    查询可能在后台加载线程中执行，锚点缓存的读写由锁保护。
+    """
+
+    def __init__(self, key_columns):
+        """
+        :param key_columns: 排序键列，最后一列必须唯一（通常为主键），以保证顺序稳定
+        """
+        self.key_columns = list(key_columns)
+        self._anchors = {1: None}
+        self._page_size = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """ 清空锚点缓存 """
+        with self._lock:
+            self._anchors = {1: None}
+
+    def fetch_page(self, query, page: int, page_size: int, total_items=None):
+        """
+        获取指定页的数据
+        :param query: 已应用过滤条件、尚未排序的查询对象
+        :param total_items: 符合条件的总数（可选），用于从末尾倒序定位
+        """
+        rows, _ = self._fetch(query, page, page_size, total_items, probe_next=False)
+        return rows
+
+    def probe_page(self, query, page: int, page_size: int):
+        """
+        总数未知时获取指定页：多取一行以判断是否存在下一页
+        :return: (本页数据, 是否存在下一页)
+        """
+        return self._fetch(query, page, page_size, None, probe_next=True)
+
+    def _fetch(self, query, page, page_size, total_items, probe_next):
+        with self._lock:
+            if page_size != self._page_size:
+                self._page_size = page_size
+                self._anchors = {1: None}
+            anchors = dict(self._anchors)
+        page = max(page, 1)
+        fetch_size = page_size + 1 if probe_next else page_size
+
+        if page in anchors:
+            rows = self._seek(query, anchors[page], fetch_size)
+        else:
+            known = max(p for p in anchors if p < page)
+            # 从最近锚点正向 seek 时需要跳过的行数
+            forward_skip = (page - known) * page_size
+
+            # 目标页的行数与其后的行数（仅在总数已知时可计算）
+            page_rows, tail_skip = 0, None
+            if total_items is not None:
+                page_rows = min(page_size, total_items - (page - 1) * page_size)
+                tail_skip = max(total_items - page * page_size, 0)
+
+            if page_rows > 0 and tail_skip < forward_skip:
+                # 目标页离末尾更近：倒序扫描，只跳过目标页之后的行
+                rows = self._seek_backward(query, tail_skip, page_rows)
+            else:
+                rows = self._seek(query, anchors[known], fetch_size, skip=forward_skip)
+
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        # 记录下一页的锚点：本页最后一行的排序键
+        if len(rows) == page_size:
+            with self._lock:
+                self._anchors[page + 1] = self._key_of(rows[-1])
+        return rows, has_next
+
+    def _seek(self, query, anchor, limit, skip=0):
+        if anchor is not None:
+            query = query.filter(self._after(anchor))
+        query = query.order_by(*self.key_columns)
+        if skip:
+            query = query.offset(skip)
+        return query.limit(limit).all()
+
+    def _seek_backward(self, query, skip, limit):
+        query = query.order_by(*[c.desc() for c in self.key_columns])
+        if skip:
+            query = query.offset(skip)
+        rows = query.limit(limit).all()
+        rows.reverse()
+        return rows
+
+    def _after(self, anchor):
+        """
+        构造 “排序键 > 锚点” 条件
+        展开为 (a > x) OR (a = x AND b > y) ... 的形式，而不是行构造器比较，以便各数据库都能走索引范围扫描
+        """
+        clauses = []
+        for i, column in enumerate(self.key_columns):
+            equals = [self.key_columns[j] == anchor[j] for j in range(i)]
+            clauses.append(and_(*equals, column > anchor[i]))
+        return or_(*clauses)
+
+    def _key_of(self, row):
+        return tuple(getattr(row, c.key) for c in self.key_columns)
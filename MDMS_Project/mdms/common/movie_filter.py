@@ -0,0 +1,168 @@
+# mdms/common/movie_filter.py
+from collections import namedtuple
+from datetime import date
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from mdms.database.models import Movie, Genre, movies_genres_table
+
+
+# 电影库的多维筛选条件（纯数据、可哈希，直接作为总数缓存与分页缓存键的一部分）
+# genres：类型名称元组，match_all_genres 为 True 时须同时属于所有类型，否则属于任一类型即可；
+# 其余字段为 None 时表示不限
+_MovieFilterBase = namedtuple('MovieFilter', [
+    'genres', 'match_all_genres', 'year_from', 'year_to', 'country', 'language',
+    'runtime_min', 'runtime_max', 'min_rating', 'min_rating_count',
+], defaults=((), False, None, None, None, None, None, None, None, None))
+
+
+class selective(FunctionElement):
+    """
+    标记选择度较高（命中行较少）的范围条件
+    SQLite 未启用 STAT4 时没有列值分布，一律按 1/4 估计范围条件的命中行数，
+    对带 LIMIT 的取页语句会选择按排序键索引 (title, movie_id) 逐行检查，条件命中少时几乎读完整个索引。
+    在 SQLite 上渲染为 likelihood(条件, 概率)，让优化器改为在条件列的索引上定位、再对命中的行排序；
+    其他数据库按索引统计估计范围，原样输出条件。
+    """
+
+    name = 'selective'
+    inherit_cache = True
+    # 向 SQLite 声明的命中概率
+    PROBABILITY = 0.05
+
+
+@compiles(selective)
+def _compile_selective(element, compiler, **kw):
+    return compiler.process(list(element.clauses)[0], **kw)
+
+
+@compiles(selective, 'sqlite')
+def _compile_selective_sqlite(element, compiler, **kw):
+    return f"likelihood({compiler.process(list(element.clauses)[0], **kw)}, {selective.PROBABILITY})"
+
+
+class MovieFilter(_MovieFilterBase):
+    """ 电影库的多维筛选条件 """
+
+    __slots__ = ()
+
+    def is_empty(self) -> bool:
+        """ 是否没有任何筛选条件 """
+        return self == MovieFilter()
+
+    def count(self) -> int:
+        """ 生效的筛选维度数量（用于在筛选按钮上提示） """
+        ranges = [(self.year_from, self.year_to), (self.runtime_min, self.runtime_max)]
+        values = [self.country, self.language, self.min_rating, self.min_rating_count]
+        return (bool(self.genres) + sum(lo is not None or hi is not None for lo, hi in ranges)
+                + sum(value is not None for value in values))
+
+
+class MovieQueryBuilder:
+    """
+    电影查询构建器
+    把各维度的筛选条件逐一叠加到查询上，每个方法返回构建器本身，可链式调用；参数为 None / 空时该维度不限。
+    条件都写成可利用索引的形式（SARGable），每种常见组合都有对应的索引可走，不会全表扫描：
+
+    - 上映年份：换算为 release_date 的日期区间，不对列套用函数；
+    - 国家 / 语言：等值条件，复合索引 (country / language, title, movie_id) 在定位的同时给出画廊的键集顺序，
+      取一页只需按索引顺序读取 LIMIT 行；
+    - 片长：单列范围条件，使用独立索引；
+    - 最低评分、最低评分人数：单列范围条件，标记为 selective，在各自的索引上定位后对命中的行排序
+      （不按标题索引逐行检查，取页的代价与 COUNT 同阶）；
+    - 多类型：IN 子查询只读取 movies_genres 上 (genre_id, movie_id) 的覆盖索引，“全部满足”时每个类型各一个 IN 条件。
+
+    使用示例：
+        MovieQueryBuilder(Query(Movie.movie_id)).year_range(1990, 1999).country('美国').build()
+    """
+
+    def __init__(self, query):
+        """
+        :param query: 基础查询（通常是未绑定会话的 Query，只投影画廊需要的列）
+        """
+        self.query = query
+
+    def apply(self, movie_filter: MovieFilter):
+        """ 一次叠加 MovieFilter 中的全部条件 """
+        return (self.genres(movie_filter.genres, movie_filter.match_all_genres)
+                .year_range(movie_filter.year_from, movie_filter.year_to)
+                .country(movie_filter.country)
+                .language(movie_filter.language)
+                .runtime_range(movie_filter.runtime_min, movie_filter.runtime_max)
+                .min_rating(movie_filter.min_rating)
+                .min_rating_count(movie_filter.min_rating_count))
+
+    def genres(self, names, match_all=False):
+        """
+        类型筛选
+        :param names: 类型名称序列
+        :param match_all: True 为同时属于所有类型（AND），False 为属于任一类型（OR）
+        """
+        names = sorted(set(names or ()))
+        if not names:
+            return self
+        # 全部满足：每个类型各一个 IN 条件，而不是分组计数（按 movie_id 分组会扫描整个关联表）
+        for group in ([name] for name in names) if match_all else [names]:
+            movie_ids = (
+                select(movies_genres_table.c.movie_id)
+                .join(Genre, Genre.genre_id == movies_genres_table.c.genre_id)
+                .where(Genre.name.in_(group))
+            )
+            self._filter(Movie.movie_id.in_(movie_ids))
+        return self
+
+    def year_range(self, start=None, end=None):
+        """ 上映年份区间（含两端） """
+        if start is not None:
+            self._filter(Movie.release_date >= date(start, 1, 1))
+        if end is not None:
+            self._filter(Movie.release_date < date(end + 1, 1, 1))
+        return self
+
+    def country(self, country):
+        """ 国家 / 地区 """
+        return self._filter(Movie.country == country) if country else self
+
+    def language(self, language):
+        """ 语言 """
+        return self._filter(Movie.language == language) if language else self
+
+    def runtime_range(self, minimum=None, maximum=None):
+        """ 片长区间（分钟，含两端） """
+        if minimum is not None:
+            self._filter(Movie.runtime_minutes >= minimum)
+        if maximum is not None:
+            self._filter(Movie.runtime_minutes <= maximum)
+        return self
+
+    def min_rating(self, rating):
+        """ 最低平均评分 """
+        return self._filter(selective(Movie.average_rating >= rating)) if rating is not None else self
+
+    def min_rating_count(self, count):
+        """ 最低评分人数 """
+        return self._filter(selective(Movie.rating_count >= count)) if count is not None else self
+
+    def build(self):
+        """ 返回叠加全部条件后的查询 """
+        return self.query
+
+    def _filter(self, condition):
+        self.query = self.query.filter(condition)
+        return self
+
+
+def fetch_facet_options(session):
+    """
+    后台线程：筛选面板的候选项
+    :return: (类型名称列表, 国家 / 地区列表, 语言列表)，国家与语言按电影数量降序
+    """
+    def distinct_values(column):
+        return [value for value, in
+                session.query(column).filter(column.isnot(None), column != '')
+                .group_by(column).order_by(func.count().desc(), column)]
+
+    genres = [name for name, in session.query(Genre.name).order_by(Genre.name)]
+    return genres, distinct_values(Movie.country), distinct_values(Movie.language)
@@ -1,4 +1,10 @@
 from mdms.database.models import Movie
+from mdms.database.session import run_after_commit
+from mdms.common.count_cache import count_cache
+from mdms.common.page_cache import page_cache
+from mdms.common.pinyin_search import pinyin_search
+from mdms.common.trigram_index import fuzzy_search
+from mdms.common.prefix_index import autocomplete
 
 
 class MovieManager:
@@ -19,8 +25,16 @@ class MovieManager:
         :param movie_data: 包含电影信息的字典 (form_data)
         """
         new_movie = Movie(**movie_data)
+        pinyin_search.fill_movie(new_movie)
         session.add(new_movie)
         session.flush()
+        # 提交成功后同步更新容错搜索索引与自动补全索引
+        fuzzy_search.put_movie(session, new_movie)
+        autocomplete.put_movie(session, new_movie)
+        # 数据变化后，画廊按过滤条件缓存的总数与分页结果随之失效（提交成功后才失效，
+        # 否则提交前的后台查询可能把旧数据重新写回缓存）
+        run_after_commit(session, count_cache.invalidate, 'movie_gallery')
+        run_after_commit(session, page_cache.invalidate, 'movie_gallery')
         return new_movie
 
     def update_movie(self, session, movie_id, movie_data: dict):
@@ -38,7 +52,16 @@ class MovieManager:
             if hasattr(movie, key):
                 setattr(movie, key, value)
 
+        # 标题变化时同步拼音检索键
+        if 'title' in movie_data:
+            pinyin_search.fill_movie(movie)
+
         session.flush()
+        if 'title' in movie_data:
+            fuzzy_search.put_movie(session, movie)
+            autocomplete.put_movie(session, movie)
+        run_after_commit(session, count_cache.invalidate, 'movie_gallery')
+        run_after_commit(session, page_cache.invalidate, 'movie_gallery')
         return movie
 
     def delete_movie(self, session, movie_id):
@@ -49,6 +72,10 @@ class MovieManager:
         if movie:
             session.delete(movie)
             session.flush()
+            fuzzy_search.remove_movie(session, movie_id)
+            autocomplete.remove_movie(session, movie_id)
+            run_after_commit(session, count_cache.invalidate, 'movie_gallery')
+            run_after_commit(session, page_cache.invalidate, 'movie_gallery')
             return True
         return False
 
@@ -0,0 +1,82 @@
+# mdms/common/page_cache.py
+from collections import OrderedDict
+
+
+class PageCache:
+    """
+    画廊分页结果缓存（LRU）
+    来回翻页、切换类型后再切回时，相同的分页查询会被重复执行。
+    该缓存以 (画廊, 过滤条件..., 排序, 页码, 每页数量) 为键保存一页的查询结果，
+    结果只包含轻量的卡片数据元组，不持有 ORM 对象或数据库会话。
+
+    - 容量有限，超出时淘汰最久未使用的页；
+    - movie_manager / person_manager / review_manager 写入后按命名空间（键的第一个元素）失效；
+    - 失效会递增代数：失效前已发出、失效后才返回的查询结果不会被写入缓存；
+    - hits / misses 统计命中情况，可通过 stats() 查看。
+
+    缓存只在 GUI 线程中读写。
+    """
+
+    # 默认容量（页数）
+    CAPACITY = 64
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self._pages = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self):
+        """ 当前代数：发起查询时记录，写入结果时与之比较 """
+        return self._generation
+
+    def get(self, key):
+        """ 读取缓存的一页结果，未命中返回 None """
+        result = self._pages.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._pages.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result, generation=None):
+        """
+        写入一页结果
+        :param generation: 发起查询时的代数，与当前代数不一致说明期间发生过写入，结果丢弃
+        """
+        if generation is not None and generation != self._generation:
+            return
+        self._pages[key] = result
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.capacity:
+            self._pages.popitem(last=False)
+
+    def __contains__(self, key):
+        # 仅判断是否存在，不计入命中统计
+        return key in self._pages
+
+    def invalidate(self, namespace=None):
+        """ 清空缓存；指定命名空间时只清空该命名空间下的条目 """
+        self._generation += 1
+        if namespace is None:
+            self._pages.clear()
+        else:
+            for key in [k for k in self._pages if k[0] == namespace]:
+                del self._pages[key]
+
+    def stats(self):
+        """ 命中统计：{'hits', 'misses', 'hit_rate', 'size'} """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._pages),
+        }
+
+
+# 单例实例
+page_cache = PageCache()
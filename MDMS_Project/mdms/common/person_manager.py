@@ -1,4 +1,12 @@
+from sqlalchemy.orm import undefer
+
 from mdms.database.models import Person
+from mdms.database.session import run_after_commit
+from mdms.common.count_cache import count_cache
+from mdms.common.page_cache import page_cache
+from mdms.common.pinyin_search import pinyin_search
+from mdms.common.trigram_index import fuzzy_search
+from mdms.common.prefix_index import autocomplete
 
 
 class PersonManager:
@@ -11,7 +19,8 @@ class PersonManager:
         """
         获取所有人员列表，按姓名排序
         """
-        return session.query(Person).order_by(Person.name).all()
+        # 管理表格需要展示简介，一并加载延迟列，避免逐行单独查询
+        return session.query(Person).options(undefer(Person.bio)).order_by(Person.name).all()
 
     def add_person(self, session, person_data: dict):
         """
@@ -19,8 +28,16 @@ class PersonManager:
         :param person_data: 包含人员信息的字典
         """
         new_person = Person(**person_data)
+        pinyin_search.fill_person(new_person)
         session.add(new_person)
         session.flush()
+        # 提交成功后同步更新容错搜索索引与自动补全索引
+        fuzzy_search.put_person(session, new_person)
+        autocomplete.put_person(session, new_person)
+        # 数据变化后，画廊按过滤条件缓存的总数与分页结果随之失效（提交成功后才失效，
+        # 否则提交前的后台查询可能把旧数据重新写回缓存）
+        run_after_commit(session, count_cache.invalidate, 'people_gallery')
+        run_after_commit(session, page_cache.invalidate, 'people_gallery')
         return new_person
 
     def update_person(self, session, person_id, person_data: dict):
@@ -39,7 +56,16 @@ class PersonManager:
             if hasattr(person, key):
                 setattr(person, key, value)
 
+        # 姓名变化时同步拼音检索键
+        if 'name' in person_data:
+            pinyin_search.fill_person(person)
+
         session.flush()
+        if 'name' in person_data:
+            fuzzy_search.put_person(session, person)
+            autocomplete.put_person(session, person)
+        run_after_commit(session, count_cache.invalidate, 'people_gallery')
+        run_after_commit(session, page_cache.invalidate, 'people_gallery')
         return person
 
     def delete_person(self, session, person_id):
@@ -50,6 +76,10 @@ class PersonManager:
         if person:
             session.delete(person)
             session.flush()
+            fuzzy_search.remove_person(session, person_id)
+            autocomplete.remove_person(session, person_id)
+            run_after_commit(session, count_cache.invalidate, 'people_gallery')
+            run_after_commit(session, page_cache.invalidate, 'people_gallery')
             return True
         return False
 
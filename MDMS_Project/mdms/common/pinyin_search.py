@@ -0,0 +1,140 @@
+# mdms/common/pinyin_search.py
+import re
+
+from sqlalchemy import or_, and_
+
+from mdms.database.session import engine
+
+try:
+    from pypinyin import lazy_pinyin, Style
+except ImportError:
+    # 可选依赖：未安装时拼音列保持为空，搜索仍按名称匹配
+    lazy_pinyin = None
+    Style = None
+
+
+class PinyinSearch:
+    """
+    中文标题 / 姓名的拼音与首字母搜索
+    片库以中文为主，用户常直接输入全拼（xiaoshenke）或首字母（xsk）。
+    电影标题与人员姓名各有两列预先计算好的检索键，由导入脚本与 movie_manager / person_manager 写入时填充：
+    - 全拼：肖申克的救赎 -> xiaoshenkedejiushu
+    - 首字母：肖申克的救赎 -> xskdjs，J·K·西蒙斯 -> jkxms
+    检索键只含小写字母与数字，搜索时对其做前缀匹配，可以直接走索引范围扫描，不需要 '%…%' 全表扫描。
+
+    拼音转换依赖 pypinyin（可选），未安装时检索键为空，不影响原有的名称搜索。
+    """
+
+    # 非汉字片段中的单词（英文片名、外文人名缩写等）
+    WORD_PATTERN = re.compile(r'[a-z0-9]+')
+    # 普通话拼音音节（ü 写作 v，不含 m、ng 等叹词音节），用于判断关键词能否切分为全拼
+    SYLLABLES = frozenset((
+        'a ai an ang ao ba bai ban bang bao bei ben beng bi bian biang biao bie bin bing bo bong bu ca cai '
+        'can cang cao ce cei cen ceng cha chai chan chang chao che chen cheng chi chong chou chu chua chuai '
+        'chuan chuang chui chun chuo ci cong cou cu cuan cui cun cuo da dai dan dang dao de dei den deng di '
+        'dia dian diao die din ding diu dong dou du duan dui dun duo e ei en eng er fa fan fang fei fen feng '
+        'fiao fo fou fu ga gai gan gang gao ge gei gen geng gong gou gu gua guai guan guang gui gun guo ha '
+        'hai han hang hao he hei hen heng hong hou hu hua huai huan huang hui hun huo ji jia jian jiang jiao '
+        'jie jin jing jiong jiu ju juan jue jun ka kai kan kang kao ke kei ken keng kong kou ku kua kuai kuan '
+        'kuang kui kun kuo la lai lan lang lao le lei len leng li lia lian liang liao lie lin ling liu lo '
+        'long lou lu luan lun luo lv lve ma mai man mang mao me mei men meng mi mian miao mie min ming miu mo '
+        'mou mu na nai nan nang nao ne nei nen neng ni nia nian niang niao nie nin ning niu nong nou nu nuan '
+        'nun nuo nv nve o ou pa pai pan pang pao pei pen peng pi pian piao pie pin ping po pou pu qi qia qian '
+        'qiang qiao qie qin qing qiong qiu qu quan que qun ran rang rao re ren reng ri rong rou ru rua ruan '
+        'rui run ruo sa sai san sang sao se sen seng sha shai shan shang shao she shei shen sheng shi shou '
+        'shu shua shuai shuan shuang shui shun shuo si song sou su suan sui sun suo ta tai tan tang tao te '
+        'tei teng ti tian tiao tie ting tong tou tu tuan tui tun tuo wa wai wan wang wei wen weng wo wong wu '
+        'xi xia xian xiang xiao xie xin xing xiong xiu xu xuan xue xun ya yan yang yao ye yi yin ying yo yong '
+        'you yu yuan yue yun za zai zan zang zao ze zei zen zeng zha zhai zhan zhang zhao zhe zhei zhen zheng '
+        'zhi zhong zhou zhu zhua zhuai zhuan zhuang zhui zhun zhuo zi zong zou zu zuan zui zun zuo'
+    ).split())
+    SYLLABLE_PREFIXES = frozenset(syllable[:i] for syllable in SYLLABLES for i in range(1, len(syllable) + 1))
+    MAX_SYLLABLE_LENGTH = 6
+    # 可以作为拼音首字母的字母（不含元音）：全部由这些字母组成的关键词视为首字母缩写
+    INITIAL_LETTERS = frozenset('bcdfghjklmnpqrstwxyz')
+    # 检索键最大长度，与模型中的列长度一致
+    FULL_LENGTH = 512
+    INITIALS_LENGTH = 255
+
+    def __init__(self, bind=engine):
+        self.dialect = bind.dialect.name
+
+    def available(self) -> bool:
+        """ 是否安装了 pypinyin """
+        return lazy_pinyin is not None
+
+    def normalize(self, text: str) -> str:
+        """ 检索键 / 搜索词的规范形式：小写，只保留 ASCII 字母与数字 """
+        return ''.join(self.WORD_PATTERN.findall((text or '').lower()))
+
+    def full(self, text: str):
+        """ 全拼检索键，pypinyin 不可用时返回 None """
+        if not text or not self.available():
+            return None
+        return self.normalize(''.join(lazy_pinyin(text)))[:self.FULL_LENGTH]
+
+    def initials(self, text: str):
+        """ 首字母检索键：汉字取拼音首字母，其余部分取每个单词的首字符 """
+        if not text or not self.available():
+            return None
+        letters = lazy_pinyin(text, style=Style.FIRST_LETTER,
+                              errors=lambda chars: [w[0] for w in self.WORD_PATTERN.findall(chars.lower())])
+        return self.normalize(''.join(letters))[:self.INITIALS_LENGTH]
+
+    def fill_movie(self, movie):
+        """ 按标题填充电影的拼音检索键 """
+        movie.title_pinyin = self.full(movie.title)
+        movie.title_initials = self.initials(movie.title)
+
+    def fill_person(self, person):
+        """ 按姓名填充人员的拼音检索键 """
+        person.name_pinyin = self.full(person.name)
+        person.name_initials = self.initials(person.name)
+
+    def is_pinyin_query(self, text: str) -> bool:
+        """
+        关键词是否按拼音检索：不含空白，去掉撇号后全部为字母，且能依次切分为拼音音节
+        （最后一个音节允许只输入一部分，如 xi'an、xiaoshenk），或全部由声母组成（首字母缩写，如 xsk）。
+        matrix、hello 等英文单词无法切分，仍走全文检索并按相关度排序。
+        未安装 pypinyin 时检索键为空，一律返回 False
+        """
+        if not self.available() or not text or not text.isascii():
+            return False
+        letters = text.lower().replace("'", '')
+        if not letters.isalpha():
+            return False
+        return set(letters) <= self.INITIAL_LETTERS or self._segmentable(letters)
+
+    def _segmentable(self, letters):
+        """ 能否切分为若干完整音节加一个音节前缀 """
+        # complete[i]：letters[:i] 恰好由完整音节组成
+        complete = [True] + [False] * len(letters)
+        for end in range(1, len(letters) + 1):
+            complete[end] = any(
+                complete[start] and letters[start:end] in self.SYLLABLES
+                for start in range(max(0, end - self.MAX_SYLLABLE_LENGTH), end)
+            )
+        return any(complete[start] and (start == len(letters) or letters[start:] in self.SYLLABLE_PREFIXES)
+                   for start in range(len(letters) + 1))
+
+    def prefix_match(self, full_column, initials_column, text: str):
+        """ 全拼或首字母以关键词开头的过滤条件 """
+        prefix = self.normalize(text)
+        return or_(self._prefix(full_column, prefix), self._prefix(initials_column, prefix))
+
+    def matches(self, name: str, text: str) -> bool:
+        """ 在内存中判断名称是否满足 prefix_match（与数据库中检索键的计算方式一致） """
+        prefix = self.normalize(text)
+        return any(key and key.startswith(prefix) for key in (self.full(name), self.initials(name)))
+
+    def _prefix(self, column, prefix):
+        if self.dialect == 'sqlite':
+            # SQLite 的 LIKE 默认不区分大小写，无法使用普通索引；改写为等价的范围条件。
+            # 检索键只含 [0-9a-z]，'{' 在 ASCII 中紧随 'z' 之后，[prefix, prefix + '{') 恰好是以 prefix 开头的全部取值
+            return and_(column >= prefix, column < prefix + '{')
+        # MySQL 将常量前缀的 LIKE 优化为索引范围扫描
+        return column.like(prefix + '%')
+
+
+# 单例实例
+pinyin_search = PinyinSearch()
@@ -0,0 +1,234 @@
+# mdms/common/prefix_index.py
+import heapq
+import re
+import threading
+from bisect import bisect_left, insort
+
+from PySide6.QtCore import QStringListModel, Qt
+from PySide6.QtWidgets import QCompleter
+from sqlalchemy import func
+
+from mdms.database.session import run_after_commit
+from mdms.database.models import Movie, Person, MoviePerson
+from mdms.common.pinyin_search import pinyin_search
+
+
+class PrefixIndex:
+    """
+    前缀补全索引（有序数组 + 二分查找）
+    每个条目以若干检索键登记：名称本身（转小写、去掉空白与标点）以及拼音全拼、首字母，
+    所有 (检索键, 条目键) 保存在一个有序数组中。以某个前缀开头的检索键在数组中是连续的一段，
+    两次二分即可定位，再按热度取前 k 个条目。
+    相比逐字符建树的前缀树，有序数组没有节点对象的开销，增删也只是一次二分插入 / 删除。
+    """
+
+    WORD_PATTERN = re.compile(r'[^\W_]+')
+    # 大于任何字符的哨兵，用于定位前缀区间的上界
+    MAX_CHAR = chr(0x10FFFF)
+    # 不超过该长度的前缀命中区间很长（一个字母可能覆盖数万个检索键），其结果缓存到下一次增删为止
+    SHORT_PREFIX = 2
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # 有序数组：(检索键, 条目键)
+        self._keys = []
+        # 条目键 -> (显示名称, 热度, 检索键集合)
+        self._entries = {}
+        # 短前缀的结果缓存：(前缀, 数量) -> 结果
+        self._short = {}
+
+    @classmethod
+    def normalize(cls, text):
+        return ''.join(cls.WORD_PATTERN.findall((text or '').lower()))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, key, label, weight=None, *aliases):
+        """
+        添加或替换条目
+        :param weight: 热度，为 None 时沿用该条目原有的热度（改名不影响热度）
+        :param aliases: 其他检索键（拼音全拼、首字母等）
+        """
+        search_keys = {self.normalize(text) for text in (label, *aliases)} - {''}
+        with self._lock:
+            old = self._entries.get(key)
+            if weight is None:
+                weight = old[1] if old else 0
+            self._discard(key)
+            self._entries[key] = (label, weight, search_keys)
+            for search_key in search_keys:
+                insort(self._keys, (search_key, key))
+
+    def remove(self, key):
+        with self._lock:
+            self._discard(key)
+
+    def complete(self, prefix, limit=8):
+        """
+        以 prefix 开头的条目，按热度降序取前 limit 个
+        :return: [(条目键, 显示名称, 热度)]
+        """
+        prefix = self.normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            cached = self._short.get((prefix, limit))
+            if cached is not None:
+                return cached
+            low = bisect_left(self._keys, (prefix,))
+            high = bisect_left(self._keys, (prefix + self.MAX_CHAR,))
+            # 同一条目的多个检索键可能同时命中，去重后再排序
+            keys = {key for _, key in self._keys[low:high]}
+            best = heapq.nlargest(limit, keys, key=lambda key: (self._entries[key][1], key))
+            result = [(key, *self._entries[key][:2]) for key in best]
+            if len(prefix) <= self.SHORT_PREFIX:
+                self._short[(prefix, limit)] = result
+            return result
+
+    def load(self, rows):
+        """ 批量构建：rows 为 (条目键, 显示名称, 热度, 别名...) 序列，一次排序代替逐条插入 """
+        entries, keys = {}, []
+        for key, label, weight, *aliases in rows:
+            search_keys = {self.normalize(text) for text in (label, *aliases)} - {''}
+            entries[key] = (label, weight or 0, search_keys)
+            keys.extend((search_key, key) for search_key in search_keys)
+        keys.sort()
+        with self._lock:
+            self._entries, self._keys = entries, keys
+            self._short = {}
+
+    def _discard(self, key):
+        self._short = {}
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for search_key in entry[2]:
+            index = bisect_left(self._keys, (search_key, key))
+            if index < len(self._keys) and self._keys[index] == (search_key, key):
+                del self._keys[index]
+
+
+class Autocomplete:
+    """
+    搜索框自动补全服务
+    电影标题与人员姓名各有一个前缀补全索引，检索键包括名称及其拼音全拼、首字母（输入 xsk 即可补全“肖申克的救赎”），
+    候选按热度排序：电影取评分人数 rating_count，人员取其参与电影中最高的评分人数，两者量纲一致，可以合并排序。
+
+    - 启动后由主窗口在后台线程调用 build，一次查询读取全部名称后批量排序建立；
+    - movie_manager / person_manager 新增、改名、删除的事务提交成功后增量更新，构建完成前的更新先记入日志，构建完成后重放；
+    - 热度取自构建时的统计，运行期间评分人数的变化不会实时反映到排序中。
+    """
+
+    # 默认候选数量
+    LIMIT = 8
+
+    def __init__(self):
+        self.movies = PrefixIndex()
+        self.people = PrefixIndex()
+        self._lock = threading.Lock()
+        self._ready = False
+        # 构建完成前的增量更新：(索引名, 方法名, 参数)
+        self._journal = []
+
+    def is_ready(self) -> bool:
+        return self._ready
+
+    def build(self, session):
+        """ 从数据库构建补全索引（在后台线程中执行），返回 (电影数, 人员数) """
+        movies, people = PrefixIndex(), PrefixIndex()
+        # 尚未回填拼音检索键的旧数据现场生成全拼
+        movies.load(
+            (movie_id, title, rating_count, title_pinyin or pinyin_search.full(title), title_initials)
+            for movie_id, title, rating_count, title_pinyin, title_initials in
+            session.query(Movie.movie_id, Movie.title, Movie.rating_count, Movie.title_pinyin, Movie.title_initials)
+        )
+        popularity = dict(
+            session.query(MoviePerson.person_id, func.max(Movie.rating_count))
+            .join(MoviePerson.movie).group_by(MoviePerson.person_id)
+        )
+        people.load(
+            (person_id, name, popularity.get(person_id, 0), name_pinyin or pinyin_search.full(name), name_initials)
+            for person_id, name, name_pinyin, name_initials in
+            session.query(Person.person_id, Person.name, Person.name_pinyin, Person.name_initials)
+        )
+
+        with self._lock:
+            indexes = {'movies': movies, 'people': people}
+            for index_name, method, args in self._journal:
+                getattr(indexes[index_name], method)(*args)
+            self._journal = []
+            self.movies, self.people = movies, people
+            self._ready = True
+        return len(movies), len(people)
+
+    def put_movie(self, session, movie):
+        """ 新增或改名后的电影（session 提交成功后生效） """
+        run_after_commit(session, self._apply, 'movies', 'add', movie.movie_id, movie.title, movie.rating_count,
+                         movie.title_pinyin, movie.title_initials)
+
+    def remove_movie(self, session, movie_id):
+        run_after_commit(session, self._apply, 'movies', 'remove', movie_id)
+
+    def put_person(self, session, person):
+        """ 新增或改名后的人员（session 提交成功后生效，改名沿用原有热度） """
+        run_after_commit(session, self._apply, 'people', 'add', person.person_id, person.name, None,
+                         person.name_pinyin, person.name_initials)
+
+    def remove_person(self, session, person_id):
+        run_after_commit(session, self._apply, 'people', 'remove', person_id)
+
+    def complete_movies(self, prefix, limit=LIMIT):
+        """ 电影标题补全候选 """
+        return self._labels(self.movies.complete(prefix, limit))
+
+    def complete_people(self, prefix, limit=LIMIT):
+        """ 人员姓名补全候选 """
+        return self._labels(self.people.complete(prefix, limit))
+
+    def complete_all(self, prefix, limit=LIMIT):
+        """ 电影与人员合并后的补全候选，按热度排序 """
+        candidates = self.movies.complete(prefix, limit) + self.people.complete(prefix, limit)
+        candidates.sort(key=lambda item: -item[2])
+        return self._labels(candidates)[:limit]
+
+    @staticmethod
+    def _labels(candidates):
+        # 同名条目只保留一个
+        return list(dict.fromkeys(label for _, label, _ in candidates))
+
+    def _apply(self, index_name, method, *args):
+        with self._lock:
+            if not self._ready:
+                self._journal.append((index_name, method, args))
+                return
+            getattr(getattr(self, index_name), method)(*args)
+
+
+class PrefixCompleter(QCompleter):
+    """
+    把自动补全服务接到 SearchLineEdit 上
+    候选由 lookup(前缀) 在每次输入时直接计算，QCompleter 不再自行按显示文字过滤
+    （拼音、首字母补全出的中文名称与输入内容并不以相同字符开头）。
+    选中候选后发出 activated，调用方可借此立即搜索。
+    """
+
+    def __init__(self, line_edit, lookup, parent=None):
+        super().__init__(parent)
+        self.lookup = lookup
+        self.candidateModel = QStringListModel(self)
+        self.setModel(self.candidateModel)
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+        self.setMaxVisibleItems(Autocomplete.LIMIT)
+
+        # 在输入框弹出补全菜单之前（其内部延迟 50 毫秒读取候选）更新候选列表
+        line_edit.textEdited.connect(self.on_text_edited)
+        line_edit.setCompleter(self)
+
+    def on_text_edited(self, text):
+        self.candidateModel.setStringList(self.lookup(text.strip()))
+
+
+# 单例实例
+autocomplete = Autocomplete()
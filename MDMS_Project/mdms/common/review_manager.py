@@ -1,10 +1,16 @@
-from sqlalchemy import func
-from mdms.database.models import Review, Movie
+from sqlalchemy import func, update, delete, insert, select, exists, or_, case
+from mdms.database.models import Review, Movie, MovieStatsDirty
+from mdms.database.session import run_after_commit
+from mdms.common.count_cache import count_cache
+from mdms.common.page_cache import page_cache
 
 class ReviewManager:
     """
     影评管理服务类
     负责处理影评的增删改查，并自动维护电影的统计数据（评分、评分人数）。
+    日常写入通过 _apply_rating_delta 对 rating_count / rating_sum 做增量更新，
+    update_movie_status 与 recompute_all_movie_stats 仅用于数据修复，
+    启动时的一致性检查通过 reconcile_dirty_movie_stats 只处理影评发生过变化的电影。
     """
 
     def create_review(self, session, user_id, movie_id, rating, comment=None):
@@ -28,8 +34,8 @@ class ReviewManager:
         # 3. 刷新以获取 ID 并确保写入
         session.flush()
 
-        # 4. 触发统计更新 - 修复：这里调用了错误的方法名
-        self.update_movie_status(session, movie_id)  # 原来是 self._update_movie_stats
+        # 4. 增量更新统计：评分人数 +1，评分总和 +rating
+        self._apply_rating_delta(session, movie_id, count_delta=1, sum_delta=rating)
 
         return new_review
 
@@ -43,6 +49,7 @@ class ReviewManager:
 
         # 记录旧的 movie_id 以防万一（虽然通常不会改 movie_id）
         movie_id = review.movie_id
+        old_rating = review.rating
 
         # 更新字段
         review.rating = new_rating
@@ -52,8 +59,9 @@ class ReviewManager:
         # 刷新
         session.flush()
 
-        # 触发统计更新
-        self.update_movie_status(session, movie_id)
+        # 增量更新统计：评分人数不变，评分总和加上新旧评分之差
+        if new_rating != old_rating:
+            self._apply_rating_delta(session, movie_id, count_delta=0, sum_delta=new_rating - old_rating)
 
         return review
 
@@ -66,45 +74,193 @@ class ReviewManager:
             return
 
         movie_id = review.movie_id
+        rating = review.rating
 
         # 删除
         session.delete(review)
 
-        # 刷新 (必须先 flush 让删除生效，统计才会准确)
+        # 刷新 (先 flush 让删除生效，再更新统计)
         session.flush()
 
-        # 触发统计更新
-        self.update_movie_status(session, movie_id)
+        # 增量更新统计：评分人数 -1，评分总和 -rating
+        self._apply_rating_delta(session, movie_id, count_delta=-1, sum_delta=-rating)
+
+    def _apply_rating_delta(self, session, movie_id, count_delta, sum_delta):
+        """
+        以原子的增量 UPDATE 维护电影统计数据，代价与该电影的影评数量无关
+        SET average_rating = (rating_sum + Δsum) / (rating_count + Δcount),
+            rating_count = rating_count + Δcount, rating_sum = rating_sum + Δsum
+        """
+        new_count = Movie.rating_count + count_delta
+        new_sum = Movie.rating_sum + sum_delta
+
+        # average_rating 必须排在最前面：MySQL 按从左到右的顺序求值 SET 子句，
+        # 后面的赋值会看到前面已更新的列值；放在首位可保证它基于旧值计算（与 SQLite 等一致）
+        session.execute(
+            update(Movie)
+            .where(Movie.movie_id == movie_id)
+            .ordered_values(
+                (Movie.average_rating, case(
+                    (new_count > 0, func.round(new_sum * 1.0 / new_count, 2)),
+                    else_=0
+                )),
+                (Movie.rating_count, new_count),
+                (Movie.rating_sum, new_sum),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        # 若会话中已加载该电影对象，使其统计字段过期，下次访问时重新读取
+        movie = session.identity_map.get(session.identity_key(Movie, movie_id))
+        if movie is not None:
+            session.expire(movie, ['average_rating', 'rating_count', 'rating_sum'])
+
+        # 评分统计变化后，缓存的电影画廊分页结果与总数随之失效（最低评分 / 最低评分人数筛选依赖这两列），
+        # 提交成功后才失效，否则提交前的后台查询可能把旧数据重新写回缓存
+        run_after_commit(session, count_cache.invalidate, 'movie_gallery')
+        run_after_commit(session, page_cache.invalidate, 'movie_gallery')
 
     def update_movie_status(self, session, movie_id):
         """
-        重新计算并更新电影的平均分和评分人数
-        类似于数据库触发器
+        重新计算并更新单部电影的平均分、评分人数和评分总和
+        全量扫描该电影的所有影评，仅用于修复统计数据，日常写入请走增量更新
         """
 
         # 使用 SQL 聚合函数直接计算，性能最高
         stats = session.query(
             func.count(Review.rating).label('count'),
+            func.sum(Review.rating).label('total'),
             func.avg(Review.rating).label('average')
         ).filter(Review.movie_id == movie_id).one()
 
         count = stats.count
+        total = stats.total
         average = stats.average
 
         # 处理没有评论的情况
         if count is None or count == 0:
             count = 0
+            total = 0
             average = 0.0
         else:
             # 确保转换为浮点数并保留2位小数 (根据你的 Numeric(4,2) 定义)
             average = float(average)
+            total = int(total)
 
         # 更新电影表
         movie = session.query(Movie).get(movie_id)
         if movie:
             movie.rating_count = count
+            movie.rating_sum = total
             movie.average_rating = average
             # 注意：这里不需要 commit，由调用者统一 commit
 
+    def recompute_all_movie_stats(self, session):
+        """
+        全量重算所有电影的平均分、评分人数和评分总和（集合式批量更新，用于修复）
+        与逐部调用 update_movie_status 不同，这里只发出两条 UPDATE 语句：
+        1. 将 movies 与按 movie_id 分组聚合的 reviews 子查询连接，一次性回写统计值；
+        2. 将已没有任何影评、但统计值仍非零的电影归零。
+        两条语句都只改写统计值确实发生变化的行，避免无意义的写放大。
+        :return: 受影响（被修正）的电影行数
+        """
+        return self._recompute_movie_stats(session)
+
+    def reconcile_dirty_movie_stats(self, session, limit=None):
+        """
+        增量一致性检查：只重算 movie_stats_dirty 日志中记录的电影
+        日志由 reviews 表上的数据库触发器写入，因此绕过 ReviewManager 直接修改影评也会被记录。
+        先取日志当前的最大 entry_id 作为快照，只重算并清除快照内的记录；
+        重算期间新写入的日志会保留到下一次检查，不会丢失。
+        :param limit: 单次最多处理的日志条数，None 表示一次处理完；分批调用便于汇报进度
+        :return: (本次处理的电影数, 受影响（被修正）的电影行数)
+        """
+        first, snapshot = session.query(
+            func.min(MovieStatsDirty.entry_id), func.max(MovieStatsDirty.entry_id)
+        ).one()
+        if snapshot is None:
+            return 0, 0
+        if limit is not None:
+            snapshot = min(snapshot, first + limit - 1)
+
+        dirty_ids = (
+            select(MovieStatsDirty.movie_id)
+            .where(MovieStatsDirty.entry_id <= snapshot)
+            .distinct()
+        )
+        dirty_count = session.query(func.count()).select_from(dirty_ids.subquery()).scalar()
+
+        changed = self._recompute_movie_stats(session, dirty_ids)
+
+        session.execute(
+            delete(MovieStatsDirty)
+            .where(MovieStatsDirty.entry_id <= snapshot)
+            .execution_options(synchronize_session=False)
+        )
+
+        # 注意：这里不需要 commit，由调用者统一 commit
+        return dirty_count, changed
+
+    def count_dirty_entries(self, session):
+        """ 获取统计日志中待处理的记录条数 """
+        return session.query(func.count(MovieStatsDirty.entry_id)).scalar() or 0
+
+    def mark_movies_dirty(self, session, movie_ids):
+        """
+        手动将电影登记到统计日志中，供下一次一致性检查重算
+        用于批量导入等不经过影评触发器、但同样会让统计值失真的写入
+        """
+        rows = [{'movie_id': mid} for mid in movie_ids]
+        if rows:
+            session.execute(insert(MovieStatsDirty), rows)
+
+    def _recompute_movie_stats(self, session, movie_ids=None):
+        """
+        集合式重算的实现，movie_ids 为 None 时处理全部电影，
+        否则只处理给定的 movie_id 集合（可以是列表或 SELECT 子查询）
+        """
+        # 按电影分组的评分聚合子查询
+        stats_query = session.query(
+            Review.movie_id.label('movie_id'),
+            func.count(Review.rating).label('count'),
+            func.sum(Review.rating).label('total'),
+            func.round(func.avg(Review.rating), 2).label('average')
+        )
+        if movie_ids is not None:
+            stats_query = stats_query.filter(Review.movie_id.in_(movie_ids))
+        stats = stats_query.group_by(Review.movie_id).subquery()
+
+        # 1. 有影评的电影：UPDATE movies JOIN (聚合子查询)
+        result = session.execute(
+            update(Movie)
+            .where(Movie.movie_id == stats.c.movie_id)
+            .where(or_(
+                Movie.rating_count != stats.c.count,
+                Movie.rating_sum != stats.c.total,
+                Movie.average_rating != stats.c.average
+            ))
+            .values(rating_count=stats.c.count, rating_sum=stats.c.total, average_rating=stats.c.average)
+            .execution_options(synchronize_session=False)
+        )
+        changed = result.rowcount or 0
+
+        # 2. 没有影评的电影：统计值归零
+        zero_stmt = (
+            update(Movie)
+            .where(~exists().where(Review.movie_id == Movie.movie_id))
+            .where(or_(Movie.rating_count != 0, Movie.rating_sum != 0, Movie.average_rating != 0))
+        )
+        if movie_ids is not None:
+            zero_stmt = zero_stmt.where(Movie.movie_id.in_(movie_ids))
+        result = session.execute(
+            zero_stmt
+            .values(rating_count=0, rating_sum=0, average_rating=0)
+            .execution_options(synchronize_session=False)
+        )
+        changed += result.rowcount or 0
+
+        # 注意：这里不需要 commit，由调用者统一 commit
+        return changed
+
 # 实例化一个单例对象方便调用
 review_manager = ReviewManager()
\ No newline at end of file
@@ -0,0 +1,70 @@
+# mdms/common/search_debouncer.py
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+class SearchDebouncer(QObject):
+    """
+    搜索框边输入边搜索（防抖）
+    监听 SearchLineEdit 的输入，停止输入 DELAY 毫秒后才发出 searchRequested，
+    连续敲键不会每个字符都查询一次数据库：
+    - 回车或点击搜索图标：立即搜索，不受最短长度限制；
+    - 清空搜索框：立即恢复完整列表；
+    - 输入过短时不触发搜索（纯 ASCII 至少 MIN_ASCII_LENGTH 个字符，含中文等字符时 1 个即可），
+      单个字母几乎匹配全部记录，查询代价高而结果没有意义；
+    - 与上一次发出的关键词相同时不重复发出。
+    取消旧查询由接收方的 DataLoader 负责：同一通道只保留最新一次请求的结果。
+    """
+
+    # 请求以该关键词搜索（已去除首尾空白）
+    searchRequested = Signal(str)
+
+    # 防抖延迟（毫秒）
+    DELAY = 300
+    # 纯 ASCII 关键词的最短长度
+    MIN_ASCII_LENGTH = 2
+
+    def __init__(self, search_edit, parent=None):
+        super().__init__(parent)
+        self.search_edit = search_edit
+        self._last = search_edit.text().strip()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DELAY)
+        self.timer.timeout.connect(self._on_timeout)
+
+        search_edit.textChanged.connect(self._on_text_changed)
+        search_edit.searchSignal.connect(self.flush)
+        search_edit.returnPressed.connect(self.flush)
+
+    def is_searchable(self, text: str) -> bool:
+        """ 最短长度规则 """
+        if not text:
+            return True
+        if text.isascii():
+            return len(text) >= self.MIN_ASCII_LENGTH
+        return True
+
+    def flush(self, *args):
+        """ 立即以当前内容搜索（回车 / 点击搜索图标） """
+        self.timer.stop()
+        self._emit(self.search_edit.text().strip())
+
+    def _on_text_changed(self, text):
+        if not text.strip():
+            # 清空搜索框时立即恢复
+            self.timer.stop()
+            self._emit("")
+        else:
+            self.timer.start()
+
+    def _on_timeout(self):
+        text = self.search_edit.text().strip()
+        if self.is_searchable(text):
+            self._emit(text)
+
+    def _emit(self, text):
+        if text == self._last:
+            return
+        self._last = text
+        self.searchRequested.emit(text)
@@ -0,0 +1,64 @@
+# mdms/common/stats_sync_worker.py
+import traceback
+
+from PySide6.QtCore import QThread, Signal
+
+from mdms.common.review_manager import review_manager
+from mdms.database.session import SessionLocal
+from mdms.database.instrumentation import instrumented_action
+
+
+class StatsSyncWorker(QThread):
+    """
+    评分统计后台同步线程
+    在独立线程和独立数据库会话中分批执行 ReviewManager.reconcile_dirty_movie_stats，
+    主窗口无需等待同步完成即可显示，进度通过信号回传给 GUI 线程。
+    """
+
+    # 信号：存在待处理的日志时发出，参数为待处理的日志条数
+    syncStarted = Signal(int)
+    # 信号：每完成一批发出，参数为 (已处理条数, 总条数)
+    progressChanged = Signal(int, int)
+    # 信号：同步结束，参数为 (检查的电影数, 修正的电影数)
+    syncFinished = Signal(int, int)
+    # 信号：同步失败，参数为错误信息
+    syncFailed = Signal(str)
+
+    # 每批处理的日志条数，每批单独提交事务，避免长事务锁住 movies 表
+    BATCH_SIZE = 2000
+
+    @instrumented_action('stats.sync')
+    def run(self):
+        session = SessionLocal()
+        try:
+            total = review_manager.count_dirty_entries(session)
+            if not total:
+                self.syncFinished.emit(0, 0)
+                return
+
+            self.syncStarted.emit(total)
+            checked, changed = 0, 0
+
+            while not self.isInterruptionRequested():
+                dirty_count, batch_changed = review_manager.reconcile_dirty_movie_stats(
+                    session, limit=self.BATCH_SIZE
+                )
+                session.commit()
+                if not dirty_count:
+                    break
+
+                checked += dirty_count
+                changed += batch_changed
+
+                # 同步期间可能有新日志写入，剩余条数以实时查询为准
+                remaining = review_manager.count_dirty_entries(session)
+                self.progressChanged.emit(max(total - remaining, 0), total)
+
+            self.syncFinished.emit(checked, changed)
+
+        except Exception as e:
+            session.rollback()
+            traceback.print_exc()
+            self.syncFailed.emit(str(e))
+        finally:
+            session.close()
@@ -0,0 +1,56 @@
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QWidget, QHBoxLayout
+from qfluentwidgets import CaptionLabel, HyperlinkButton
+
+
+class SuggestionBar(QWidget):
+    """
+    “您是不是要找”建议栏
+    搜索没有结果时显示在画廊上方，列出容错搜索给出的相似名称，点击即以该名称重新搜索。
+    没有建议时自动隐藏。
+    """
+
+    # 信号：点击某个建议，参数为建议的名称
+    suggestionClicked = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.hLayout = QHBoxLayout(self)
+        self.hLayout.setContentsMargins(0, 0, 0, 10)
+        self.hLayout.setSpacing(4)
+        self.hLayout.setAlignment(Qt.AlignLeft)
+
+        self.promptLabel = CaptionLabel("", self)
+        self.hLayout.addWidget(self.promptLabel)
+        self.buttons = []
+        self.setVisible(False)
+
+    def set_suggestions(self, text, labels):
+        """
+        显示建议
+        :param text: 没有结果的搜索关键词
+        :param labels: 建议的名称列表，为空时隐藏建议栏
+        """
+        for button in self.buttons:
+            self.hLayout.removeWidget(button)
+            button.deleteLater()
+        self.buttons = []
+
+        # 同名条目（如重名的人员）只显示一次
+        labels = list(dict.fromkeys(labels))
+        if not labels:
+            self.setVisible(False)
+            return
+
+        self.promptLabel.setText(f"未找到“{text}”，您是不是要找：")
+        for label in labels:
+            button = HyperlinkButton(self)
+            button.setText(label)
+            button.clicked.connect(lambda checked=False, label=label: self.suggestionClicked.emit(label))
+            self.hLayout.addWidget(button)
+            self.buttons.append(button)
+        self.setVisible(True)
+
+    def clear(self):
+        """ 隐藏建议栏 """
+        self.set_suggestions("", [])
@@ -0,0 +1,124 @@
+# mdms/common/thumbnail_cache.py
+import hashlib
+import os
+import shutil
+import threading
+
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QImageReader
+
+from mdms.database.session import project_root
+
+
+# 默认占位图（Qt 资源路径）
+DEFAULT_IMAGE = ":/qfluentwidgets/images/logo.png"
+
+
+class ThumbnailCache:
+    """
+    海报 / 人员照片缩略图持久化缓存
+    media 目录中的原图尺寸较大，画廊每翻一页都要重新解码整张 JPEG 再缩小显示。
+    该缓存按档位（tier）把原图预先缩放后写入缓存目录，界面只需解码很小的缩略图：
+    - card：画廊卡片、TOP100、作品列表等小图；
+    - detail：详情页的大海报 / 人物照；
+    - 每个档位另有 2 倍尺寸版本，供高分屏（devicePixelRatio > 1）使用。
+    缓存文件名由原图绝对路径、修改时间、文件大小与档位共同哈希得到，原图被替换后自动生成新缩略图；
+    缺失的档位在首次请求时才生成。
+    """
+
+    # 各档位的最大边界框 (宽, 高)，缩放时保持纵横比
+    TIERS = {
+        'card': QSize(160, 240),
+        'detail': QSize(240, 360),
+    }
+    # 缩略图 JPEG 质量
+    QUALITY = 90
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.path.join(project_root, 'cache', 'thumbnails')
+        # 同一缩略图可能被多个线程同时请求，生成过程串行化
+        self._lock = threading.Lock()
+
+    def resolve(self, path):
+        """
+        将数据库中保存的图片路径规范化为本地绝对路径
+        兼容 Windows 风格的分隔符，相对路径以项目根目录为基准；文件不存在时返回 None
+        """
+        if not path:
+            return None
+        path = path.replace('\\', os.sep).replace('/', os.sep)
+        if not os.path.isabs(path):
+            path = os.path.join(project_root, path)
+        path = os.path.normpath(path)
+        return path if os.path.isfile(path) else None
+
+    def get(self, path, tier='card', scale=1):
+        """
+        获取缩略图文件路径，缺失时同步生成
+        :param path: 原图路径（数据库中的 poster_url / photo_url）
+        :param tier: 档位名称，见 TIERS
+        :param scale: 1 为普通屏幕，2 为高分屏
+        :return: 缩略图路径；原图不存在时返回默认占位图，生成失败时回退为原图
+        """
+        source = self.resolve(path)
+        if source is None:
+            return DEFAULT_IMAGE
+
+        target = self.cache_path(source, tier, scale)
+        if target is None:
+            return source
+        if os.path.exists(target):
+            return target
+
+        with self._lock:
+            if os.path.exists(target) or self._generate(source, target, tier, scale):
+                return target
+        return source
+
+    def get_for(self, widget, path, tier='card'):
+        """ 根据控件所在屏幕的像素比自动选择普通或 2 倍档位 """
+        scale = 2 if widget.devicePixelRatioF() > 1 else 1
+        return self.get(path, tier, scale)
+
+    def cache_path(self, source, tier, scale):
+        """ 计算缩略图的缓存路径，原图无法访问时返回 None """
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        key = f"{source}|{stat.st_mtime_ns}|{stat.st_size}|{tier}@{scale}x"
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        # 按哈希前两位分目录，避免单个目录下文件过多
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.jpg")
+
+    def _generate(self, source, target, tier, scale):
+        """ 解码时直接按目标尺寸缩放，生成缩略图并原子写入缓存目录 """
+        reader = QImageReader(source)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        box = self.TIERS[tier] * scale
+        if size.isValid():
+            # 只缩小不放大
+            if size.width() > box.width() or size.height() > box.height():
+                reader.setScaledSize(size.scaled(box, Qt.KeepAspectRatio))
+
+        image = reader.read()
+        if image.isNull():
+            print(f"生成缩略图失败: {source} ({reader.errorString()})")
+            return False
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp = f"{target}.{threading.get_ident()}.tmp"
+        if not image.save(temp, 'JPG', self.QUALITY):
+            print(f"写入缩略图失败: {target}")
+            return False
+        os.replace(temp, target)
+        return True
+
+    def clear(self):
+        """ 删除全部缓存的缩略图 """
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+# 单例实例
+thumbnail_cache = ThumbnailCache()
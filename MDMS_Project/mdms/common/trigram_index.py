@@ -0,0 +1,280 @@
+# mdms/common/trigram_index.py
+import hashlib
+import os
+import pickle
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from mdms.database.session import project_root, engine, run_after_commit
+from mdms.database.models import Movie, Person
+from mdms.common.pinyin_search import pinyin_search
+
+
+class TrigramIndex:
+    """
+    三元组（trigram）倒排索引
+    名称按 pg_trgm 的方式切分：转小写后按非字母数字字符分词，每个词前补两个空格、后补一个空格，
+    取所有连续的 3 字符片段。查询时合并查询词各片段的倒排列表得到候选并按相似度排序，
+    个别字符输错、多打或漏打仍能命中。相似度取以下两者的平均值：
+    - 共同片段数 / 两者片段并集大小（整体相似，偏向长度接近的名称）；
+    - 共同片段数 / 查询片段数（查询词被名称包含的程度，避免较短的关键词因名称更长而得分过低）。
+
+    条目可以附带别名（如拼音检索键），别名的片段并入该条目：同音错字（萧申克）的拼音与原名相同，同样能找回。
+    读写由锁保护：构建在后台线程，增量更新与查询在 GUI 线程。
+    """
+
+    WORD_PATTERN = re.compile(r'[^\W_]+')
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # 片段 -> {条目键}
+        self._postings = defaultdict(set)
+        # 条目键 -> (显示名称, 片段集合)
+        self._entries = {}
+
+    @classmethod
+    def trigrams(cls, *texts) -> frozenset:
+        """ 多段文本的三元组片段并集 """
+        grams = set()
+        for text in texts:
+            for word in cls.WORD_PATTERN.findall((text or '').lower()):
+                padded = f"  {word} "
+                grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        return frozenset(grams)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, key, label, *aliases):
+        """ 添加或替换条目 """
+        grams = self.trigrams(label, *aliases)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (label, grams)
+            for gram in grams:
+                self._postings[gram].add(key)
+
+    def remove(self, key):
+        """ 删除条目 """
+        with self._lock:
+            self._discard(key)
+
+    def search(self, text, *aliases, limit=5, threshold=0.4):
+        """
+        相似度检索
+        :param aliases: 查询词的别名（如拼音），片段并入查询
+        :return: [(条目键, 显示名称, 相似度)]，按相似度降序
+        """
+        query = self.trigrams(text, *aliases)
+        if not query:
+            return []
+        with self._lock:
+            shared = Counter()
+            for gram in query:
+                shared.update(self._postings.get(gram, ()))
+            results = []
+            for key, common in shared.items():
+                label, grams = self._entries[key]
+                score = (common / (len(query) + len(grams) - common) + common / len(query)) / 2
+                if score >= threshold:
+                    results.append((key, label, score))
+        results.sort(key=lambda item: (-item[2], item[1]))
+        return results[:limit]
+
+    def state(self):
+        """ 可序列化的索引数据（用于快照） """
+        with self._lock:
+            return dict(self._entries)
+
+    @classmethod
+    def from_state(cls, entries):
+        """ 由快照数据还原索引 """
+        index = cls()
+        index._entries = dict(entries)
+        for key, (_, grams) in index._entries.items():
+            for gram in grams:
+                index._postings[gram].add(key)
+        return index
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for gram in entry[1]:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+
+class FuzzySearch:
+    """
+    电影标题 / 人员姓名的容错搜索（“您是不是要找”）
+    搜索没有结果时，画廊从内存中的三元组索引取出最相似的几个名称作为建议，毫秒级返回，不访问数据库。
+
+    - 启动后由主窗口在后台线程调用 build：快照与数据库指纹一致时直接载入快照，否则从数据库读取名称重建并写入新快照；
+    - movie_manager / person_manager 写入的事务提交成功后增量更新（回滚的改动不会进入索引）；
+      构建完成前的更新先记入日志，构建完成后重放；
+    - 拼音检索键作为别名一并索引，同音错字与拼音输错也能命中。
+
+    指纹是全部 (ID, 名称) 的内容校验和（逐行哈希后求和，与行的顺序无关），应用外的任何增删改名都会使快照作废。
+    快照中的指纹由索引自身的条目计算，退出时写回快照不需要访问数据库。
+    """
+
+    SNAPSHOT_PATH = os.path.join(project_root, 'cache', 'fuzzy_index.pickle')
+    # 快照格式版本：索引结构变化时递增，旧快照自动作废
+    SNAPSHOT_VERSION = 2
+    # 默认建议数量与最低相似度
+    LIMIT = 5
+    THRESHOLD = 0.4
+
+    def __init__(self, snapshot_path=SNAPSHOT_PATH):
+        self.snapshot_path = snapshot_path
+        self.movies = TrigramIndex()
+        self.people = TrigramIndex()
+        self._lock = threading.Lock()
+        self._ready = False
+        self._dirty = False
+        # 构建完成前的增量更新：(索引名, 方法名, 参数)
+        self._journal = []
+
+    def is_ready(self) -> bool:
+        return self._ready
+
+    def build(self, session):
+        """
+        载入快照或从数据库重建索引（在后台线程中执行）
+        :return: 构建信息 {'source', 'movies', 'people', 'elapsed_ms'}
+        """
+        started = time.perf_counter()
+        fingerprint = self._fingerprint(session.query(Movie.movie_id, Movie.title),
+                                        session.query(Person.person_id, Person.name))
+        snapshot = self._load_snapshot(fingerprint)
+        if snapshot is not None:
+            source = 'snapshot'
+            movies, people = (TrigramIndex.from_state(entries) for entries in snapshot)
+        else:
+            source = 'database'
+            movies, people = TrigramIndex(), TrigramIndex()
+            for movie_id, title, title_pinyin in session.query(Movie.movie_id, Movie.title, Movie.title_pinyin):
+                movies.add(movie_id, title, title_pinyin or pinyin_search.full(title))
+            for person_id, name, name_pinyin in session.query(Person.person_id, Person.name, Person.name_pinyin):
+                people.add(person_id, name, name_pinyin or pinyin_search.full(name))
+            self._save_snapshot(movies.state(), people.state())
+
+        with self._lock:
+            indexes = {'movies': movies, 'people': people}
+            for index_name, method, args in self._journal:
+                getattr(indexes[index_name], method)(*args)
+            self._dirty = bool(self._journal)
+            self._journal = []
+            self.movies, self.people = movies, people
+            self._ready = True
+
+        return {
+            'source': source,
+            'movies': len(movies),
+            'people': len(people),
+            'elapsed_ms': (time.perf_counter() - started) * 1000,
+        }
+
+    def put_movie(self, session, movie):
+        """ 新增或改名后的电影（session 提交成功后生效） """
+        run_after_commit(session, self._apply, 'movies', 'add', movie.movie_id, movie.title, movie.title_pinyin)
+
+    def remove_movie(self, session, movie_id):
+        run_after_commit(session, self._apply, 'movies', 'remove', movie_id)
+
+    def put_person(self, session, person):
+        """ 新增或改名后的人员（session 提交成功后生效） """
+        run_after_commit(session, self._apply, 'people', 'add', person.person_id, person.name, person.name_pinyin)
+
+    def remove_person(self, session, person_id):
+        run_after_commit(session, self._apply, 'people', 'remove', person_id)
+
+    def suggest_movies(self, text, limit=LIMIT):
+        """ 与关键词最相似的电影：[(movie_id, title)]，索引未就绪时返回空列表 """
+        return self._suggest(self.movies, text, limit)
+
+    def suggest_people(self, text, limit=LIMIT):
+        """ 与关键词最相似的人员：[(person_id, name)] """
+        return self._suggest(self.people, text, limit)
+
+    def save(self):
+        """
+        应用内发生过增量更新时重写快照（退出时调用）
+        GUI 线程只复制索引条目，指纹计算与序列化在后台线程中完成（非守护线程，进程退出前会等待写完）
+        :return: 写入线程，无需写入时返回 None
+        """
+        with self._lock:
+            if not self._ready or not self._dirty:
+                return None
+            movies, people = self.movies.state(), self.people.state()
+            self._dirty = False
+        thread = threading.Thread(target=self._save_snapshot, args=(movies, people), name='fuzzy-index-snapshot')
+        thread.start()
+        return thread
+
+    def _suggest(self, index, text, limit):
+        if not self._ready or not text:
+            return []
+        # 中文关键词同时按拼音匹配；纯 ASCII 关键词本身就可能是拼音
+        aliases = () if text.isascii() else (pinyin_search.full(text),)
+        return [(key, label) for key, label, _ in
+                index.search(text, *aliases, limit=limit, threshold=self.THRESHOLD)]
+
+    def _apply(self, index_name, method, *args):
+        with self._lock:
+            if not self._ready:
+                self._journal.append((index_name, method, args))
+                return
+            getattr(getattr(self, index_name), method)(*args)
+            self._dirty = True
+
+    def _fingerprint(self, movie_rows, person_rows):
+        """ 数据库指纹：电影与人员各自的 (ID, 名称) 校验和 """
+        return (self.SNAPSHOT_VERSION, engine.url.render_as_string(hide_password=True),
+                self._checksum(movie_rows), self._checksum(person_rows))
+
+    @staticmethod
+    def _checksum(rows):
+        """ 逐行哈希后按 64 位求和：与行的顺序无关，不需要排序 """
+        total = 0
+        for key, label in rows:
+            digest = hashlib.blake2b(f"{key}\0{label}".encode('utf-8'), digest_size=8).digest()
+            total += int.from_bytes(digest, 'little')
+        return total & 0xFFFFFFFFFFFFFFFF
+
+    def _load_snapshot(self, fingerprint):
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                saved_fingerprint, movies, people = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"读取搜索索引快照失败，将从数据库重建: {e}")
+            return None
+        if saved_fingerprint != fingerprint:
+            return None
+        return movies, people
+
+    def _save_snapshot(self, movies, people):
+        """ 写入快照：movies / people 为 TrigramIndex.state()，指纹由其中的条目计算 """
+        fingerprint = self._fingerprint(((key, label) for key, (label, _) in movies.items()),
+                                        ((key, label) for key, (label, _) in people.items()))
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            # 先写临时文件再替换，中途退出不会留下损坏的快照
+            temp_path = self.snapshot_path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                pickle.dump((fingerprint, movies, people), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.snapshot_path)
+        except Exception as e:
+            print(f"写入搜索索引快照失败: {e}")
+
+
+# 单例实例
+fuzzy_search = FuzzySearch()
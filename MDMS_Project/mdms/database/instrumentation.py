@@ -0,0 +1,196 @@
+# mdms/database/instrumentation.py
+import json
+import time
+import logging
+import threading
+import functools
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+logger = logging.getLogger('mdms.sql')
+
+
+class StatementStats:
+    """ 单条（参数化后的）SQL 语句在某个动作内的执行统计 """
+
+    __slots__ = ('sql', 'count', 'total_time', 'max_time')
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def add(self, elapsed):
+        self.count += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+    def to_dict(self):
+        return {
+            'sql': self.sql,
+            'count': self.count,
+            'total_ms': round(self.total_time * 1000, 3),
+            'max_ms': round(self.max_time * 1000, 3),
+        }
+
+
+class ActionStats:
+    """
+    一次用户动作（翻页、打开详情、提交影评等）期间发出的全部 SQL 统计
+    语句按参数化后的 SQL 文本分组，相同文本重复执行多次即视为疑似 N+1 查询
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = time.time()
+        self.elapsed = 0.0
+        self.statements = {}
+        self._lock = threading.Lock()
+
+    def record(self, sql, elapsed):
+        with self._lock:
+            stats = self.statements.get(sql)
+            if stats is None:
+                stats = self.statements[sql] = StatementStats(sql)
+            stats.add(elapsed)
+
+    @property
+    def query_count(self):
+        return sum(s.count for s in self.statements.values())
+
+    @property
+    def query_time(self):
+        return sum(s.total_time for s in self.statements.values())
+
+    def n_plus_one(self, threshold):
+        """ 返回重复执行次数达到阈值的语句（疑似 N+1 模式） """
+        return [s for s in self.statements.values() if s.count >= threshold]
+
+    def to_dict(self, threshold):
+        return {
+            'action': self.name,
+            'started_at': self.started_at,
+            'elapsed_ms': round(self.elapsed * 1000, 3),
+            'query_count': self.query_count,
+            'query_ms': round(self.query_time * 1000, 3),
+            'n_plus_one': [s.to_dict() for s in self.n_plus_one(threshold)],
+            'statements': sorted((s.to_dict() for s in self.statements.values()),
+                                 key=lambda d: d['total_ms'], reverse=True),
+        }
+
+
+class SQLInstrumentation:
+    """
+    基于 SQLAlchemy 事件钩子的 SQL 监测器
+    - install(engine) 后，每条语句的执行耗时会被记入当前所在的动作 (action)；
+    - 动作通过 action(name) 上下文管理器或 instrumented_action 装饰器划定，基于 contextvars，
+      因此后台线程中的查询也能正确归属；不在任何动作内的语句归入 '<unscoped>'；
+    - 同一动作内同一语句执行次数达到 n_plus_one_threshold 时记为 N+1 并输出警告日志；
+    - dump_json(path) 将最近的动作记录导出为 JSON。
+    """
+
+    UNSCOPED = '<unscoped>'
+
+    def __init__(self, n_plus_one_threshold=5, max_actions=500):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.actions = deque(maxlen=max_actions)
+        self.unscoped = ActionStats(self.UNSCOPED)
+        self._current = contextvars.ContextVar('mdms_sql_action', default=None)
+        self._engines = []
+
+    @property
+    def enabled(self):
+        return bool(self._engines)
+
+    def install(self, engine):
+        """ 在引擎上注册执行计时钩子（幂等） """
+        if engine in self._engines:
+            return
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        self._engines.append(engine)
+
+    def uninstall(self, engine):
+        if engine not in self._engines:
+            return
+        event.remove(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.remove(engine, 'after_cursor_execute', self._after_cursor_execute)
+        self._engines.remove(engine)
+
+    def reset(self):
+        self.actions.clear()
+        self.unscoped = ActionStats(self.UNSCOPED)
+
+    @contextmanager
+    def action(self, name):
+        """ 划定一个动作范围，范围内执行的 SQL 都计入该动作 """
+        if not self.enabled:
+            yield None
+            return
+
+        stats = ActionStats(name)
+        token = self._current.set(stats)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.elapsed = time.perf_counter() - start
+            self._current.reset(token)
+            self.actions.append(stats)
+            self._report(stats)
+
+    def report(self):
+        """ 以字典列表的形式返回最近的动作记录（含未归属动作的语句） """
+        records = [a.to_dict(self.n_plus_one_threshold) for a in list(self.actions)]
+        if self.unscoped.statements:
+            records.append(self.unscoped.to_dict(self.n_plus_one_threshold))
+        return records
+
+    def dump_json(self, path):
+        """ 将监测结果导出为 JSON 文件 """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('mdms_query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('mdms_query_start')
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        stats = self._current.get() or self.unscoped
+        stats.record(statement, elapsed)
+
+    def _report(self, stats):
+        suspects = stats.n_plus_one(self.n_plus_one_threshold)
+        logger.info("[%s] %d 条 SQL，耗时 %.1f ms（动作总耗时 %.1f ms）",
+                    stats.name, stats.query_count, stats.query_time * 1000, stats.elapsed * 1000)
+        for s in suspects:
+            logger.warning("[%s] 疑似 N+1 查询：同一语句执行了 %d 次，共 %.1f ms：%s",
+                           stats.name, s.count, s.total_time * 1000, ' '.join(s.sql.split()))
+
+
+# 全局单例：由 session.py 按配置安装到应用引擎上
+sql_instrumentation = SQLInstrumentation()
+
+
+def instrumented_action(name):
+    """
+    装饰器：将函数执行期间发出的 SQL 计入名为 name 的动作
+    未启用监测时仅有一次布尔判断的开销
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not sql_instrumentation.enabled:
+                return func(*args, **kwargs)
+            with sql_instrumentation.action(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
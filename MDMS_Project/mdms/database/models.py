@@ -1,10 +1,10 @@
 # mdms/database/models.py
 
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import declarative_base, relationship, deferred
 from sqlalchemy import (
     Column, String, Integer, Date, ForeignKey, Text, Table,
     DateTime, Enum, Numeric, CheckConstraint, UniqueConstraint,
-    Index
+    Index, DDL, event
 )
 from sqlalchemy.sql import func, desc
 import uuid
@@ -24,7 +24,9 @@ movies_genres_table = Table(
     # movie_id 是外键，指向 movies 表。index=True 用于优化查询，例如查找某部电影的所有类型。
     Column('movie_id', String(36), ForeignKey('movies.movie_id'), primary_key=True, index=True),
     # genre_id 是外键，指向 genres 表。index=True 用于优化查询，例如查找属于某种类型的所有电影。
-    Column('genre_id', Integer, ForeignKey('genres.genre_id'), primary_key=True, index=True)
+    Column('genre_id', Integer, ForeignKey('genres.genre_id'), primary_key=True, index=True),
+    # 按类型筛选电影时的覆盖索引：由 genre_id 定位后直接取出 movie_id，无需回表
+    Index('idx_movies_genres_genre_movie', 'genre_id', 'movie_id')
 )
 
 
@@ -41,7 +43,9 @@ class User(Base):
     username = Column(String(100), nullable=False, unique=True, index=True)
     email = Column(String(255), nullable=False, unique=True, index=True)
     password_hash = Column(String(255), nullable=False)
-    role = Column(Enum('user', 'admin', name='user_role_enum'), nullable=False, server_default='user')
+    # create_constraint=True：MySQL 使用原生 ENUM；SQLite 等无原生枚举的后端退化为 VARCHAR + CHECK 约束
+    role = Column(Enum('user', 'admin', name='user_role_enum', create_constraint=True),
+                  nullable=False, server_default='user')
     created_at = Column(DateTime, server_default=func.now())
 
     # 关系定义：用户与影评 (One-to-Many)
@@ -74,7 +78,11 @@ class Person(Base):
 
     person_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String(255), nullable=False, index=True)
-    bio = Column(Text, nullable=True)
+    # 姓名的全拼与首字母检索键（见 mdms/common/pinyin_search.py），支持 "xmengsi" / "jkxms" 式的前缀搜索
+    name_pinyin = Column(String(512), nullable=True, index=True)
+    name_initials = Column(String(255), nullable=True, index=True)
+    # 大字段延迟加载：人员列表、作品关联等只需姓名与照片，访问 bio 时才单独查询（需要时用 undefer 一并加载）
+    bio = deferred(Column(Text, nullable=True))
     birthdate = Column(Date, nullable=True)
     photo_url = Column(String(1024), nullable=True)
 
@@ -87,6 +95,11 @@ class Person(Base):
     # cascade='all, delete-orphan': 如果删除了这个 Person，数据库会自动删除所有涉及这个人的参演记录。
     movie_associations = relationship('MoviePerson', back_populates='person', cascade='all, delete-orphan')
 
+    __table_args__ = (
+        # 键集分页的排序键 (name, person_id)：人员库翻页按该索引顺序 seek
+        Index('idx_people_name_id', 'name', 'person_id'),
+    )
+
     def __repr__(self):
         return f"<Person(name='{self.name}')>"
 
@@ -122,7 +135,11 @@ class Movie(Base):
 
     movie_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String(255), nullable=False, index=True)
-    synopsis = Column(Text, nullable=True)
+    # 标题的全拼与首字母检索键（见 mdms/common/pinyin_search.py），支持 "xiaoshenke" / "xsk" 式的前缀搜索
+    title_pinyin = Column(String(512), nullable=True, index=True)
+    title_initials = Column(String(255), nullable=True, index=True)
+    # 大字段延迟加载：列表、关联加载等场景不读取剧情简介，访问 synopsis 时才单独查询（需要时用 undefer 一并加载）
+    synopsis = deferred(Column(Text, nullable=True))
     release_date = Column(Date, nullable=True)
     runtime_minutes = Column(Integer, nullable=True)
     country = Column(String(50), nullable=True)
@@ -130,6 +147,8 @@ class Movie(Base):
     poster_url = Column(String(1024), nullable=True)
     average_rating = Column(Numeric(4, 2), nullable=False, server_default='0.00')
     rating_count = Column(Integer, nullable=False, server_default='0')
+    # 评分总和：与 rating_count 一起支持 O(1) 的增量维护，average_rating = rating_sum / rating_count
+    rating_sum = Column(Integer, nullable=False, server_default='0')
 
     # 关系定义：电影与影评 (One-to-Many)
     # 类似于 User.reviews。
@@ -153,11 +172,25 @@ class Movie(Base):
     people_associations = relationship('MoviePerson', back_populates='movie', cascade='all, delete-orphan')
 
     # 使用 __table_args__ 来定义需要降序的索引
+    # 以列对象（而非字符串）构造降序表达式，各方言都能正确渲染 "列名 DESC"：
+    # MySQL 8.0+ 与 SQLite 会建立真正的降序索引，旧版 MySQL 忽略 DESC 后仍可反向扫描
     __table_args__ = (
         # 优化“Top 10”或“按评分排序”查询 (ORDER BY average_rating DESC)
-        Index('idx_movies_average_rating', desc('average_rating')),
+        Index('idx_movies_average_rating', desc(average_rating)),
         # 优化“最新上映”查询 (ORDER BY release_date DESC)
-        Index('idx_movies_release_date', desc('release_date')),
+        Index('idx_movies_release_date', desc(release_date)),
+        # 键集分页的排序键 (title, movie_id)：电影库翻页按该索引顺序 seek
+        Index('idx_movies_title_id', 'title', 'movie_id'),
+        # 电影库多维筛选：国家 / 语言为等值条件，其后接键集分页的排序键，按条件定位后即是画廊顺序，无需再排序
+        Index('idx_movies_country_title', 'country', 'title', 'movie_id'),
+        Index('idx_movies_language_title', 'language', 'title', 'movie_id'),
+        # 电影库多维筛选：片长区间、最低评分人数（最低评分使用 idx_movies_average_rating）
+        Index('idx_movies_runtime', 'runtime_minutes'),
+        Index('idx_movies_rating_count', 'rating_count'),
+        # 标题 + 简介全文索引（仅 MySQL）：ngram 分词器按字切分，中文标题无需空格分词也能检索
+        # SQLite 使用 FTS5 虚拟表 movies_fts 代替，见文件末尾的 MOVIE_FTS_DDL
+        Index('ft_movies_title_synopsis', 'title', 'synopsis',
+              mysql_prefix='FULLTEXT', mysql_with_parser='ngram').ddl_if(dialect='mysql'),
     )
 
     def __repr__(self):
@@ -195,7 +228,9 @@ class Review(Base):
         # 复合唯一约束：确保一个用户对同一部电影只能发一篇影评。
         UniqueConstraint('user_id', 'movie_id', name='uq_user_movie_review'),
         # 检查约束：确保评分在 1 到 10 之间。
-        CheckConstraint('rating >= 1 AND rating <= 10', name='ck_rating_range')
+        CheckConstraint('rating >= 1 AND rating <= 10', name='ck_rating_range'),
+        # 全局搜索的影评匹配：按发布时间倒序读取最近的影评，无需对整张表排序
+        Index('idx_reviews_created_at', 'created_at'),
     )
 
     def __repr__(self):
@@ -218,7 +253,8 @@ class MoviePerson(Base):
     person_id = Column(String(36), ForeignKey('people.person_id'), nullable=False, index=True)
 
     # 额外数据：这两个字段是我们在纯关联表（如 movies_genres）中无法存储的。
-    role = Column(Enum('Director', 'Actor', 'Writer', 'Producer', name='crew_role_enum'), nullable=False)
+    role = Column(Enum('Director', 'Actor', 'Writer', 'Producer', name='crew_role_enum', create_constraint=True),
+                  nullable=False)
     character_name = Column(String(255), nullable=True)
 
     # 关系定义：关联对象所属的电影 (Many-to-One)
@@ -231,5 +267,147 @@ class MoviePerson(Base):
     # 当通过 MoviePerson 对象访问 .person 时，会得到对应的 Person 实例。
     person = relationship('Person', back_populates='movie_associations')
 
+    __table_args__ = (
+        # 全局搜索的角色名匹配：按角色名顺序读取该覆盖索引，凑满结果数即停止，无需回表与排序
+        Index('idx_movies_people_character', 'character_name', 'movie_id', 'person_id'),
+    )
+
     def __repr__(self):
-        return f"<MoviePerson(movie_id='{self.movie_id}', person_id='{self.person_id}', role='{self.role}')>"
\ No newline at end of file
+        return f"<MoviePerson(movie_id='{self.movie_id}', person_id='{self.person_id}', role='{self.role}')>"
+
+
+class MovieStatsDirty(Base):
+    """
+    电影统计脏数据日志表 (Movie_Stats_Dirty)
+    记录影评发生过变化的电影 ID，由 reviews 表上的触发器自动写入。
+    启动时的一致性检查只需重算这里登记过的电影，代价与影评变动量成正比，而不是与电影总数成正比。
+    """
+    __tablename__ = 'movie_stats_dirty'
+
+    # 自增主键：一致性检查以最大 entry_id 作为快照边界，只清除已处理的日志
+    entry_id = Column(Integer, primary_key=True, autoincrement=True)
+    # 不设外键：删除电影时级联删除影评也会写入日志，此时电影记录已不存在
+    movie_id = Column(String(36), nullable=False, index=True)
+    marked_at = Column(DateTime, server_default=func.now())
+
+    def __repr__(self):
+        return f"<MovieStatsDirty(movie_id='{self.movie_id}')>"
+
+
+# reviews 表上的触发器：任何途径（包括绕过 ReviewManager 的直接 SQL）对影评的增删改
+# 都会把受影响的 movie_id 写入 movie_stats_dirty。格式为 {触发器名: (触发事件, 触发动作)}
+REVIEW_DIRTY_TRIGGERS = {
+    'trg_reviews_dirty_insert': (
+        'INSERT', "INSERT INTO movie_stats_dirty (movie_id) VALUES (NEW.movie_id)"
+    ),
+    'trg_reviews_dirty_update': (
+        'UPDATE', "INSERT INTO movie_stats_dirty (movie_id) VALUES (OLD.movie_id), (NEW.movie_id)"
+    ),
+    'trg_reviews_dirty_delete': (
+        'DELETE', "INSERT INTO movie_stats_dirty (movie_id) VALUES (OLD.movie_id)"
+    ),
+}
+
+
+def review_dirty_trigger_sql(name, dialect_name):
+    """
+    按方言生成触发器建表语句（Alembic 迁移中使用同一函数）
+    MySQL 的单语句触发器不需要 BEGIN ... END；SQLite 的触发器体必须包在 BEGIN ... END 中
+    """
+    timing, action = REVIEW_DIRTY_TRIGGERS[name]
+    if dialect_name == 'sqlite':
+        return (f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {timing} ON reviews FOR EACH ROW "
+                f"BEGIN {action}; END")
+    return f"CREATE TRIGGER {name} AFTER {timing} ON reviews FOR EACH ROW {action}"
+
+
+# 通过 create_all 建表时（reset_db / import_movies_data）同步创建触发器
+# create_all 可能在表已存在时重复执行：MySQL 先删除同名触发器再重建，SQLite 使用 IF NOT EXISTS
+for _trigger_name in REVIEW_DIRTY_TRIGGERS:
+    event.listen(Base.metadata, 'after_create',
+                 DDL(f"DROP TRIGGER IF EXISTS {_trigger_name}").execute_if(dialect='mysql'))
+    for _dialect in ('mysql', 'sqlite'):
+        event.listen(Base.metadata, 'after_create',
+                     DDL(review_dirty_trigger_sql(_trigger_name, _dialect)).execute_if(dialect=_dialect))
+
+
+# SQLite 全文检索：FTS5 外部内容表（不重复存储正文，只保存索引），trigram 分词器支持中文子串检索。
+# movies 以 VARCHAR 为主键，隐式 rowid 在 VACUUM 时可能被重新编号，不能作为索引行号；
+# 改由映射表 movies_fts_keys 为每部电影分配稳定的整数编号（INTEGER PRIMARY KEY 即 rowid 别名，VACUUM 不会改变），
+# 视图 movies_fts_content 按该编号提供标题与简介作为外部内容。
+# movies 上的触发器在插入、删除及修改标题/简介时同步映射与索引
+# （只监听 title、synopsis 两列，评分统计的频繁 UPDATE 不会触发重建）。
+MOVIE_FTS_TABLE = 'movies_fts'
+MOVIE_FTS_KEYS_TABLE = 'movies_fts_keys'
+MOVIE_FTS_CONTENT_VIEW = 'movies_fts_content'
+
+_fts_id = f"(SELECT fts_id FROM {MOVIE_FTS_KEYS_TABLE} WHERE movie_id = {{row}}.movie_id)"
+
+MOVIE_FTS_DDL = [
+    f"CREATE TABLE IF NOT EXISTS {MOVIE_FTS_KEYS_TABLE} ("
+    f"fts_id INTEGER PRIMARY KEY, movie_id VARCHAR(36) NOT NULL UNIQUE)",
+    f"CREATE VIEW IF NOT EXISTS {MOVIE_FTS_CONTENT_VIEW} AS "
+    f"SELECT k.fts_id AS fts_id, m.title AS title, m.synopsis AS synopsis "
+    f"FROM {MOVIE_FTS_KEYS_TABLE} k JOIN movies m ON m.movie_id = k.movie_id",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {MOVIE_FTS_TABLE} USING fts5("
+    f"title, synopsis, content='{MOVIE_FTS_CONTENT_VIEW}', content_rowid='fts_id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS trg_movies_fts_insert AFTER INSERT ON movies BEGIN "
+    f"INSERT INTO {MOVIE_FTS_KEYS_TABLE} (movie_id) VALUES (NEW.movie_id); "
+    f"INSERT INTO {MOVIE_FTS_TABLE} (rowid, title, synopsis) "
+    f"VALUES ({_fts_id.format(row='NEW')}, NEW.title, NEW.synopsis); END",
+    f"CREATE TRIGGER IF NOT EXISTS trg_movies_fts_delete AFTER DELETE ON movies BEGIN "
+    f"INSERT INTO {MOVIE_FTS_TABLE} ({MOVIE_FTS_TABLE}, rowid, title, synopsis) "
+    f"VALUES ('delete', {_fts_id.format(row='OLD')}, OLD.title, OLD.synopsis); "
+    f"DELETE FROM {MOVIE_FTS_KEYS_TABLE} WHERE movie_id = OLD.movie_id; END",
+    f"CREATE TRIGGER IF NOT EXISTS trg_movies_fts_update AFTER UPDATE OF title, synopsis ON movies BEGIN "
+    f"INSERT INTO {MOVIE_FTS_TABLE} ({MOVIE_FTS_TABLE}, rowid, title, synopsis) "
+    f"VALUES ('delete', {_fts_id.format(row='OLD')}, OLD.title, OLD.synopsis); "
+    f"INSERT INTO {MOVIE_FTS_TABLE} (rowid, title, synopsis) "
+    f"VALUES ({_fts_id.format(row='NEW')}, NEW.title, NEW.synopsis); END",
+]
+
+# 为已有电影分配编号并建立索引：只在虚拟表首次创建时执行一次
+MOVIE_FTS_POPULATE_DDL = [
+    f"INSERT OR IGNORE INTO {MOVIE_FTS_KEYS_TABLE} (movie_id) SELECT movie_id FROM movies",
+    f"INSERT INTO {MOVIE_FTS_TABLE} ({MOVIE_FTS_TABLE}) VALUES ('rebuild')",
+]
+
+MOVIE_FTS_DROP_DDL = [
+    "DROP TRIGGER IF EXISTS trg_movies_fts_insert",
+    "DROP TRIGGER IF EXISTS trg_movies_fts_delete",
+    "DROP TRIGGER IF EXISTS trg_movies_fts_update",
+    f"DROP TABLE IF EXISTS {MOVIE_FTS_TABLE}",
+    f"DROP VIEW IF EXISTS {MOVIE_FTS_CONTENT_VIEW}",
+    f"DROP TABLE IF EXISTS {MOVIE_FTS_KEYS_TABLE}",
+]
+
+
+def create_movie_fts(connection):
+    """
+    创建 SQLite 全文检索的映射表、内容视图、虚拟表与触发器（Alembic 迁移中使用同一函数）
+    create_all 可能在表已存在时重复执行：各语句均为 IF NOT EXISTS，已有索引由触发器维护，不再整体重建
+    :return: 是否为首次创建
+    """
+    created = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (MOVIE_FTS_TABLE,)
+    ).first() is None
+    for statement in MOVIE_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    if created:
+        for statement in MOVIE_FTS_POPULATE_DDL:
+            connection.exec_driver_sql(statement)
+    return created
+
+
+@event.listens_for(Base.metadata, 'after_create')
+def _create_movie_fts(target, connection, **kw):
+    if connection.dialect.name == 'sqlite':
+        create_movie_fts(connection)
+
+
+@event.listens_for(Base.metadata, 'before_drop')
+def _drop_movie_fts(target, connection, **kw):
+    # drop_all 后重新 create_all（reset_db、基准测试）时不残留指向旧数据的索引
+    if connection.dialect.name == 'sqlite':
+        for statement in MOVIE_FTS_DROP_DDL:
+            connection.exec_driver_sql(statement)
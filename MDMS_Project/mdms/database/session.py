@@ -1,8 +1,13 @@
 # mdms/database/session.py
+import atexit
 import configparser
+import logging
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker
+
+from mdms.database.instrumentation import sql_instrumentation
 
 
 # 获取当前文件(session.py)的绝对路径
@@ -29,20 +34,185 @@ if not files_read:
 
 db_config = config['database']
 
+# 环境变量覆盖前缀：例如 MDMS_DB_POOL_SIZE=20 会覆盖 [database] 中的 pool_size
+ENV_PREFIX = 'MDMS_DB_'
+
+
+def get_db_option(key, fallback=None):
+    """
+    读取数据库配置项，优先级：环境变量 MDMS_DB_<KEY> > config.ini [database] > fallback
+    """
+    env_value = os.environ.get(f"{ENV_PREFIX}{key.upper()}")
+    if env_value is not None:
+        return env_value
+    return db_config.get(key, fallback)
+
+
+def get_db_int(key, fallback):
+    value = get_db_option(key)
+    return int(value) if value not in (None, '') else fallback
+
+
+def get_db_bool(key, fallback):
+    value = get_db_option(key)
+    if value in (None, ''):
+        return fallback
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+# 数据库后端：mysql+pymysql（默认）或 sqlite（嵌入式单文件数据库，适合笔记本/展台/CI）
+DB_TYPE = get_db_option('type', 'mysql+pymysql')
+IS_SQLITE = DB_TYPE.startswith('sqlite')
+
+
+def build_database_url():
+    """ 根据后端类型构建数据库连接 URL """
+    if IS_SQLITE:
+        # SQLite 数据库文件路径，相对路径以项目根目录为基准
+        db_path = get_db_option('path', 'mdms.db')
+        if not os.path.isabs(db_path):
+            db_path = os.path.join(project_root, db_path)
+        return f"{DB_TYPE}:///{db_path}"
+
+    return (
+        f"{DB_TYPE}://"
+        f"{get_db_option('username')}:{get_db_option('password')}@"
+        f"{get_db_option('host')}:{get_db_option('port')}/"
+        f"{get_db_option('db_name')}?charset=utf8mb4"
+    )
+
+
 # 构建数据库连接 URL
-DATABASE_URL = (
-    f"{db_config['type']}://"
-    f"{db_config['username']}:{db_config['password']}@"
-    f"{db_config['host']}:{db_config['port']}/"
-    f"{db_config['db_name']}?charset=utf8mb4"
-)
+DATABASE_URL = build_database_url()
+
+# SQL 日志：不再使用 create_engine(echo=True) 直接打印到 stdout，
+# 而是交给 logging 模块的 sqlalchemy.engine 记录器，生产环境关闭时不产生任何格式化开销
+# echo 取值：false（默认，关闭）/ true（记录语句）/ debug（记录语句及结果行）
+SQL_ECHO = (get_db_option('echo', 'false') or 'false').strip().lower()
+sql_logger = logging.getLogger('sqlalchemy.engine')
+if SQL_ECHO in ('1', 'true', 'yes', 'on', 'debug'):
+    sql_logger.setLevel(logging.DEBUG if SQL_ECHO == 'debug' else logging.INFO)
+    if not sql_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(name)s] %(message)s'))
+        sql_logger.addHandler(handler)
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    SQLite 连接建立时的调优：WAL 日志模式允许读写并发，synchronous=NORMAL 在 WAL 下
+    仍然保证崩溃一致性；同时放大页缓存、开启内存映射，并启用外键约束
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={get_db_option('sqlite_journal_mode', 'WAL')}")
+    cursor.execute(f"PRAGMA synchronous={get_db_option('sqlite_synchronous', 'NORMAL')}")
+    # cache_size 取负值表示以 KiB 为单位
+    cursor.execute(f"PRAGMA cache_size=-{get_db_int('sqlite_cache_size_kb', 65536)}")
+    cursor.execute(f"PRAGMA mmap_size={get_db_int('sqlite_mmap_size', 268435456)}")
+    cursor.execute(f"PRAGMA busy_timeout={get_db_int('sqlite_busy_timeout', 5000)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def create_db_engine(url):
+    """
+    按方言创建数据库引擎（连接池参数均可通过 config.ini 或环境变量调整）
+    benchmark 等脚本也通过该函数创建引擎，保证与应用使用相同的调优参数
+    """
+    url = make_url(url)
+    pool_kwargs = dict(
+        pool_size=get_db_int('pool_size', 5),
+        max_overflow=get_db_int('max_overflow', 10),
+        pool_timeout=get_db_int('pool_timeout', 30),
+        pool_recycle=get_db_int('pool_recycle', 3600),
+        pool_pre_ping=get_db_bool('pool_pre_ping', True),
+    )
+
+    if url.get_backend_name() == 'sqlite':
+        # 后台线程（统计同步等）会复用连接池中的连接，需关闭同线程检查
+        new_engine = create_engine(
+            url,
+            connect_args={'check_same_thread': False, 'timeout': get_db_int('connect_timeout', 10)},
+            **pool_kwargs
+        )
+        event.listen(new_engine, 'connect', apply_sqlite_pragmas)
+        return new_engine
+
+    # 连接参数：连接/读写超时（秒）以及单条语句的执行超时（毫秒，0 表示不限制）
+    connect_args = {
+        'connect_timeout': get_db_int('connect_timeout', 10),
+    }
+    read_timeout = get_db_int('read_timeout', 0)
+    if read_timeout:
+        connect_args['read_timeout'] = read_timeout
+    write_timeout = get_db_int('write_timeout', 0)
+    if write_timeout:
+        connect_args['write_timeout'] = write_timeout
+    statement_timeout = get_db_int('statement_timeout', 0)
+    if statement_timeout:
+        # MySQL 5.7.8+：限制本会话中 SELECT 语句的最长执行时间
+        connect_args['init_command'] = f"SET SESSION max_execution_time={statement_timeout}"
+
+    return create_engine(url, connect_args=connect_args, **pool_kwargs)
+
 
 # 创建数据库引擎
-engine = create_engine(DATABASE_URL, echo=True)
+engine = create_db_engine(DATABASE_URL)
+
+# SQL 监测：按用户动作统计语句数量与耗时，并标记疑似 N+1 查询（默认关闭）
+if get_db_bool('instrument', False):
+    sql_instrumentation.n_plus_one_threshold = get_db_int('instrument_threshold', 5)
+    sql_instrumentation.install(engine)
+
+    instrument_logger = logging.getLogger('mdms.sql')
+    instrument_logger.setLevel(logging.INFO)
+    if not instrument_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(name)s] %(message)s'))
+        instrument_logger.addHandler(handler)
+
+    # 配置了导出路径时，进程退出前将监测结果写入 JSON 文件
+    instrument_dump = get_db_option('instrument_dump', '')
+    if instrument_dump:
+        if not os.path.isabs(instrument_dump):
+            instrument_dump = os.path.join(project_root, instrument_dump)
+        atexit.register(sql_instrumentation.dump_json, instrument_dump)
 
 # 创建会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+# session.info 中登记提交后回调的键
+AFTER_COMMIT_KEY = 'mdms_after_commit'
+
+
+def run_after_commit(session, callback, *args):
+    """
+    登记在会话事务成功提交后执行的回调
+    缓存失效、内存索引增量更新等副作用无法随事务回滚，必须等数据真正落库后再执行；
+    事务回滚或会话未提交就关闭时，登记的回调一并丢弃。
+    参数在登记时求值：提交后 ORM 对象的属性已过期，回调中不能再读取。
+    """
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append((callback, args))
+
+
+@event.listens_for(Session, 'after_commit')
+def _run_commit_callbacks(session):
+    for callback, args in session.info.pop(AFTER_COMMIT_KEY, ()):
+        try:
+            callback(*args)
+        except Exception as e:
+            # 数据已经提交，回调失败不应让调用方误以为保存失败
+            print(f"提交后回调执行失败: {e}")
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _discard_commit_callbacks(session, transaction):
+    # 最外层事务结束（回滚或关闭）时清掉未执行的回调；提交时回调已在 after_commit 中取走
+    if transaction.parent is None:
+        session.info.pop(AFTER_COMMIT_KEY, None)
+
 # 提供一个简单的函数来获取数据库会话
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,204 @@
+import sys
+import os
+import re
+import uuid
+import random
+import argparse
+from datetime import date, timedelta
+
+# ==========================================
+# 1. 环境配置 (确保能找到 mdms 模块)
+# ==========================================
+sys.path.append(os.getcwd())
+
+from sqlalchemy import insert, select, func, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, Query
+
+from mdms.database.session import DATABASE_URL, create_db_engine
+from mdms.database.models import Base, Movie, Genre, movies_genres_table
+from mdms.common.keyset_pager import KeysetPager
+from mdms.common.movie_filter import MovieFilter, MovieQueryBuilder
+from mdms.benchmark import default_bench_url
+
+# ==========================================
+# 2. 配置参数
+# ==========================================
+# 默认数据规模：数据太少时 MySQL 会直接选择全表扫描，检查便失去意义
+DEFAULT_MOVIES = 20_000
+INSERT_BATCH = 5_000
+PAGE_SIZE = 20
+COUNTRIES = ['美国', '日本', '英国', '中国香港', '中国大陆', '韩国', '法国', '意大利', '德国', '印度']
+LANGUAGES = ['英语', '日语', '汉语普通话', '粤语', '韩语', '法语', '意大利语', '德语', '印地语', '西班牙语']
+GENRES = ['剧情', '喜剧', '动作', '爱情', '科幻', '动画', '悬疑', '惊悚', '恐怖', '犯罪', '奇幻', '冒险']
+# 电影库画廊的投影列（与 MOVIE_CARD_COLUMNS 一致）
+CARD_COLUMNS = (Movie.movie_id, Movie.title, Movie.poster_url)
+# 不允许出现全表扫描的表
+CHECKED_TABLES = ('movies', 'movies_genres')
+
+# 电影库支持的常见筛选组合：名称 -> 筛选条件
+CASES = {
+    '年份区间': MovieFilter(year_from=1990, year_to=1999),
+    '国家': MovieFilter(country='日本'),
+    '国家 + 年份': MovieFilter(country='日本', year_from=2000),
+    '语言': MovieFilter(language='粤语'),
+    '语言 + 年份': MovieFilter(language='粤语', year_from=1980, year_to=1999),
+    '国家 + 语言': MovieFilter(country='中国香港', language='粤语'),
+    '片长区间': MovieFilter(runtime_min=150, runtime_max=180),
+    '最低评分': MovieFilter(min_rating=9),
+    '最低评分人数': MovieFilter(min_rating_count=50_000),
+    '类型（任一）': MovieFilter(genres=('科幻', '动画')),
+    '类型（全部）': MovieFilter(genres=('科幻', '动画'), match_all_genres=True),
+    '类型 + 国家': MovieFilter(genres=('犯罪',), country='韩国'),
+    '类型 + 年份 + 评分': MovieFilter(genres=('剧情',), year_from=2010, min_rating=8),
+}
+
+
+def seed(session_factory, movie_count):
+    """ 生成检查数据：各维度取值随机分布，每部电影 1 ~ 3 个类型 """
+    with session_factory() as session:
+        session.execute(insert(Genre), [{'genre_id': i + 1, 'name': name} for i, name in enumerate(GENRES)])
+        movie_rows, genre_rows = [], []
+        for i in range(movie_count):
+            movie_id = str(uuid.uuid4())
+            index = random.randrange(len(COUNTRIES))
+            count = int(random.paretovariate(1.2) * 100)
+            movie_rows.append({
+                'movie_id': movie_id, 'title': f'Explain Movie {i:07d}',
+                'release_date': date(1930, 1, 1) + timedelta(days=random.randrange(95 * 365)),
+                'runtime_minutes': random.randint(60, 200),
+                'country': COUNTRIES[index],
+                # 语言与国家大体对应，少量例外
+                'language': LANGUAGES[index] if random.random() < 0.9 else random.choice(LANGUAGES),
+                'average_rating': round(random.uniform(2, 10), 2),
+                'rating_count': count, 'rating_sum': count * 7,
+            })
+            for genre_id in random.sample(range(1, len(GENRES) + 1), random.randint(1, 3)):
+                genre_rows.append({'movie_id': movie_id, 'genre_id': genre_id})
+
+            if len(movie_rows) >= INSERT_BATCH:
+                session.execute(insert(Movie), movie_rows)
+                session.execute(insert(movies_genres_table), genre_rows)
+                movie_rows, genre_rows = [], []
+
+        if movie_rows:
+            session.execute(insert(Movie), movie_rows)
+            session.execute(insert(movies_genres_table), genre_rows)
+        session.commit()
+
+        # 收集统计信息，让优化器按真实的数据分布选择执行计划
+        if session.bind.dialect.name == 'sqlite':
+            session.connection().exec_driver_sql('ANALYZE')
+        else:
+            session.connection().exec_driver_sql('ANALYZE TABLE movies, movies_genres, genres')
+        session.commit()
+
+
+def capture_statements(engine, session_factory, movie_filter):
+    """
+    按电影库画廊的方式执行一次筛选：COUNT 总数、第 1 页（多取一行探测下一页）、第 2 页（按锚点 seek），
+    记录实际发送到数据库的 SQL 与参数
+    """
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    query = MovieQueryBuilder(Query(CARD_COLUMNS)).apply(movie_filter).build()
+    pager = KeysetPager([Movie.title, Movie.movie_id])
+    labels = ['COUNT', '第 1 页', '第 2 页']
+    event.listen(engine, 'before_cursor_execute', on_execute)
+    try:
+        with session_factory() as session:
+            session.execute(select(func.count()).select_from(query.statement.subquery()))
+            pager.probe_page(query.with_session(session), 1, PAGE_SIZE)
+            pager.probe_page(query.with_session(session), 2, PAGE_SIZE)
+    finally:
+        event.remove(engine, 'before_cursor_execute', on_execute)
+    return list(zip(labels, statements))
+
+
+def explain(engine, statement, parameters):
+    """
+    返回 (执行计划摘要, 全表扫描的表, 全索引扫描的索引)
+    SQLite 使用 EXPLAIN QUERY PLAN（SCAN 表示扫描整张表，带 USING INDEX 时为按索引顺序扫描整个索引），
+    MySQL 使用 EXPLAIN（type = ALL 为全表扫描，type = index 为全索引扫描）
+    """
+    with engine.connect() as conn:
+        if engine.dialect.name == 'sqlite':
+            details = [row[3] for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+            scans = [m.groups() for m in
+                     (re.match(r'SCAN (?:TABLE )?(\w+)(?: USING (?:COVERING )?INDEX (\w+))?', d) for d in details) if m]
+            scans = [(table, index) for table, index in scans if table in CHECKED_TABLES]
+            return details, [t for t, i in scans if i is None], [i for t, i in scans if i is not None]
+
+        rows = [row._mapping for row in conn.exec_driver_sql('EXPLAIN ' + statement, parameters)]
+        rows = [row for row in rows if row['table'] in CHECKED_TABLES]
+        details = [f"{row['table']}: {row['type']} {row['key'] or ''}".strip() for row in rows]
+        return (details, [row['table'] for row in rows if row['type'] == 'ALL'],
+                [row['key'] for row in rows if row['type'] == 'index'])
+
+
+def check(scanned, index_scans):
+    """
+    判定一条语句：任何语句都不允许全表扫描或全索引扫描。
+    取页语句按排序键索引 (title, movie_id) 顺序扫描同样不通过：筛选列不在该索引中，只能逐行回表检查条件，
+    LIMIT 只有在命中的行足够多时才会提前结束，条件命中少时几乎读完整个索引。
+    :return: (是否通过, 状态说明)
+    """
+    if scanned:
+        return False, f"全表扫描: {', '.join(scanned)}"
+    if index_scans:
+        return False, f"全索引扫描: {', '.join(index_scans)}"
+    return True, "OK"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MDMS 电影库多维筛选执行计划检查（确认各常见组合均走索引）")
+    parser.add_argument('--url', action='append', default=None,
+                        help="检查库连接地址，可重复指定以依次检查多个后端；"
+                             "默认为 config.ini 中的库加 _bench 后缀（MySQL 需预先创建）")
+    parser.add_argument('--movies', type=int, default=DEFAULT_MOVIES, help="生成的电影数量")
+    parser.add_argument('--verbose', action='store_true', help="输出每条语句的完整执行计划")
+    args = parser.parse_args()
+
+    urls = [make_url(u) for u in args.url] if args.url else [default_bench_url()]
+    failures = 0
+    for url in urls:
+        failures += run_checks(url, args)
+    sys.exit(1 if failures else 0)
+
+
+def run_checks(url, args):
+    """ 针对单个数据库后端检查全部筛选组合，返回未通过的语句数 """
+    production_url = make_url(DATABASE_URL)
+    if url.database == production_url.database and url.host == production_url.host:
+        print("[错误] 检查库不能与业务库相同，检查会清空所有表。")
+        return 1
+
+    engine = create_db_engine(url)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    seed(session_factory, args.movies)
+
+    print(f"\n检查库: {url.render_as_string(hide_password=True)}（{args.movies} 部电影）")
+    failures = 0
+    for name, movie_filter in CASES.items():
+        for label, (statement, parameters) in capture_statements(engine, session_factory, movie_filter):
+            details, scanned, index_scans = explain(engine, statement, parameters)
+            passed, status = check(scanned, index_scans)
+            failures += not passed
+            print(f"{name:<14}{label:<6} {status}")
+            if args.verbose or not passed:
+                for detail in details:
+                    print(f"    {detail}")
+
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    print(f"\n共 {len(CASES)} 种组合，{failures} 条语句未通过")
+    return failures
+
+
+if __name__ == "__main__":
+    main()
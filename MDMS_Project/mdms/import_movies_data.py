@@ -12,6 +12,8 @@ sys.path.append(os.getcwd())
 from mdms.database.session import SessionLocal, engine
 # [新增] 引入 User 和 Review 模型
 from mdms.database.models import Base, Movie, Genre, Person, MoviePerson, User, Review
+from mdms.common.review_manager import review_manager
+from mdms.common.pinyin_search import pinyin_search
 
 # ==========================================
 # 2. 配置参数
@@ -65,6 +67,8 @@ def main():
         # ==========================================
         # 4. 构建内存缓存
         # ==========================================
+        if not pinyin_search.available():
+            print("[提示] 未安装 pypinyin，将不生成拼音检索键 (pip install pypinyin)")
         print("正在构建缓存 (Genre/Person)...")
 
         genre_cache = {g.name: g for g in session.query(Genre).all()}
@@ -74,6 +78,7 @@ def main():
         print(f"准备处理 {len(movies_data)} 部电影...")
         new_count = 0
         skip_count = 0
+        new_movie_ids = []
 
         # ==========================================
         # 5. 遍历并插入电影数据
@@ -107,8 +112,12 @@ def main():
                 language=m_data.get('language', '')[:50],
                 poster_url=m_data.get('poster_path', ''),
                 average_rating=m_data.get('rating', 0),
-                rating_count=m_data.get('rating_count', 0)
+                rating_count=m_data.get('rating_count', 0),
+                # 由平均分与人数反推评分总和，保证后续增量更新的基数自洽
+                rating_sum=round(float(m_data.get('rating', 0) or 0) * int(m_data.get('rating_count', 0) or 0))
             )
+            # 预先计算标题的拼音检索键
+            pinyin_search.fill_movie(movie)
             session.add(movie)
             session.flush()
 
@@ -132,6 +141,7 @@ def main():
 
                 if p_name not in person_cache:
                     new_person = Person(name=p_name, photo_url=p_photo)
+                    pinyin_search.fill_person(new_person)
                     session.add(new_person)
                     session.flush()
                     person_cache[p_name] = new_person
@@ -154,6 +164,7 @@ def main():
                     added_person_keys.add(unique_key)
 
             new_count += 1
+            new_movie_ids.append(movie.movie_id)
             print(f"  [新增电影] {title}")
 
         # ==========================================
@@ -228,6 +239,9 @@ def main():
 
         print(f"  [新增评论] 共生成 {review_count} 条随机评论")
 
+        # 6.4 登记新导入的电影，下次启动时的一致性检查会按实际影评重算其统计数据
+        review_manager.mark_movies_dirty(session, new_movie_ids)
+
         # ==========================================
         # 7. 提交事务
         # ==========================================
@@ -0,0 +1,143 @@
+# mdms/views/global_search_box.py
+from PySide6.QtCore import Qt, Signal, QEvent, QPoint
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication, QVBoxLayout, QListWidgetItem
+from qfluentwidgets import SearchLineEdit, SimpleCardWidget, ListWidget, CaptionLabel, isDarkTheme
+
+from mdms.common.global_search import GlobalSearch
+from mdms.common.search_debouncer import SearchDebouncer
+from mdms.common.prefix_index import autocomplete, PrefixCompleter
+
+
+class SearchResultPanel(SimpleCardWidget):
+    """ 搜索结果浮层：覆盖在页面内容之上，使用不透明背景 """
+
+    def _normalBackgroundColor(self):
+        return QColor(43, 43, 43) if isDarkTheme() else QColor(249, 249, 249)
+
+
+class GlobalSearchBox(SearchLineEdit):
+    """
+    主窗口标题栏中的全局搜索框
+    输入关键词后（防抖）由 GlobalSearch 并发查询电影、人员、角色、影评，结果显示在搜索框下方的浮层中：
+    最先返回的来源立即展示，其余来源返回后继续合并补充。
+    点击结果发出 resultActivated，由主窗口跳转到对应的详情页。
+    浮层在点击结果、按 Esc、清空搜索框或点击浮层以外的区域时隐藏。
+    """
+
+    # 信号：选中某条结果，参数为 (详情页类型 'movie' / 'person', ID)
+    resultActivated = Signal(str, str)
+
+    # 结果来源的类型标签
+    TAGS = {'movie': '电影', 'person': '人物', 'character': '角色', 'review': '影评'}
+    # 浮层宽度与最多同时显示的行数
+    PANEL_WIDTH = 440
+    VISIBLE_ROWS = 10
+    ROW_HEIGHT = 38
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.setPlaceholderText("搜索电影、人物、角色、影评")
+        self.setFixedWidth(300)
+        self._request = 0
+
+        self.service = GlobalSearch(self)
+        self.service.resultsUpdated.connect(self.on_results_updated)
+        self.debouncer = SearchDebouncer(self, self)
+        self.debouncer.searchRequested.connect(self.on_search_requested)
+        # 电影标题与人员姓名的前缀补全，选中候选后立即搜索
+        self.prefixCompleter = PrefixCompleter(self, autocomplete.complete_all, self)
+        self.prefixCompleter.activated.connect(lambda text: self.debouncer.flush())
+
+        # 结果浮层：主窗口的子控件，覆盖在页面内容之上
+        self.panel = SearchResultPanel(window)
+        self.panelLayout = QVBoxLayout(self.panel)
+        self.panelLayout.setContentsMargins(6, 6, 6, 6)
+        self.panelLayout.setSpacing(4)
+        self.resultList = ListWidget(self.panel)
+        self.resultList.itemClicked.connect(self.on_item_clicked)
+        self.statusLabel = CaptionLabel("", self.panel)
+        self.panelLayout.addWidget(self.resultList)
+        self.panelLayout.addWidget(self.statusLabel)
+        self.panel.hide()
+
+        window.installEventFilter(self)
+        QApplication.instance().installEventFilter(self)
+
+    def on_search_requested(self, text):
+        """ 防抖后的搜索请求：清空时收起浮层，否则发起新的搜索 """
+        if not text:
+            self.service.cancel()
+            self.panel.hide()
+            return
+        self._request = self.service.search(text)
+        self.resultList.clear()
+        self.statusLabel.setText("正在搜索…")
+        self.show_panel()
+
+    def on_results_updated(self, request, hits, finished):
+        """ 某个来源返回：以合并后的结果刷新浮层 """
+        if request != self._request:
+            return
+        self.resultList.clear()
+        for hit in hits:
+            text = f"[{self.TAGS[hit.source]}] {hit.title}"
+            if hit.subtitle:
+                text += f"  ·  {hit.subtitle}"
+            item = QListWidgetItem(text)
+            item.setToolTip(text)
+            item.setData(Qt.UserRole, (hit.target, hit.target_id))
+            self.resultList.addItem(item)
+
+        if not finished:
+            self.statusLabel.setText(f"已找到 {len(hits)} 条结果，正在搜索…")
+        elif hits:
+            self.statusLabel.setText(f"共 {len(hits)} 条结果")
+        else:
+            self.statusLabel.setText("没有找到相关结果")
+        self.show_panel()
+
+    def on_item_clicked(self, item):
+        self.panel.hide()
+        target, target_id = item.data(Qt.UserRole)
+        self.resultActivated.emit(target, target_id)
+
+    def show_panel(self):
+        """ 按结果数量调整浮层高度，并定位到搜索框正下方 """
+        rows = min(max(self.resultList.count(), 1), self.VISIBLE_ROWS)
+        self.resultList.setFixedHeight(rows * self.ROW_HEIGHT + 4)
+        self.panel.setFixedWidth(self.PANEL_WIDTH)
+        self.panel.adjustSize()
+
+        window = self.window()
+        pos = self.mapTo(window, QPoint(0, self.height() + 6))
+        x = max(min(pos.x(), window.width() - self.PANEL_WIDTH - 10), 10)
+        self.panel.move(x, pos.y())
+        self.panel.show()
+        self.panel.raise_()
+
+    def eventFilter(self, obj, e):
+        if self.panel.isVisible():
+            if e.type() == QEvent.MouseButtonPress and obj.isWidgetType():
+                # 点击浮层与搜索框以外的区域时收起
+                if not (self._contains(self.panel, e) or self._contains(self, e)):
+                    self.panel.hide()
+            elif e.type() == QEvent.Resize and obj is self.window():
+                self.show_panel()
+        return super().eventFilter(obj, e)
+
+    def keyPressEvent(self, e):
+        if e.key() == Qt.Key_Escape and self.panel.isVisible():
+            self.panel.hide()
+            return
+        super().keyPressEvent(e)
+
+    def focusInEvent(self, e):
+        # 重新聚焦时恢复上一次的结果
+        super().focusInEvent(e)
+        if self.text().strip() and self.resultList.count():
+            self.show_panel()
+
+    @staticmethod
+    def _contains(widget, e):
+        return widget.rect().contains(widget.mapFromGlobal(e.globalPosition().toPoint()))
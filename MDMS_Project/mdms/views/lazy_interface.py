@@ -0,0 +1,53 @@
+# mdms/views/lazy_interface.py
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QWidget
+
+
+class LazyInterface(QFrame):
+    """
+    延迟构建的子界面占位容器
+    注册到 FluentWindow 导航中的是这个轻量占位组件，真正的业务界面（及其首次数据库查询、
+    大量图片卡片）直到第一次被切换显示时才由工厂函数创建，并填充到占位容器中。
+    也可以通过 ensure_widget() 在空闲时提前构建。
+    """
+
+    # 信号：真实界面创建完成时触发，携带新建的界面实例
+    widgetCreated = Signal(QWidget)
+
+    def __init__(self, text: str, factory, parent=None):
+        """
+        :param text: 界面名称，用于生成导航路由所需的 objectName，并原样传给工厂函数
+        :param factory: 形如 factory(text, parent) 的可调用对象，返回真实界面实例
+        """
+        super().__init__(parent=parent)
+        # 必须设置 ObjectName，导航系统以此作为路由键
+        self.setObjectName(text.replace(' ', '-'))
+
+        self._text = text
+        self._factory = factory
+        self._widget = None
+
+        self.vBoxLayout = QVBoxLayout(self)
+        self.vBoxLayout.setContentsMargins(0, 0, 0, 0)
+
+    @property
+    def widget(self):
+        """ 获取已创建的真实界面，尚未创建时返回 None """
+        return self._widget
+
+    @property
+    def is_built(self) -> bool:
+        return self._widget is not None
+
+    def ensure_widget(self):
+        """ 确保真实界面已创建（幂等），并返回该界面 """
+        if self._widget is None:
+            self._widget = self._factory(self._text, self)
+            self.vBoxLayout.addWidget(self._widget)
+            self.widgetCreated.emit(self._widget)
+        return self._widget
+
+    def showEvent(self, e):
+        """ 首次显示时才真正构建界面 """
+        self.ensure_widget()
+        super().showEvent(e)
@@ -1,16 +1,22 @@
 import sys
 import traceback
 
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import QApplication
-from qfluentwidgets import NavigationItemPosition, FluentWindow, FluentIcon as FIF
+from qfluentwidgets import (NavigationItemPosition, FluentWindow, FluentIcon as FIF,
+                            InfoBar, InfoBarIcon, InfoBarPosition, ProgressRing)
 
 from mdms.common.user_manager import user_manager
-from mdms.common.review_manager import review_manager
-from mdms.database.models import Movie
-from mdms.database.session import SessionLocal
+from mdms.common.stats_sync_worker import StatsSyncWorker
+from mdms.common.data_loader import DataLoader
+from mdms.common.trigram_index import fuzzy_search
+from mdms.common.prefix_index import autocomplete
+from mdms.common.count_cache import count_cache
+from mdms.common.page_cache import page_cache
 from mdms.views.admin.admin_interface import AdminInterface
+from mdms.views.global_search_box import GlobalSearchBox
+from mdms.views.lazy_interface import LazyInterface
 from mdms.views.movie.movie_interface import MovieInterface
 from mdms.views.my_review.my_review_interface import MyReviewInterface
 from mdms.views.people.people_interface import PeopleInterface
@@ -28,42 +34,64 @@ class MainWindow(FluentWindow):
     # 定义退出登录信号，用于通知应用程序控制器（Controller）切换回登录界面
     logoutRequested = Signal()
 
-    def __init__(self, test_mode=False):
+    # 空闲预构建：窗口显示后等待的毫秒数，以及相邻两个界面之间的间隔
+    PREBUILD_DELAY_MS = 1500
+    PREBUILD_INTERVAL_MS = 300
+
+    def __init__(self, test_mode=False, prebuild_interfaces=False):
         super().__init__()
 
         # 测试模式标志：若为 True，则忽略权限直接实例化管理员后台界面
         self.test_mode = test_mode
 
-        # 系统冷启动数据自检：重新计算并更新所有电影的平均分与评分人数，确保数据一致性
-        self.sync_movie_stats()
+        # 后台数据自检线程与进度提示条
+        self.statsSyncWorker = None
+        self.syncInfoBar = None
+        self.syncProgressRing = None
+        # 后台任务加载器（容错搜索索引构建）
+        self.loader = DataLoader(self)
 
         # 实例化各功能模块接口
+        # 所有子界面均以 LazyInterface 占位注册到导航中，真实界面及其数据库查询在首次切换到该页时才构建
         # 1. 电影库：核心画廊浏览
-        self.MovieInterface = MovieInterface('Movie Library', self)
+        self.MovieInterface = LazyInterface('Movie Library', MovieInterface, self)
 
         # 2. 排行榜：展示评分最高的前 100 部电影
-        self.top100Interface = Top100Interface('TOP 100 Movies', self)
+        self.top100Interface = LazyInterface('TOP 100 Movies', Top100Interface, self)
 
         # 3. 演职人员库：导演、演员数据的搜索与查看
-        self.peopleInterface = PeopleInterface('People Library', self)
+        self.peopleInterface = LazyInterface('People Library', PeopleInterface, self)
 
         # 4. 个人中心：展示当前登录用户的影评记录
-        self.myReviewInterface = MyReviewInterface('My Reviews', self)
+        self.myReviewInterface = LazyInterface('My Reviews', MyReviewInterface, self)
 
         # 5. 管理员后台：仅在管理员登录或测试模式下实例化
         self.adminInterface = None
         if (user_manager.is_logged_in and user_manager.session_role == 'admin') or self.test_mode:
-            self.adminInterface = AdminInterface('Admin Data Management', self)
+            self.adminInterface = LazyInterface('Admin Data Management', AdminInterface, self)
 
         # 6. 系统设置：包含应用偏好设置及退出登录逻辑
-        self.settingInterface = SettingInterface('Settings', self)
-        # 监听设置界面的登出请求并转发给控制器
-        self.settingInterface.logoutRequested.connect(self.handle_logout)
+        self.settingInterface = LazyInterface('Settings', SettingInterface, self)
+        # 设置界面创建后，监听其登出请求并转发给控制器
+        self.settingInterface.widgetCreated.connect(
+            lambda w: w.logoutRequested.connect(self.handle_logout)
+        )
 
         # 初始化侧边导航栏路由
         self.initNavigation()
         # 配置主窗口几何属性与全局样式
         self.initWindow()
+        # 标题栏中的全局搜索框
+        self.initGlobalSearch()
+
+        # 可选：窗口显示后利用空闲时间依次预构建其余子界面，使首次切换无需等待
+        if prebuild_interfaces:
+            QTimer.singleShot(self.PREBUILD_DELAY_MS, self.prebuild_next_interface)
+
+        # 系统冷启动数据自检：在后台线程中校准电影的平均分与评分人数，不阻塞窗口显示
+        self.sync_movie_stats()
+        # 空闲时构建容错搜索索引，供各画廊搜索无结果时给出“您是不是要找”建议
+        self.build_search_index()
 
     def initNavigation(self):
         """
@@ -109,6 +137,40 @@ class MainWindow(FluentWindow):
         self.setWindowIcon(QIcon(":/qfluentwidgets/images/logo.png"))
         self.setWindowTitle('电影资料库管理系统 (MDMS)')
 
+    def initGlobalSearch(self):
+        """
+        在标题栏中部放置全局搜索框，一次搜索电影、人物、角色与影评
+        """
+        self.globalSearchBox = GlobalSearchBox(self)
+        self.globalSearchBox.resultActivated.connect(self.open_search_result)
+        # 标题栏布局：图标、标题、伸缩空白、窗口按钮；搜索框插入空白之后并在右侧补一段伸缩，使其居中
+        self.titleBar.hBoxLayout.insertWidget(3, self.globalSearchBox, 0, Qt.AlignVCenter)
+        self.titleBar.hBoxLayout.insertStretch(4, 1)
+
+    def open_search_result(self, target, target_id):
+        """
+        全局搜索结果路由：电影（含角色、影评结果）打开电影库中的电影详情，人物打开演职人员详情
+        """
+        interface = self.MovieInterface if target == 'movie' else self.peopleInterface
+        widget = interface.ensure_widget()
+        widget.show_detail(target_id)
+        self.switchTo(interface)
+
+    def prebuild_next_interface(self):
+        """
+        空闲预构建：每次只构建一个尚未创建的子界面，再通过定时器让出事件循环，
+        避免一次性构建全部界面造成卡顿
+        """
+        lazy_interfaces = [
+            self.MovieInterface, self.top100Interface, self.peopleInterface,
+            self.myReviewInterface, self.adminInterface, self.settingInterface
+        ]
+        for interface in lazy_interfaces:
+            if interface is not None and not interface.is_built:
+                interface.ensure_widget()
+                QTimer.singleShot(self.PREBUILD_INTERVAL_MS, self.prebuild_next_interface)
+                return
+
     def handle_logout(self):
         """
         处理登出逻辑
@@ -119,34 +181,111 @@ class MainWindow(FluentWindow):
     def sync_movie_stats(self):
         """
         启动时数据同步逻辑
-        遍历数据库中所有电影记录，调用 ReviewManager 重新计算每部电影的平均分。
-        此操作解决了直接修改评论数据可能导致的平均分统计滞后问题。
+        在后台线程中只重算 movie_stats_dirty 日志中登记过的电影（影评发生过变化的电影），
+        日志由 reviews 表触发器写入，直接修改评论数据导致的平均分统计滞后同样会被修正。
+        主窗口立即显示，同步进度通过右下角的 InfoBar 与进度环展示。
         """
-        session = SessionLocal()
-        try:
-            # 性能优化：仅查询主键 movie_id，减少内存占用
-            all_movies = session.query(Movie.movie_id).all()
-
-            if not all_movies:
-                return
-
-            print(f"数据初始化：正在同步 {len(all_movies)} 部电影的评分统计数据...")
-
-            # 遍历所有电影 ID 执行状态更新
-            for (mid,) in all_movies:
-                # 核心逻辑：查询该 ID 下的所有评论并重写 Movie 表中的冗余统计字段
-                review_manager.update_movie_status(session, mid)
-
-            # 统一提交事务，确保操作原子性
-            session.commit()
-            print("数据初始化：评分统计数据同步完成。")
+        self.statsSyncWorker = StatsSyncWorker(self)
+        self.statsSyncWorker.syncStarted.connect(self.on_sync_started)
+        self.statsSyncWorker.progressChanged.connect(self.on_sync_progress)
+        self.statsSyncWorker.syncFinished.connect(self.on_sync_finished)
+        self.statsSyncWorker.syncFailed.connect(self.on_sync_failed)
+        self.statsSyncWorker.start()
+
+    def build_search_index(self):
+        """
+        在后台线程中构建容错搜索索引（载入快照或从数据库重建）与搜索框的自动补全索引
+        重新登录时已构建的索引直接复用
+        """
+        if not fuzzy_search.is_ready():
+            self.loader.submit('search_index', fuzzy_search.build, self.on_search_index_ready,
+                               action='fuzzy_search.build', priority=DataLoader.IDLE_PRIORITY)
+        if not autocomplete.is_ready():
+            self.loader.submit('autocomplete_index', autocomplete.build, self.on_autocomplete_ready,
+                               action='autocomplete.build', priority=DataLoader.IDLE_PRIORITY)
+
+    def on_search_index_ready(self, info):
+        print(f"容错搜索索引就绪（来源: {info['source']}）：电影 {info['movies']} 部，"
+              f"人员 {info['people']} 位，耗时 {info['elapsed_ms']:.0f} ms")
+
+    def on_autocomplete_ready(self, counts):
+        print(f"自动补全索引就绪：电影 {counts[0]} 部，人员 {counts[1]} 位")
+
+    def on_sync_started(self, total):
+        """ 存在待同步数据时，弹出带进度环的常驻提示条 """
+        print(f"数据初始化：正在后台同步 {total} 条评分变动记录...")
+        self.syncInfoBar = InfoBar.new(
+            icon=InfoBarIcon.INFORMATION,
+            title='数据同步',
+            content='正在后台校准电影评分统计...',
+            orient=Qt.Horizontal,
+            isClosable=False,
+            position=InfoBarPosition.BOTTOM_RIGHT,
+            duration=-1,
+            parent=self
+        )
+        self.syncProgressRing = ProgressRing(self.syncInfoBar)
+        self.syncProgressRing.setFixedSize(24, 24)
+        self.syncProgressRing.setStrokeWidth(3)
+        self.syncProgressRing.setRange(0, total)
+        self.syncInfoBar.addWidget(self.syncProgressRing)
+
+    def on_sync_progress(self, done, total):
+        """ 刷新进度环 """
+        if self.syncProgressRing:
+            self.syncProgressRing.setValue(min(done, total))
+
+    def on_sync_finished(self, checked, changed):
+        """ 同步完成：关闭进度提示，使依赖评分数据的画廊缓存失效，并刷新排行榜 """
+        self._close_sync_info_bar()
+        if not checked:
+            return
+
+        print(f"数据初始化：已检查 {checked} 部影评有变动的电影，修正 {changed} 部的评分统计。")
+        # 电影库按最低评分 / 最低评分人数筛选时，分页结果与总数都依赖被修正的统计列
+        if changed:
+            count_cache.invalidate('movie_gallery')
+            page_cache.invalidate('movie_gallery')
+        # 排行榜尚未构建时无需刷新，首次打开时自然会读取最新数据
+        if changed and self.top100Interface.is_built:
+            self.top100Interface.widget.galleryInterface.load_top100_data()
+        if changed:
+            InfoBar.success(
+                title='数据同步完成',
+                content=f'已修正 {changed} 部电影的评分统计',
+                orient=Qt.Horizontal,
+                position=InfoBarPosition.BOTTOM_RIGHT,
+                duration=3000,
+                parent=self
+            )
 
-        except Exception as e:
-            print(f"同步失败：启动自检过程中发生错误: {e}")
-            session.rollback()
-        finally:
-            session.close()
+    def on_sync_failed(self, message):
+        """ 同步失败：关闭进度提示并给出错误反馈 """
+        self._close_sync_info_bar()
+        print(f"同步失败：启动自检过程中发生错误: {message}")
+        InfoBar.error(
+            title='数据同步失败',
+            content=message,
+            orient=Qt.Horizontal,
+            position=InfoBarPosition.BOTTOM_RIGHT,
+            duration=5000,
+            parent=self
+        )
 
+    def _close_sync_info_bar(self):
+        if self.syncInfoBar:
+            self.syncInfoBar.close()
+        self.syncInfoBar = None
+        self.syncProgressRing = None
+
+    def closeEvent(self, e):
+        """ 关闭窗口（包括退出登录）前，等待后台同步线程在当前批次结束后安全退出 """
+        if self.statsSyncWorker and self.statsSyncWorker.isRunning():
+            self.statsSyncWorker.requestInterruption()
+            self.statsSyncWorker.wait()
+        # 运行期间索引有过增量更新时在后台写回快照，下次启动可直接载入
+        fuzzy_search.save()
+        super().closeEvent(e)
 
 if __name__ == '__main__':
     # 启用 Fluent 设计规范建议的高分屏缩放策略
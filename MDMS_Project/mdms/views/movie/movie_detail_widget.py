@@ -1,4 +1,4 @@
-import os
+from collections import namedtuple
 
 from PySide6.QtCore import Qt, Signal, Slot
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFrame, QSizePolicy)
@@ -6,11 +6,66 @@ from qfluentwidgets import (ImageLabel, TitleLabel, StrongBodyLabel, BodyLabel,
                             PushButton, FluentIcon, ScrollArea, CardWidget,
                             IconWidget, PrimaryPushButton, MessageBoxBase,
                             Slider, TextEdit, InfoBar, InfoBarPosition, CaptionLabel)
+from sqlalchemy.orm import selectinload, joinedload, undefer
 
+from mdms.common.data_loader import DataLoader
 from mdms.common.review_manager import review_manager
+from mdms.common.thumbnail_cache import thumbnail_cache
 from mdms.common.user_manager import user_manager
-from mdms.database.models import Movie, Review
+from mdms.database.models import Movie, MoviePerson, Review
 from mdms.database.session import SessionLocal
+from mdms.database.instrumentation import instrumented_action
+
+
+# 影评卡片所需的纯数据
+ReviewItem = namedtuple('ReviewItem', ['username', 'rating', 'comment', 'time_str'])
+
+
+def fetch_movie_detail(session, movie_id):
+    """
+    后台线程：加载电影详情与影评列表
+    关联数据通过预加载一次取回，返回与会话无关的字典，未找到时返回 None
+    """
+    movie = session.query(Movie).options(
+        undefer(Movie.synopsis),
+        selectinload(Movie.genres),
+        selectinload(Movie.people_associations).joinedload(MoviePerson.person)
+    ).filter(Movie.movie_id == movie_id).first()
+    if not movie:
+        return None
+
+    # 演职人员提取：筛选导演与主演
+    directors = [mp.person.name for mp in movie.people_associations if mp.role == 'Director']
+    actors = [mp.person.name for mp in movie.people_associations if mp.role == 'Actor']
+
+    # 影评按时间倒序，同时预加载评论用户
+    reviews = session.query(Review).options(joinedload(Review.user)).filter(
+        Review.movie_id == movie_id
+    ).order_by(Review.created_at.desc()).all()
+
+    return {
+        'movie_id': movie.movie_id,
+        'title': movie.title,
+        'rating_count': movie.rating_count,
+        'average_rating': movie.average_rating,
+        'poster_url': movie.poster_url,
+        'year': str(movie.release_date.year) if movie.release_date else "-",
+        'country': movie.country or "-",
+        'runtime': f"{movie.runtime_minutes}分钟" if movie.runtime_minutes else "-",
+        'genres': [g.name for g in movie.genres],
+        'directors': directors,
+        'actors': actors,
+        'synopsis': movie.synopsis,
+        'reviews': [
+            ReviewItem(
+                username=rev.user.username if rev.user else "未知用户",
+                rating=rev.rating,
+                comment=rev.comment or "",
+                time_str=rev.created_at.strftime("%Y-%m-%d") if rev.created_at else ""
+            )
+            for rev in reviews
+        ],
+    }
 
 
 class AddReviewDialog(MessageBoxBase):
@@ -113,6 +168,8 @@ class MovieDetailWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_movie_id = None
+        # 后台数据加载器：快速切换电影时只保留最后一次打开的详情
+        self.loader = DataLoader(self)
 
         # 主容器布局：移除边距以实现顶部导航栏全宽显示
         self.mainLayout = QVBoxLayout(self)
@@ -227,78 +284,66 @@ class MovieDetailWidget(QWidget):
     def set_movie(self, movie_id: str):
         """
         数据库驱动的视图更新函数
-        根据 movie_id 加载电影完整信息并刷新 UI
+        根据 movie_id 在后台加载电影完整信息，加载完成后由 show_movie 刷新 UI
         """
         self.current_movie_id = movie_id
         self.scrollArea.verticalScrollBar().setValue(0)
+        self.titleLabel.setText("Loading...")
 
-        with SessionLocal() as session:
-            try:
-                movie = session.query(Movie).filter(Movie.movie_id == movie_id).first()
-                if not movie:
-                    self.titleLabel.setText("未找到电影")
-                    return
-
-                # 直接显示原始标题，配合 TitleLabel 的 WordWrap 属性实现安全换行
-                self.titleLabel.setText(movie.title)
-
-                # 评分展示：根据是否存在有效评分切换颜色状态
-                if movie.rating_count > 0:
-                    self.ratingLabel.setText(f"{movie.average_rating:.1f}")
-                    self.ratingLabel.setStyleSheet(
-                        "color: #009FAA; font-family: 'Segoe UI', sans-serif; font-weight: bold;")
-                else:
-                    self.ratingLabel.setText("暂无评分")
-                    self.ratingLabel.setStyleSheet(
-                        "color: #808080; font-family: 'Segoe UI', sans-serif; font-weight: bold;")
-
-                # 海报资源加载逻辑
-                if movie.poster_url and os.path.exists(movie.poster_url):
-                    self.posterLabel.setImage(movie.poster_url)
-                else:
-                    self.posterLabel.setImage(":/qfluentwidgets/images/logo.png")
-
-                # 元数据字符串拼接：年份、国家、类型及片长
-                year = str(movie.release_date.year) if movie.release_date else "-"
-                country = movie.country or "-"
-                runtime = f"{movie.runtime_minutes}分钟" if movie.runtime_minutes else "-"
-                genre_names = [g.name for g in movie.genres]
-                genres_str = "/".join(genre_names) if genre_names else "无类型"
-
-                self.metaLabel.setText(f"{year}  •  {country}  •  {genres_str}  •  {runtime}")
-
-                # 演职人员提取：筛选导演与前 5 位主演
-                directors = [mp.person.name for mp in movie.people_associations if mp.role == 'Director']
-                actors = [mp.person.name for mp in movie.people_associations if mp.role == 'Actor']
-
-                people_text = ""
-                if directors:
-                    people_text += f"导演: {', '.join(directors)}\n"
-                if actors:
-                    display_actors = ', '.join(actors[:5]) + ('...' if len(actors) > 5 else '')
-                    people_text += f"主演: {display_actors}"
-
-                self.peopleLabel.setText(people_text)
-                self.synopsisLabel.setText(movie.synopsis or "暂无剧情简介。")
-
-                # 异步或级联加载评论区内容
-                self.load_reviews(session, movie_id)
-
-            except Exception as e:
-                print(f"数据加载异常: {e}")
-                self.titleLabel.setText("数据加载错误")
-
-    def load_reviews(self, session, movie_id):
-        """ 清空并重新根据时间倒序加载电影的所有评论 """
+        self.loader.submit('detail', fetch_movie_detail, self.show_movie, movie_id,
+                           on_error=lambda e: self.titleLabel.setText("数据加载错误"),
+                           action='movie_detail.open')
+
+    def show_movie(self, movie):
+        """ 使用后台加载的详情数据刷新界面 """
+        if not movie:
+            self.titleLabel.setText("未找到电影")
+            return
+
+        # 直接显示原始标题，配合 TitleLabel 的 WordWrap 属性实现安全换行
+        self.titleLabel.setText(movie['title'])
+
+        # 评分展示：根据是否存在有效评分切换颜色状态
+        if movie['rating_count'] > 0:
+            self.ratingLabel.setText(f"{movie['average_rating']:.1f}")
+            self.ratingLabel.setStyleSheet(
+                "color: #009FAA; font-family: 'Segoe UI', sans-serif; font-weight: bold;")
+        else:
+            self.ratingLabel.setText("暂无评分")
+            self.ratingLabel.setStyleSheet(
+                "color: #808080; font-family: 'Segoe UI', sans-serif; font-weight: bold;")
+
+        # 海报资源加载逻辑：使用详情档位缩略图，路径无效时回退至 Logo
+        # setImage 会按图片尺寸重设控件大小，需恢复固定尺寸以防止布局跳动
+        self.posterLabel.setImage(thumbnail_cache.get_for(self, movie['poster_url'], 'detail'))
+        self.posterLabel.setFixedSize(220, 330)
+
+        # 元数据字符串拼接：年份、国家、类型及片长
+        genres_str = "/".join(movie['genres']) if movie['genres'] else "无类型"
+        self.metaLabel.setText(f"{movie['year']}  •  {movie['country']}  •  {genres_str}  •  {movie['runtime']}")
+
+        # 演职人员：导演与前 5 位主演
+        directors, actors = movie['directors'], movie['actors']
+        people_text = ""
+        if directors:
+            people_text += f"导演: {', '.join(directors)}\n"
+        if actors:
+            display_actors = ', '.join(actors[:5]) + ('...' if len(actors) > 5 else '')
+            people_text += f"主演: {display_actors}"
+
+        self.peopleLabel.setText(people_text)
+        self.synopsisLabel.setText(movie['synopsis'] or "暂无剧情简介。")
+
+        # 刷新评论区内容
+        self.update_reviews(movie['reviews'])
+
+    def update_reviews(self, reviews):
+        """ 清空并按时间倒序重新渲染电影的所有评论 """
         while self.reviewsListLayout.count():
             item = self.reviewsListLayout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
 
-        reviews = session.query(Review).filter(
-            Review.movie_id == movie_id
-        ).order_by(Review.created_at.desc()).all()
-
         self.reviewsTitle.setText(f"用户影评 ({len(reviews)})")
 
         if not reviews:
@@ -308,19 +353,17 @@ class MovieDetailWidget(QWidget):
             return
 
         for rev in reviews:
-            username = rev.user.username if rev.user else "未知用户"
-            time_str = rev.created_at.strftime("%Y-%m-%d") if rev.created_at else ""
-
             card = ReviewCard(
-                username=username,
+                username=rev.username,
                 rating=rev.rating,
-                content=rev.comment or "",
-                time_str=time_str,
+                content=rev.comment,
+                time_str=rev.time_str,
                 parent=self
             )
             self.reviewsListLayout.addWidget(card)
 
     @Slot()
+    @instrumented_action('review.submit')
     def on_add_review_clicked(self):
         """ 提交评论的槽函数：自动检测是新增还是修改 """
         if not user_manager.is_logged_in:
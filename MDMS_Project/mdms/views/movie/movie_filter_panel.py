@@ -0,0 +1,162 @@
+# mdms/views/movie/movie_filter_panel.py
+from datetime import date
+from decimal import Decimal
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout
+from qfluentwidgets import (BodyLabel, CaptionLabel, ComboBox, PillPushButton, FlowLayout,
+                            CompactSpinBox, CompactDoubleSpinBox, PushButton, PrimaryPushButton)
+
+from mdms.common.movie_filter import MovieFilter
+
+
+class MovieFilterPanel(QWidget):
+    """
+    电影库的多维筛选面板
+    在画廊头部下方展开，可按类型（多选，任一 / 全部满足）、上映年份区间、国家 / 地区、语言、片长区间、
+    最低评分与最低评分人数筛选。点击“应用”后发出 filterChanged，“重置”清空全部条件。
+    数值输入框取最小值时显示“不限”，表示该维度不参与筛选。
+    """
+
+    # 信号：应用筛选条件，参数为 MovieFilter
+    filterChanged = Signal(object)
+
+    ANY_COUNTRY = "全部国家/地区"
+    ANY_LANGUAGE = "全部语言"
+    MATCH_MODES = ["任一类型", "全部类型"]
+    # 年份输入范围：最小值之前的一年表示“不限”
+    YEAR_RANGE = (1888, date.today().year + 5)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.genreButtons = []
+
+        self.vBoxLayout = QVBoxLayout(self)
+        self.vBoxLayout.setContentsMargins(0, 0, 0, 10)
+        self.vBoxLayout.setSpacing(8)
+
+        # 第一行：类型标签（多选）与匹配方式
+        self.genreLayout = QHBoxLayout()
+        self.genreLayout.addWidget(BodyLabel("类型", self), 0, Qt.AlignTop)
+        self.genreWidget = QWidget(self)
+        self.genreFlowLayout = FlowLayout(self.genreWidget)
+        self.genreFlowLayout.setContentsMargins(0, 0, 0, 0)
+        self.genreFlowLayout.setHorizontalSpacing(6)
+        self.genreFlowLayout.setVerticalSpacing(6)
+        self.genreLayout.addWidget(self.genreWidget, 1)
+        self.matchModeComboBox = ComboBox(self)
+        self.matchModeComboBox.addItems(self.MATCH_MODES)
+        self.matchModeComboBox.setFixedWidth(110)
+        self.genreLayout.addWidget(self.matchModeComboBox, 0, Qt.AlignTop)
+        self.vBoxLayout.addLayout(self.genreLayout)
+
+        # 第二行：年份区间、片长区间、国家 / 地区、语言
+        self.rangeLayout = QHBoxLayout()
+        self.rangeLayout.setSpacing(8)
+        self.yearFromSpinBox = self._spin_box(*self.YEAR_RANGE)
+        self.yearToSpinBox = self._spin_box(*self.YEAR_RANGE)
+        self.runtimeMinSpinBox = self._spin_box(1, 600, " 分钟")
+        self.runtimeMaxSpinBox = self._spin_box(1, 600, " 分钟")
+        self.countryComboBox = ComboBox(self)
+        self.countryComboBox.addItem(self.ANY_COUNTRY)
+        self.countryComboBox.setFixedWidth(140)
+        self.languageComboBox = ComboBox(self)
+        self.languageComboBox.addItem(self.ANY_LANGUAGE)
+        self.languageComboBox.setFixedWidth(120)
+        self._add_range(self.rangeLayout, "年份", self.yearFromSpinBox, self.yearToSpinBox)
+        self.rangeLayout.addSpacing(12)
+        self._add_range(self.rangeLayout, "片长", self.runtimeMinSpinBox, self.runtimeMaxSpinBox)
+        self.rangeLayout.addSpacing(12)
+        self.rangeLayout.addWidget(self.countryComboBox)
+        self.rangeLayout.addWidget(self.languageComboBox)
+        self.rangeLayout.addStretch(1)
+        self.vBoxLayout.addLayout(self.rangeLayout)
+
+        # 第三行：评分门槛与操作按钮
+        self.ratingLayout = QHBoxLayout()
+        self.ratingLayout.setSpacing(8)
+        self.minRatingSpinBox = CompactDoubleSpinBox(self)
+        self.minRatingSpinBox.setRange(0, 10)
+        self.minRatingSpinBox.setDecimals(1)
+        self.minRatingSpinBox.setSingleStep(0.5)
+        self.minRatingSpinBox.setSpecialValueText("不限")
+        self.minRatingCountSpinBox = self._spin_box(0, 10_000_000, " 人")
+        self.ratingLayout.addWidget(BodyLabel("最低评分", self))
+        self.ratingLayout.addWidget(self.minRatingSpinBox)
+        self.ratingLayout.addSpacing(12)
+        self.ratingLayout.addWidget(BodyLabel("最低评分人数", self))
+        self.ratingLayout.addWidget(self.minRatingCountSpinBox)
+        self.ratingLayout.addStretch(1)
+        self.resetButton = PushButton("重置", self)
+        self.resetButton.clicked.connect(self.reset)
+        self.applyButton = PrimaryPushButton("应用", self)
+        self.applyButton.clicked.connect(self.apply)
+        self.ratingLayout.addWidget(self.resetButton)
+        self.ratingLayout.addWidget(self.applyButton)
+        self.vBoxLayout.addLayout(self.ratingLayout)
+
+    def set_options(self, genres, countries, languages):
+        """ 填充候选项（由后台查询的结果调用） """
+        for genre in genres:
+            button = PillPushButton(genre, self.genreWidget)
+            self.genreFlowLayout.addWidget(button)
+            self.genreButtons.append(button)
+        self.countryComboBox.addItems(countries)
+        self.languageComboBox.addItems(languages)
+
+    def current_filter(self) -> MovieFilter:
+        """ 由各控件的当前状态构造筛选条件 """
+        min_rating = self._value(self.minRatingSpinBox)
+        return MovieFilter(
+            genres=tuple(sorted(button.text() for button in self.genreButtons if button.isChecked())),
+            match_all_genres=self.matchModeComboBox.currentIndex() == 1,
+            year_from=self._value(self.yearFromSpinBox),
+            year_to=self._value(self.yearToSpinBox),
+            country=self._choice(self.countryComboBox),
+            language=self._choice(self.languageComboBox),
+            runtime_min=self._value(self.runtimeMinSpinBox),
+            runtime_max=self._value(self.runtimeMaxSpinBox),
+            # Decimal 与 Numeric 列比较时不引入浮点误差，也便于作为缓存键
+            min_rating=Decimal(str(min_rating)) if min_rating is not None else None,
+            min_rating_count=self._value(self.minRatingCountSpinBox),
+        )
+
+    def apply(self):
+        """ 应用当前条件 """
+        self.filterChanged.emit(self.current_filter())
+
+    def reset(self):
+        """ 清空全部条件并应用 """
+        for button in self.genreButtons:
+            button.setChecked(False)
+        self.matchModeComboBox.setCurrentIndex(0)
+        for spin_box in (self.yearFromSpinBox, self.yearToSpinBox, self.runtimeMinSpinBox,
+                         self.runtimeMaxSpinBox, self.minRatingSpinBox, self.minRatingCountSpinBox):
+            spin_box.setValue(spin_box.minimum())
+        self.countryComboBox.setCurrentIndex(0)
+        self.languageComboBox.setCurrentIndex(0)
+        self.apply()
+
+    def _spin_box(self, minimum, maximum, suffix=""):
+        """ 整数输入框：最小值之前再留一个“不限” """
+        spin_box = CompactSpinBox(self)
+        spin_box.setRange(minimum - 1, maximum)
+        spin_box.setSuffix(suffix)
+        spin_box.setSpecialValueText("不限")
+        spin_box.setValue(spin_box.minimum())
+        return spin_box
+
+    def _add_range(self, layout, text, low, high):
+        layout.addWidget(BodyLabel(text, self))
+        layout.addWidget(low)
+        layout.addWidget(CaptionLabel("至", self))
+        layout.addWidget(high)
+
+    @staticmethod
+    def _value(spin_box):
+        value = spin_box.value()
+        return None if value == spin_box.minimum() else value
+
+    @staticmethod
+    def _choice(combo_box):
+        return combo_box.currentText() if combo_box.currentIndex() > 0 else None
@@ -1,16 +1,58 @@
 import sys
-import traceback
+from collections import namedtuple, OrderedDict
+from functools import partial
 
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QSize, QRect, QAbstractListModel, QModelIndex
+from PySide6.QtGui import QPainter, QPainterPath, QColor
 from PySide6.QtWidgets import (QFrame, QVBoxLayout, QApplication, QWidget,
-                               QHBoxLayout)
+                               QHBoxLayout, QListView, QStyledItemDelegate, QStyle,
+                               QStackedWidget)
 from qfluentwidgets import (ElevatedCardWidget, ImageLabel, CaptionLabel,
                             SubtitleLabel, setFont, FlowLayout, ScrollArea, SmoothMode,
-                            SearchLineEdit, ComboBox)
+                            SearchLineEdit, ComboBox, TransparentToggleToolButton,
+                            FluentIcon, isDarkTheme)
+from sqlalchemy import or_
+from sqlalchemy.orm import Query
 
 from mdms.database.session import SessionLocal
 from mdms.database.models import Movie, Genre
 from mdms.common.fluent_paginator import FluentPaginator
+from mdms.common.keyset_pager import KeysetPager
+from mdms.common.count_cache import count_cache
+from mdms.common.page_cache import page_cache
+from mdms.common.data_loader import DataLoader
+from mdms.common.image_loader import image_loader
+from mdms.common.card_pool import CardPool
+from mdms.common.search_debouncer import SearchDebouncer
+from mdms.common.fulltext_search import fulltext_search, RankedPager
+from mdms.common.pinyin_search import pinyin_search
+from mdms.common.trigram_index import fuzzy_search
+from mdms.common.prefix_index import autocomplete, PrefixCompleter
+from mdms.common.suggestion_bar import SuggestionBar
+from mdms.common.movie_filter import MovieFilter, MovieQueryBuilder, fetch_facet_options
+from mdms.views.movie.movie_filter_panel import MovieFilterPanel
+
+
+# 画廊卡片所需的纯数据，不依赖数据库会话
+MovieCardData = namedtuple('MovieCardData', ['movie_id', 'title', 'poster_url'])
+# 列表查询只投影卡片需要的列：不读取 synopsis 等大字段，也不构造 ORM 对象
+MOVIE_CARD_COLUMNS = (Movie.movie_id, Movie.title, Movie.poster_url)
+
+
+def fetch_movie_page(session, query, pager, page, limit, total_items):
+    """
+    后台线程：执行一页电影查询
+    :param query: 未绑定会话的过滤查询，在此绑定到工作线程自己的会话
+    :return: (卡片数据列表, 是否存在下一页)
+    """
+    query = query.with_session(session)
+    if total_items is not None:
+        movies = pager.fetch_page(query, page, limit, total_items)
+        has_next = page * limit < total_items
+    else:
+        # 总数未知：多取一行判断是否存在下一页
+        movies, has_next = pager.probe_page(query, page, limit)
+    return [MovieCardData._make(row) for row in movies], has_next
 
 
 class MovieCard(ElevatedCardWidget):
@@ -18,35 +60,28 @@ class MovieCard(ElevatedCardWidget):
     电影卡片展示组件
     继承自 ElevatedCardWidget 以获得悬浮阴影效果
     用于展示单部电影的海报、名称，并处理点击事件
+    卡片可通过 bind() 重新绑定到其他电影，供画廊翻页时复用
     """
     # 当卡片被点击时发送此信号，携带 movie_id 供详情页跳转使用
     movieClicked = Signal(str)
 
-    def __init__(self, movie_id: str, iconPath: str, name: str, parent=None):
-        super().__init__(parent)
-        self.movie_id = movie_id
-        self.movieName = name
+    # 海报解码尺寸（逻辑像素），相邻页预取时按同一尺寸解码
+    POSTER_BOX = QSize(160, 120)
 
-        # 如果数据库中海报路径为空，则使用 QFluentWidgets 默认 Logo 作为占位图
-        if not iconPath:
-            iconPath = ":/qfluentwidgets/images/logo.png"
+    def __init__(self, movie_id: str = None, iconPath: str = None, name: str = "", parent=None):
+        super().__init__(parent)
+        self.movie_id = None
+        self.movieName = ""
 
-        # 初始化海报图片标签，设置固定高度并开启圆角剪裁
-        self.iconWidget = ImageLabel(iconPath, self)
+        # 初始化海报图片标签：设置固定高度并开启圆角剪裁
+        self.iconWidget = ImageLabel(image_loader.placeholder(QSize(80, 120)), self)
         self.iconWidget.scaledToHeight(120)
         self.iconWidget.setBorderRadius(8, 8, 8, 8)
 
         # 初始化电影名称标签
-        self.label = CaptionLabel(name, self)
+        self.label = CaptionLabel(self)
         self.label.setAlignment(Qt.AlignCenter)
 
-        # 文本省略处理：如果电影标题过长，自动在 140px 处截断并添加省略号，防止破坏网格布局
-        font_metrics = self.label.fontMetrics()
-        elided_text = font_metrics.elidedText(name, Qt.ElideRight, 140)
-        self.label.setText(elided_text)
-        # 鼠标悬停时显示完整电影名称
-        self.label.setToolTip(name)
-
         # 垂直布局：海报在上，文字在下
         self.vBoxLayout = QVBoxLayout(self)
         self.vBoxLayout.setAlignment(Qt.AlignCenter)
@@ -59,6 +94,34 @@ class MovieCard(ElevatedCardWidget):
         self.setFixedSize(160, 200)
         self.setCursor(Qt.PointingHandCursor)
 
+        if movie_id is not None:
+            self.bind(movie_id, name, iconPath)
+
+    def bind(self, movie_id: str, title: str, poster_url: str):
+        """
+        将卡片绑定到一部电影：更新标题并重新异步加载海报
+        """
+        self.movie_id = movie_id
+        self.movieName = title
+
+        # 文本省略处理：如果电影标题过长，自动在 140px 处截断并添加省略号，防止破坏网格布局
+        font_metrics = self.label.fontMetrics()
+        elided_text = font_metrics.elidedText(title, Qt.ElideRight, 140)
+        self.label.setText(elided_text)
+        # 鼠标悬停时显示完整电影名称
+        self.label.setToolTip(title)
+
+        # 先恢复 2:3 的占位图，海报在后台线程中按卡片尺寸解码，完成后替换占位图
+        # 海报路径为空或文件缺失时显示 QFluentWidgets 默认 Logo
+        self.iconWidget.setImage(image_loader.placeholder(QSize(80, 120)))
+        self.iconWidget.scaledToHeight(120)
+        image_loader.load(self.iconWidget, poster_url, self.POSTER_BOX, self.on_image_loaded)
+
+    def on_image_loaded(self, image):
+        """ 后台解码完成：替换占位图并保持固定高度 """
+        self.iconWidget.setImage(image)
+        self.iconWidget.scaledToHeight(120)
+
     def mouseReleaseEvent(self, e):
         """
         重写鼠标释放事件，实现点击卡片发送电影 ID 信号
@@ -67,14 +130,249 @@ class MovieCard(ElevatedCardWidget):
         self.movieClicked.emit(self.movie_id)
 
 
+class MovieListModel(QAbstractListModel):
+    """
+    滚动浏览模式的数据模型
+    使用画廊提供的分页器分块加载电影（canFetchMore / fetchMore），滚动到底部时才查询下一块；
+    模型只保存轻量的 MovieCardData，海报在条目被绘制时才异步解码，并以有限容量的 LRU 缓存保存，
+    因此内存占用只与可见条目数量相关，而不是与已浏览的总行数相关。
+    """
+    # 信号：第一块数据加载完成，参数为 (过滤条件组合, 行数)
+    firstChunkLoaded = Signal(object, int)
+
+    # 自定义数据角色：电影 ID
+    MovieIdRole = Qt.UserRole + 1
+
+    # 每次追加的行数
+    CHUNK_SIZE = 60
+    # 已解码海报的缓存数量上限
+    IMAGE_CACHE_SIZE = 200
+    # 海报显示区域（逻辑像素）
+    POSTER_SIZE = QSize(140, 120)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.loader = DataLoader(self)
+        # 当前查询对应的过滤条件组合
+        self.key = None
+        self._query = None
+        self._pager = None
+        self._rows = []
+        self._row_of = {}
+        self._chunks = 0
+        self._has_more = False
+        self._loading = False
+        # movie_id -> 已解码海报，按最近使用排序
+        self._images = OrderedDict()
+        # 正在解码的 movie_id
+        self._pending = set()
+
+    def set_query(self, query, key, pager):
+        """ 更换过滤条件：清空已加载的行，使用新的分页器从第一块重新加载 """
+        self.loader.cancel('chunk')
+        self.release_images()
+
+        self.beginResetModel()
+        self.key = key
+        self._query = query
+        self._pager = pager
+        self._rows = []
+        self._row_of = {}
+        self._chunks = 0
+        self._has_more = query is not None
+        self._loading = False
+        self.endResetModel()
+
+        self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        movie = self._rows[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return movie.title
+        if role == self.MovieIdRole:
+            return movie.movie_id
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent) or SessionLocal is None:
+            return
+        self._loading = True
+        self.loader.submit(
+            'chunk', fetch_movie_page, self.on_chunk_loaded,
+            self._query, self._pager, self._chunks + 1, self.CHUNK_SIZE, None,
+            on_error=self.on_chunk_failed, action='movie_list.fetch_more'
+        )
+
+    def on_chunk_loaded(self, result):
+        """ 后台查询完成：把新的一块追加到模型末尾 """
+        movies, has_next = result
+        self._loading = False
+        self._chunks += 1
+        self._has_more = has_next
+        if movies:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(movies) - 1)
+            for offset, movie in enumerate(movies):
+                self._row_of[movie.movie_id] = first + offset
+            self._rows.extend(movies)
+            self.endInsertRows()
+        if self._chunks == 1:
+            self.firstChunkLoaded.emit(self.key, len(self._rows))
+
+    def on_chunk_failed(self, error):
+        # 查询失败时停止继续加载，避免视图反复触发 fetchMore
+        self._loading = False
+        self._has_more = False
+
+    def poster(self, index, scale=1):
+        """
+        获取条目的海报：已缓存则直接返回，否则发起异步解码并返回 None（由委托绘制占位）
+        """
+        movie = self._rows[index.row()]
+        image = self._images.get(movie.movie_id)
+        if image is not None:
+            self._images.move_to_end(movie.movie_id)
+            return image
+        if movie.movie_id not in self._pending:
+            self._pending.add(movie.movie_id)
+            image_loader.request(
+                self._image_key(movie.movie_id), movie.poster_url, self.POSTER_SIZE,
+                partial(self.on_image_loaded, movie.movie_id), scale
+            )
+        # 图片加载器内存命中时回调已同步执行
+        return self._images.get(movie.movie_id)
+
+    def on_image_loaded(self, movie_id, image):
+        """ 海报解码完成：写入 LRU 缓存并通知视图重绘该条目 """
+        self._pending.discard(movie_id)
+        image_loader.release(self._image_key(movie_id))
+        self._images[movie_id] = image
+        while len(self._images) > self.IMAGE_CACHE_SIZE:
+            self._images.popitem(last=False)
+
+        row = self._row_of.get(movie_id)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def release_images(self):
+        """ 取消未完成的海报解码并清空缓存 """
+        for movie_id in self._pending:
+            image_loader.release(self._image_key(movie_id))
+        self._pending.clear()
+        self._images.clear()
+
+    def _image_key(self, movie_id):
+        # 图片加载器中的请求键：区分不同模型实例中的同一部电影
+        return ('movie_list', id(self), movie_id)
+
+
+class MovieCardDelegate(QStyledItemDelegate):
+    """
+    滚动浏览模式的条目委托：直接绘制海报与标题，外观与 MovieCard 保持一致，不为条目创建控件
+    """
+    CARD_SIZE = QSize(160, 200)
+
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        # 卡片背景
+        if isDarkTheme():
+            background = QColor(255, 255, 255, 21 if hovered else 13)
+            text_color = QColor(255, 255, 255)
+        else:
+            background = QColor(255, 255, 255, 255 if hovered else 170)
+            text_color = QColor(0, 0, 0)
+        painter.setPen(QColor(0, 0, 0, 19))
+        painter.setBrush(background)
+        painter.drawRoundedRect(rect, 8, 8)
+
+        # 海报：按高度 120 等比缩放并水平居中，未解码完成时绘制占位色块
+        poster_rect = QRect(rect.x() + 10, rect.y() + 10, rect.width() - 20, 120)
+        image = index.model().poster(index, option.widget.devicePixelRatioF() if option.widget else 1)
+        if image is not None and not image.isNull():
+            size = image.size().scaled(poster_rect.size(), Qt.KeepAspectRatio)
+            target = QRect(0, 0, size.width(), size.height())
+            target.moveCenter(poster_rect.center())
+            path = QPainterPath()
+            path.addRoundedRect(target, 8, 8)
+            painter.setClipPath(path)
+            painter.drawImage(target, image)
+            painter.setClipping(False)
+        else:
+            target = QRect(0, 0, 80, 120)
+            target.moveCenter(poster_rect.center())
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(image_loader.PLACEHOLDER_COLOR)
+            painter.drawRoundedRect(target, 8, 8)
+
+        # 标题：与 MovieCard 相同，在 140px 处截断并添加省略号
+        painter.setFont(option.font)
+        painter.setPen(text_color)
+        title = option.fontMetrics.elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, 140)
+        title_rect = QRect(rect.x() + 10, rect.y() + 138, rect.width() - 20, rect.height() - 148)
+        painter.drawText(title_rect, Qt.AlignHCenter | Qt.AlignVCenter, title)
+
+        painter.restore()
+
+
+class MovieListView(QListView):
+    """
+    滚动浏览模式的视图：IconMode 自动换行排列，只绘制可见条目
+    """
+    # 点击条目时发送电影 ID
+    movieClicked = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        # 所有条目尺寸一致，布局时无需逐项计算
+        self.setUniformItemSizes(True)
+        self.setSpacing(10)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setMouseTracking(True)
+        self.setCursor(Qt.PointingHandCursor)
+        self.setStyleSheet("QListView { background: transparent; }")
+        self.verticalScrollBar().setSingleStep(20)
+
+        self.setItemDelegate(MovieCardDelegate(self))
+        self.clicked.connect(self.on_item_clicked)
+
+    def on_item_clicked(self, index):
+        self.movieClicked.emit(index.data(MovieListModel.MovieIdRole))
+
+
 class MovieGalleryWidget(QFrame):
     """
     电影库画廊主界面
-    集成搜索、类型筛选、自动换行布局以及分页查询功能
+    集成搜索、类型筛选、多维筛选、自动换行布局以及分页查询功能
     """
     # 请求主窗口打开详情页的信号
     requestOpenDetail = Signal(str)
 
+    # 画廊排序方式：按 (title, movie_id) 键集排序（全文检索时按相关度）
+    SORT_ORDER = 'title'
+
     def __init__(self, text: str, parent=None):
         super().__init__(parent=parent)
         # 设置对象名称以便于样式表识别，将空格替换为连字符
@@ -83,11 +381,21 @@ class MovieGalleryWidget(QFrame):
         # 维护当前筛选状态：搜索关键词和电影类型
         self.current_search_text = ""
         self.current_genre_text = "全部分类"
+        # 筛选面板中的多维筛选条件
+        self.current_filter = MovieFilter()
         self.cards = []
+        # 分页模式当前展示的过滤条件组合（用于切换浏览模式时判断是否需要重新加载）
+        self.paged_key = None
+        # 分页器：浏览时按 (title, movie_id) 键集分页，全文检索时按相关度分页，见 create_pager
+        self.pager = self.create_pager()
+        # 后台计数完成后，若仍是当前过滤条件，则把分页器切换为精确页码
+        count_cache.countReady.connect(self.on_count_ready)
+        # 后台数据加载器：查询在线程池中执行，快速连续翻页时只保留最新一次请求的结果
+        self.loader = DataLoader(self)
 
         # 构造 UI 界面组件
         self.init_ui(text)
-        # 从数据库加载 Genre 表填充下拉框
+        # 从数据库加载类型、国家、语言候选，填充类型下拉框与筛选面板
         self.load_filter_options()
         # 执行初始数据加载，展示第一页
         self.load_data(page=1)
@@ -115,18 +423,44 @@ class MovieGalleryWidget(QFrame):
         self.headerLayout.addWidget(self.genreComboBox)
         self.headerLayout.addSpacing(10)
 
-        # 搜索输入框：支持点击搜索图标、按回车键触发搜索
+        # 搜索输入框：边输入边搜索（防抖），回车或点击搜索图标立即搜索
         self.searchEdit = SearchLineEdit(self)
         self.searchEdit.setPlaceholderText("搜索电影名称...")
         self.searchEdit.setFixedWidth(240)
-        self.searchEdit.searchSignal.connect(self.on_search_triggered)
-        self.searchEdit.returnPressed.connect(self.on_search_triggered)
-        self.searchEdit.textChanged.connect(self.on_search_text_changed)
+        self.searchDebouncer = SearchDebouncer(self.searchEdit, self)
+        self.searchDebouncer.searchRequested.connect(self.on_search_requested)
+        # 输入时按标题 / 拼音前缀补全热门电影，选中候选后立即搜索
+        self.searchCompleter = PrefixCompleter(self.searchEdit, autocomplete.complete_movies, self)
+        self.searchCompleter.activated.connect(lambda text: self.searchDebouncer.flush())
         self.headerLayout.addWidget(self.searchEdit)
+        self.headerLayout.addSpacing(10)
+
+        # 多维筛选：展开 / 收起筛选面板
+        self.filterButton = TransparentToggleToolButton(FluentIcon.FILTER, self)
+        self.filterButton.setToolTip("筛选")
+        self.filterButton.toggled.connect(self.on_filter_toggled)
+        self.headerLayout.addWidget(self.filterButton)
+
+        # 浏览模式切换：选中时使用虚拟化的滚动浏览（不分页），否则为分页卡片墙
+        self.viewModeButton = TransparentToggleToolButton(FluentIcon.SCROLL, self)
+        self.viewModeButton.setToolTip("滚动浏览")
+        self.viewModeButton.toggled.connect(self.on_view_mode_toggled)
+        self.headerLayout.addWidget(self.viewModeButton)
 
         self.mainLayout.addLayout(self.headerLayout)
         self.mainLayout.addSpacing(10)
 
+        # 多维筛选面板：默认收起
+        self.filterPanel = MovieFilterPanel(self)
+        self.filterPanel.filterChanged.connect(self.on_filter_changed)
+        self.filterPanel.setVisible(False)
+        self.mainLayout.addWidget(self.filterPanel)
+
+        # 搜索无结果时的“您是不是要找”建议
+        self.suggestionBar = SuggestionBar(self)
+        self.suggestionBar.suggestionClicked.connect(self.on_suggestion_clicked)
+        self.mainLayout.addWidget(self.suggestionBar)
+
         # 中间滚动区域：承载 FlowLayout 实现卡片自动换行排版
         self.scrollArea = ScrollArea(self)
         self.scrollArea.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
@@ -139,13 +473,35 @@ class MovieGalleryWidget(QFrame):
         self.scrollWidget = QWidget()
         self.scrollWidget.setStyleSheet("background: transparent;")
         # 使用 FlowLayout 实现流式布局，卡片会自动根据窗口宽度换行
-        self.flowLayout = FlowLayout(self.scrollWidget)
+        # isTight=True：布局跳过卡片池中隐藏的备用卡片
+        self.flowLayout = FlowLayout(self.scrollWidget, isTight=True)
         self.flowLayout.setContentsMargins(0, 0, 0, 0)
         self.flowLayout.setVerticalSpacing(20)
         self.flowLayout.setHorizontalSpacing(20)
 
+        # 空数据提示：常驻布局首位，按需显示
+        self.emptyLabel = CaptionLabel("未找到符合条件的电影", self.scrollWidget)
+        self.emptyLabel.setAlignment(Qt.AlignCenter)
+        self.emptyLabel.setVisible(False)
+        self.flowLayout.addWidget(self.emptyLabel)
+
+        # 卡片复用池：翻页时重新绑定已有卡片，而不是销毁重建
+        self.cardPool = CardPool(self.scrollWidget, self.flowLayout, self.create_card)
+
         self.scrollArea.setWidget(self.scrollWidget)
-        self.mainLayout.addWidget(self.scrollArea)
+
+        # 滚动浏览模式：模型分块加载，委托绘制卡片，只有可见条目占用海报内存
+        self.listModel = MovieListModel(self)
+        self.listView = MovieListView(self)
+        self.listView.setModel(self.listModel)
+        self.listView.movieClicked.connect(self.on_card_clicked)
+        self.listModel.firstChunkLoaded.connect(self.on_first_chunk_loaded)
+
+        # 两种浏览模式共用同一块区域
+        self.viewStack = QStackedWidget(self)
+        self.viewStack.addWidget(self.scrollArea)
+        self.viewStack.addWidget(self.listView)
+        self.mainLayout.addWidget(self.viewStack)
 
         # 底部区域：集成自定义分页器，绑定 pageChanged 信号实现分页逻辑
         self.paginator = FluentPaginator(self)
@@ -155,120 +511,316 @@ class MovieGalleryWidget(QFrame):
 
     def load_filter_options(self):
         """
-        数据库交互：初始化时获取所有分类名称填充至 ComboBox
+        数据库交互：初始化时在后台获取分类名称与国家、语言候选，填充类型下拉框与筛选面板
         """
         if SessionLocal is None:
             return
-        session = SessionLocal()
-        try:
-            # 获取所有类型名称并按字母升序排列
-            genres = session.query(Genre).order_by(Genre.name).all()
-            genre_names = [g.name for g in genres]
-            self.genreComboBox.addItems(genre_names)
-        except Exception as e:
-            print(f"加载类型数据失败: {e}")
-        finally:
-            session.close()
+        self.loader.submit('filters', fetch_facet_options, self.on_filter_options_loaded,
+                           action='movie_gallery.load_filters')
+
+    def on_filter_options_loaded(self, options):
+        genres, countries, languages = options
+        self.genreComboBox.addItems(genres)
+        self.filterPanel.set_options(genres, countries, languages)
+
+    def build_query(self):
+        """
+        根据当前类型、筛选面板条件和搜索关键词构建过滤查询
+        查询不绑定会话：既可以交给后台线程绑定执行，也可以直接取 statement 交给总数缓存
+        """
+        query = Query(MOVIE_CARD_COLUMNS)
+
+        # 多条件复合过滤：类型筛选
+        if self.current_genre_text and self.current_genre_text != "全部分类":
+            # 通过多对多关联关系连接 Movie 和 Genre 表
+            query = query.join(Movie.genres).filter(Genre.name == self.current_genre_text)
+
+        # 多条件复合过滤：筛选面板中的年份、国家、语言、片长、评分与多类型条件
+        query = MovieQueryBuilder(query).apply(self.current_filter).build()
+
+        # 多条件复合过滤：关键词足够长时走全文索引检索标题与简介，否则模糊搜索标题
+        search = self.current_search_text
+        if search:
+            if pinyin_search.is_pinyin_query(search):
+                # 拼音 / 首字母前缀匹配（各走索引范围扫描），关键词足够长时同时保留全文匹配；
+                # 短关键词不再 OR 上 '%…%'，否则优化器只能逐行检查整个标题索引
+                pinyin_match = pinyin_search.prefix_match(Movie.title_pinyin, Movie.title_initials, search)
+                if fulltext_search.usable(search):
+                    pinyin_match = or_(pinyin_match, fulltext_search.contains(search))
+                query = query.filter(pinyin_match)
+            elif fulltext_search.usable(search):
+                query = fulltext_search.apply(query, search)
+            else:
+                query = query.filter(Movie.title.ilike(f"%{search}%"))
+
+        return query
+
+    def is_ranked_search(self, text):
+        """ 该关键词的结果是否按相关度排序（全文检索；拼音检索与模糊搜索按标题排序） """
+        return fulltext_search.usable(text) and not pinyin_search.is_pinyin_query(text)
+
+    def create_pager(self):
+        """
+        按当前搜索方式创建分页器
+        全文检索结果按相关度排序（OFFSET 分页），否则按 (title, movie_id) 键集分页，深页翻页无需 OFFSET 扫描
+        """
+        if self.current_search_text and self.is_ranked_search(self.current_search_text):
+            return RankedPager(fulltext_search.rank_order(self.current_search_text) + [Movie.movie_id])
+        return KeysetPager([Movie.title, Movie.movie_id])
 
     def load_data(self, page: int):
         """
         核心业务逻辑：根据分页、类型和搜索关键词从数据库查询电影
+        查询提交到后台线程执行，结果返回后由 on_page_loaded 刷新界面
         """
         if SessionLocal is None:
             return
 
-        session = SessionLocal()
-        try:
-            # 基础查询对象
-            query = session.query(Movie)
+        if self.is_scroll_mode():
+            # 滚动浏览模式不分页：按当前过滤条件重置模型，后续由视图滚动触发分块加载
+            self.listModel.set_query(self.build_query(), self.filter_key(), self.create_pager())
+            return
+
+        query = self.build_query()
+        limit = self.paginator.get_page_size()
+        key = self.filter_key()
+
+        # 浏览过或已在空闲时预取的页：直接从缓存渲染，不再查询数据库
+        cached = page_cache.get(self.page_key(key, page, limit))
+        if cached is None and page == 1:
+            cached = self.narrow_search(key, limit)
+        if cached is not None:
+            self.loader.cancel('page')
+            self.on_page_loaded(key, page, limit, cached)
+            return
+
+        # 记录总数不再同步 COUNT：按过滤条件组合缓存，未命中时交给后台线程统计
+        total_items = count_cache.request(key, query.statement)
+
+        # 键集分页：按 (title, movie_id) 从锚点 seek 取一页，锚点未知时从最近的已知页近似定位
+        self.loader.submit(
+            'page', fetch_movie_page,
+            partial(self.on_page_fetched, key, page, limit, page_cache.generation),
+            query, self.pager, page, limit, total_items,
+            action='movie_gallery.page_load'
+        )
 
-            # 多条件复合过滤：类型筛选
-            if self.current_genre_text and self.current_genre_text != "全部分类":
-                # 通过多对多关联关系连接 Movie 和 Genre 表
-                query = query.join(Movie.genres).filter(Genre.name == self.current_genre_text)
+    def on_page_fetched(self, key, page, limit, generation, result):
+        """ 后台查询完成：写入分页缓存后刷新界面 """
+        page_cache.put(self.page_key(key, page, limit), result, generation)
+        self.on_page_loaded(key, page, limit, result)
 
-            # 多条件复合过滤：模糊搜索标题
-            if self.current_search_text:
-                query = query.filter(Movie.title.ilike(f"%{self.current_search_text}%"))
+    def on_page_loaded(self, key, page, limit, result):
+        """
+        后台查询完成：同步分页器状态并刷新画廊
+        """
+        movies, has_next = result
+        self.paged_key = key
+        # 等待查询期间总数可能已经统计完成
+        total_items = count_cache.get(key)
 
-            # 获取符合条件的记录总数，用于更新分页器的总页数显示
-            total_items = query.count()
+        if total_items is None and not has_next and (movies or page == 1):
+            # 已经到达末页，总数可以由行数精确推算
+            total_items = (page - 1) * limit + len(movies)
+            count_cache.put(key, total_items)
+
+        if total_items is not None:
             self.paginator.set_total_items(total_items)
             self.paginator.set_current_page(page)
+        else:
+            # 总数未知：分页器显示 “1 2 3 ... 更多”
+            self.paginator.set_open_ended(page, has_next)
 
-            # 计算分页偏移量执行物理分页查询
-            # limit 是每页的记录数，offset 是跳过的记录数
-            limit = self.paginator.get_page_size()
-            offset = (page - 1) * limit
-            # 我们跳过 offset 条记录，获取 limit 条记录
-            movies = query.offset(offset).limit(limit).all()
+        # 刷新画廊展示
+        self.update_gallery(movies)
+        if page == 1:
+            self.update_suggestions(key, not movies)
+        # 翻页后重置滚动条位置到顶部，来提升用户体验
+        self.scrollArea.verticalScrollBar().setValue(0)
 
-            # 刷新画廊展示
-            self.update_gallery(movies)
-            # 翻页后重置滚动条位置到顶部，来提升用户体验
-            self.scrollArea.verticalScrollBar().setValue(0)
+        # 下一次翻页几乎总是相邻页：空闲时预取前后两页
+        self.prefetch_adjacent(key, page, limit, has_next)
 
-        except Exception as e:
-            print(f"数据库分页查询失败: {e}")
-            traceback.print_exc()
-        finally:
-            session.close()
+    def prefetch_adjacent(self, key, page, limit, has_next):
+        """
+        以空闲优先级预取相邻页的数据与海报，翻页时直接从内存渲染
+        """
+        total_items = count_cache.get(key)
+        query = self.build_query()
+
+        # 前后两页使用不同通道，互不取代；再次翻页时旧的预取被新请求取代
+        for channel, target, exists in (('prefetch_next', page + 1, has_next),
+                                        ('prefetch_prev', page - 1, page > 1)):
+            if not exists or self.page_key(key, target, limit) in page_cache:
+                continue
+            self.loader.submit(
+                channel, fetch_movie_page,
+                partial(self.on_page_prefetched, key, target, limit, page_cache.generation),
+                query, self.pager, target, limit, total_items,
+                action='movie_gallery.prefetch', priority=DataLoader.IDLE_PRIORITY
+            )
 
-    def update_gallery(self, movies):
+    def on_page_prefetched(self, key, page, limit, generation, result):
         """
-        UI 刷新逻辑：销毁旧卡片并根据新查询结果创建新卡片
+        预取完成：写入分页缓存，并继续在空闲时解码该页海报
         """
-        # 遍历销毁旧卡片 widget，释放内存资源
-        while self.flowLayout.count():
-            item = self.flowLayout.takeAt(0)
-            widget = item.widget() if hasattr(item, 'widget') else item
-            if widget:
-                widget.deleteLater()
+        page_cache.put(self.page_key(key, page, limit), result, generation)
+        if key != self.filter_key():
+            return
 
-        self.cards.clear()
+        scale = 2 if self.devicePixelRatioF() > 1 else 1
+        for movie in result[0]:
+            image_loader.prefetch(id(self), movie.poster_url, MovieCard.POSTER_BOX, scale)
 
+    def create_card(self):
+        """ 卡片池工厂：创建一张空白卡片并绑定点击信号 """
+        card = MovieCard(parent=self.scrollWidget)
+        card.movieClicked.connect(self.on_card_clicked)
+        return card
+
+    def update_gallery(self, movies):
+        """
+        UI 刷新逻辑：将新查询结果重新绑定到卡片池中的卡片
+        """
         # 空数据处理：显示提示文字
-        if not movies:
-            no_data_label = CaptionLabel("未找到符合条件的电影", self.scrollWidget)
-            no_data_label.setAlignment(Qt.AlignCenter)
-            self.flowLayout.addWidget(no_data_label)
-            return
+        self.emptyLabel.setVisible(not movies)
 
-        # 遍历电影列表，批量实例化卡片并添加到流式布局
-        for movie in movies:
-            card = MovieCard(
-                movie_id=movie.movie_id,
-                iconPath=movie.poster_url,
-                name=movie.title,
-                parent=self.scrollWidget
-            )
-            # 绑定卡片点击信号至本类的槽函数
-            card.movieClicked.connect(self.on_card_clicked)
-            self.flowLayout.addWidget(card)
-            self.cards.append(card)
+        # 复用已有卡片，只在数量不足时创建，多余的卡片隐藏备用
+        self.cards = self.cardPool.update(
+            movies, lambda card, movie: card.bind(movie.movie_id, movie.title, movie.poster_url)
+        )
+
+    def is_scroll_mode(self):
+        """ 是否处于滚动浏览模式 """
+        return self.viewModeButton.isChecked()
+
+    def on_view_mode_toggled(self, checked):
+        """
+        事件槽：切换分页 / 滚动浏览模式
+        两种模式共用过滤条件，只有在该模式下的数据已过期时才重新加载
+        """
+        self.viewStack.setCurrentIndex(1 if checked else 0)
+        self.paginator.setVisible(not checked)
+
+        loaded_key = self.listModel.key if checked else self.paged_key
+        if loaded_key != self.filter_key():
+            self.load_data(page=1)
+
+    def filter_key(self):
+        """ 当前过滤条件组合，作为总数缓存的键 """
+        return ('movie_gallery', self.current_genre_text, self.current_search_text, self.current_filter)
+
+    def page_key(self, key, page, limit):
+        """ 分页缓存的键：过滤条件 + 排序 + 页码 + 每页数量 """
+        sort_order = 'relevance' if self.is_ranked_search(key[2]) else self.SORT_ORDER
+        return key + (sort_order, page, limit)
+
+    def reset_paging(self):
+        """ 过滤条件变化后清空键集锚点与免计数模式下已浏览的页码 """
+        # 换用新的分页器而不是原地清空，仍在后台执行的旧请求不会把旧条件下的锚点写进来
+        self.pager = self.create_pager()
+        self.paginator.reset_open_ended()
+        # 旧条件下尚未完成的预取全部作废
+        self.loader.cancel('prefetch_next')
+        self.loader.cancel('prefetch_prev')
+        image_loader.cancel_prefetch(id(self))
+
+    def on_count_ready(self, key, total):
+        """
+        事件槽：后台计数完成，若仍是当前过滤条件则切换为精确页码
+        """
+        if key != self.filter_key() or not self.paginator.is_open_ended():
+            return
+        page = self.paginator.get_current_page()
+        self.paginator.set_total_items(total)
+        self.paginator.set_current_page(page)
 
     def on_genre_changed(self, text):
         """
         事件槽：类型下拉框切换，重置到第 1 页并刷新
         """
         self.current_genre_text = text
+        self.reset_paging()
         self.load_data(page=1)
 
-    def on_search_triggered(self):
+    def on_filter_toggled(self, checked):
+        """ 事件槽：展开 / 收起筛选面板 """
+        self.filterPanel.setVisible(checked)
+
+    def on_filter_changed(self, movie_filter):
+        """
+        事件槽：筛选面板应用了新的条件，重置到第 1 页并刷新
+        """
+        if movie_filter == self.current_filter:
+            return
+        self.current_filter = movie_filter
+        count = movie_filter.count()
+        self.filterButton.setToolTip(f"筛选（已启用 {count} 项）" if count else "筛选")
+        self.reset_paging()
+        self.load_data(page=1)
+
+    def on_search_requested(self, text):
         """
-        事件槽：点击搜索图标或回车键执行搜索
+        事件槽：防抖后的搜索请求（停止输入、回车、点击搜索图标或清空搜索框）
+        未完成的旧查询由 DataLoader 作废，只渲染最新关键词的结果
         """
-        text = self.searchEdit.text().strip()
+        if text == self.current_search_text:
+            return
         self.current_search_text = text
+        self.reset_paging()
         self.load_data(page=1)
 
-    def on_search_text_changed(self, text):
+    def narrow_search(self, key, limit):
         """
-        事件槽：当用户手动删除搜索框内容时，自动重置列表到全部状态
+        搜索前缀缓存：较短关键词的结果已完整缓存（不足一页）时，
+        更长的关键词只会匹配其中的子集，直接在内存中过滤，不再查询数据库
+        :return: 与后台查询相同格式的 (卡片数据列表, 是否存在下一页)，无法推导时返回 None
         """
-        if not text.strip() and self.current_search_text:
-            self.current_search_text = ""
-            self.load_data(page=1)
+        namespace, genre, search, movie_filter = key
+        # 全文检索同时匹配简介，不能由标题过滤推导
+        if fulltext_search.usable(search):
+            return None
+        needle = search.lower()
+        by_pinyin = pinyin_search.is_pinyin_query(search)
+        for end in range(len(search) - 1, 0, -1):
+            # 拼音关键词只做前缀匹配、其余关键词只做包含匹配，两种方式的结果互不为子集，只能由同一方式的前缀推导
+            if pinyin_search.is_pinyin_query(search[:end]) != by_pinyin:
+                continue
+            prefix_key = (namespace, genre, search[:end], movie_filter)
+            total = count_cache.get(prefix_key)
+            page_key = self.page_key(prefix_key, 1, limit)
+            if total is None or total > limit or page_key not in page_cache:
+                continue
+            movies, _ = page_cache.get(page_key)
+            # 与 build_query 的条件一致：拼音关键词只做检索键前缀匹配，其余为标题包含关键词
+            movies = [m for m in movies
+                      if (pinyin_search.matches(m.title, search) if by_pinyin else needle in m.title.lower())]
+            count_cache.put(key, len(movies))
+            page_cache.put(self.page_key(key, 1, limit), (movies, False))
+            return movies, False
+        return None
+
+    def on_first_chunk_loaded(self, key, rows):
+        """ 滚动浏览模式的第一块数据加载完成 """
+        if key == self.filter_key():
+            self.update_suggestions(key, rows == 0)
+
+    def update_suggestions(self, key, empty):
+        """
+        搜索没有结果时，从内存中的容错搜索索引取出相似的电影标题作为建议
+        建议不受类型筛选限制，点击后以该标题在当前类型下重新搜索
+        """
+        search = key[2]
+        if not empty or not search:
+            self.suggestionBar.clear()
+            return
+        titles = [title for _, title in fuzzy_search.suggest_movies(search) if title.lower() != search.lower()]
+        self.suggestionBar.set_suggestions(search, titles)
+
+    def on_suggestion_clicked(self, title):
+        """ 事件槽：点击建议，以建议的标题立即搜索 """
+        self.searchEdit.setText(title)
+        self.searchDebouncer.flush()
 
     def on_card_clicked(self, movie_id: str):
         """
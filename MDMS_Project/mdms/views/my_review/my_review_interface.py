@@ -1,14 +1,41 @@
+from collections import namedtuple
+
 from PySide6.QtCore import Qt, Slot
 from PySide6.QtWidgets import (QFrame, QVBoxLayout, QHeaderView, QWidget, QHBoxLayout,
                                QTableWidgetItem)
 from qfluentwidgets import (SubtitleLabel, TableWidget, TransparentToolButton, FluentIcon, MessageBox,
                             MessageBoxBase, Slider, TextEdit, StrongBodyLabel,
                             BodyLabel)
+from sqlalchemy.orm import joinedload
 
+from mdms.common.data_loader import DataLoader
 from mdms.common.review_manager import review_manager
 from mdms.common.user_manager import user_manager
 from mdms.database.models import Review
 from mdms.database.session import SessionLocal
+from mdms.database.instrumentation import instrumented_action
+
+
+# 表格行所需的纯数据，由后台线程从 ORM 对象中提取
+MyReviewRow = namedtuple('MyReviewRow', ['review_id', 'rating', 'comment', 'created_at', 'movie_title'])
+
+
+def fetch_user_reviews(session, user_id):
+    """ 后台线程：查询用户的全部影评，并预加载关联的电影以获取标题 """
+    reviews = session.query(Review).options(joinedload(Review.movie)).filter(
+        Review.user_id == user_id
+    ).order_by(Review.created_at.desc()).all()
+    return [
+        MyReviewRow(
+            review_id=r.review_id,
+            rating=r.rating,
+            comment=r.comment or "",
+            created_at=r.created_at,
+            # 处理关联可能为空的情况
+            movie_title=r.movie.title if r.movie else "未知电影"
+        )
+        for r in reviews
+    ]
 
 
 # 编辑评论的弹窗类
@@ -57,6 +84,9 @@ class MyReviewInterface(QFrame):
         self.mainLayout.setContentsMargins(30, 30, 30, 30)
         self.mainLayout.setSpacing(20)
 
+        # 后台数据加载器：显示界面与修改后的多次刷新只保留最新一次结果
+        self.loader = DataLoader(self)
+
         # 1. 标题
         self.titleLabel = SubtitleLabel("我的影评记录", self)
         self.mainLayout.addWidget(self.titleLabel)
@@ -100,21 +130,19 @@ class MyReviewInterface(QFrame):
         self.load_reviews()
 
     def load_reviews(self):
-        """ 从数据库读取当前用户的评论 """
+        """ 在后台读取当前用户的评论，完成后由 show_reviews 填充表格 """
         if not user_manager.is_logged_in:
             return
 
-        self.table.setRowCount(0)  # 清空旧数据
         user_id = user_manager.current_user.user_id
+        self.loader.submit('reviews', fetch_user_reviews, self.show_reviews, user_id,
+                           action='my_review.load')
 
-        with SessionLocal() as session:
-            # 查询 Review 并关联 Movie 表获取电影标题
-            reviews = session.query(Review).filter(Review.user_id == user_id).order_by(Review.created_at.desc()).all()
-
-            for review in reviews:
-                # 获取电影标题 (处理关联可能为空的情况)
-                movie_title = review.movie.title if review.movie else "未知电影"
-                self.add_review_row(review, movie_title)
+    def show_reviews(self, reviews):
+        """ 使用后台查询结果重新填充表格 """
+        self.table.setRowCount(0)  # 清空旧数据
+        for review in reviews:
+            self.add_review_row(review, review.movie_title)
 
     def add_review_row(self, review, movie_title):
         """ 向表格添加一行数据 """
@@ -170,6 +198,7 @@ class MyReviewInterface(QFrame):
         self.table.setCellWidget(row_idx, 5, widget)
 
     @Slot()
+    @instrumented_action('review.edit')
     def on_edit_clicked(self, review_id):
         """ 处理编辑逻辑 """
         # 开启 session
@@ -207,6 +236,7 @@ class MyReviewInterface(QFrame):
                     # 可以加个 show_error_message
 
     @Slot()
+    @instrumented_action('review.delete')
     def on_delete_clicked(self, review_id):
         """ 处理删除逻辑 """
         w = MessageBox("确认删除", "确定要删除这条影评吗？此操作不可恢复。", self)
@@ -1,4 +1,4 @@
-import os
+from collections import namedtuple
 
 from PySide6.QtCore import Qt, Signal, QSize
 from PySide6.QtGui import QColor
@@ -8,9 +8,53 @@ from qfluentwidgets import (ImageLabel, StrongBodyLabel, BodyLabel,
                             FluentIcon, SmoothScrollArea, CardWidget,
                             IconWidget, CaptionLabel, LargeTitleLabel, SubtitleLabel,
                             TitleLabel, TransparentToolButton, themeColor)
+from sqlalchemy.orm import selectinload, undefer
 
-from mdms.database.models import Person
-from mdms.database.session import SessionLocal
+from mdms.common.data_loader import DataLoader
+from mdms.common.image_loader import image_loader
+from mdms.common.thumbnail_cache import thumbnail_cache
+from mdms.database.models import Person, MoviePerson
+
+
+# 影视作品卡片所需的纯数据
+FilmItem = namedtuple('FilmItem', ['title', 'role', 'year', 'poster_url'])
+
+
+def fetch_person_detail(session, person_id):
+    """
+    后台线程：加载人员基本信息与影视作品列表
+    返回与会话无关的字典，未找到时返回 None
+    """
+    person = session.query(Person).options(
+        undefer(Person.bio),
+        selectinload(Person.movie_associations).joinedload(MoviePerson.movie)
+    ).filter(Person.person_id == person_id).first()
+    if not person:
+        return None
+
+    # 按上映日期从新到旧排序
+    associations = [a for a in person.movie_associations if a.movie]
+    associations.sort(
+        key=lambda x: x.movie.release_date.strftime("%Y-%m-%d") if x.movie.release_date else "0000",
+        reverse=True
+    )
+
+    return {
+        'person_id': person.person_id,
+        'name': person.name,
+        'birth': person.birthdate.strftime("%Y年%m月%d日") if person.birthdate else "未知日期",
+        'bio': person.bio,
+        'photo_url': person.photo_url,
+        'films': [
+            FilmItem(
+                title=a.movie.title,
+                role=a.role,
+                year=str(a.movie.release_date.year) if a.movie.release_date else "-",
+                poster_url=a.movie.poster_url
+            )
+            for a in associations
+        ],
+    }
 
 
 class FilmographyCard(CardWidget):
@@ -29,10 +73,12 @@ class FilmographyCard(CardWidget):
         layout.setSpacing(16)
 
         # 1. 电影海报：微缩图展示，固定纵横比
-        self.poster = ImageLabel(poster_url if poster_url else ":/qfluentwidgets/images/logo.png", self)
+        self.poster = ImageLabel(image_loader.placeholder(QSize(52, 70)), self)
         self.poster.setFixedSize(52, 70)
         self.poster.setBorderRadius(6, 6, 6, 6)
         self.poster.setScaledContents(True)
+        # 海报在后台线程中按缩略尺寸解码，完成后替换占位图
+        image_loader.load(self.poster, poster_url, QSize(52, 70), self.on_image_loaded)
 
         # 2. 作品信息区：标题与具体角色（如：担任 导演/演员）
         info_layout = QVBoxLayout()
@@ -56,6 +102,11 @@ class FilmographyCard(CardWidget):
         layout.addStretch(1)
         layout.addWidget(self.yearLabel)
 
+    def on_image_loaded(self, image):
+        """ 后台解码完成：替换占位图并恢复固定尺寸 """
+        self.poster.setImage(image)
+        self.poster.setFixedSize(52, 70)
+
 
 class PeopleDetailWidget(QWidget):
     """
@@ -67,6 +118,8 @@ class PeopleDetailWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.person_id = None
+        # 后台数据加载器：快速切换人员时只保留最后一次打开的详情
+        self.loader = DataLoader(self)
         self.setObjectName("PeopleDetailWidget")
         self.setStyleSheet("PeopleDetailWidget{background-color: transparent;}")
 
@@ -196,44 +249,38 @@ class PeopleDetailWidget(QWidget):
 
     def set_person(self, person_id: str):
         """
-        数据加载入口：根据人员 ID 加载并刷新视图
+        数据加载入口：根据人员 ID 在后台加载数据，完成后由 show_person 刷新视图
         """
         self.person_id = person_id
         # 切换人员时，自动将滚动条重置回顶部
         self.scrollArea.verticalScrollBar().setValue(0)
+        self.nameLabel.setText("Loading...")
+
+        self.loader.submit('detail', fetch_person_detail, self.show_person, person_id,
+                           on_error=lambda e: self.nameLabel.setText("数据加载错误"),
+                           action='people_detail.open')
 
-        session = SessionLocal()
-        try:
-            # 执行数据库查询，通过 ID 获取 Person 对象
-            person = session.query(Person).filter(Person.person_id == person_id).first()
-            if not person:
-                self.nameLabel.setText("未找到人员信息")
-                return
-
-            # 刷新 UI 基础文字信息
-            self.nameLabel.setText(person.name)
-            birth = person.birthdate.strftime("%Y年%m月%d日") if person.birthdate else "未知日期"
-            self.metaLabel.setText(f"{birth}")
-            self.bioLabel.setText(person.bio if person.bio else "暂无简介。")
-
-            # 异步处理本地图片加载，如果路径无效则回退至 Logo
-            if person.photo_url and os.path.exists(person.photo_url):
-                self.photoLabel.setImage(person.photo_url)
-            else:
-                self.photoLabel.setImage(":/qfluentwidgets/images/logo.png")
-
-            # 调用子函数加载其名下的影视作品列表
-            self.load_filmography(person)
-
-        except Exception as e:
-            print(f"载入人员详情错误: {e}")
-            self.nameLabel.setText("数据加载错误")
-        finally:
-            session.close()
-
-    def load_filmography(self, person_obj):
+    def show_person(self, person):
+        """ 使用后台加载的详情数据刷新界面 """
+        if not person:
+            self.nameLabel.setText("未找到人员信息")
+            return
+
+        # 刷新 UI 基础文字信息
+        self.nameLabel.setText(person['name'])
+        self.metaLabel.setText(person['birth'])
+        self.bioLabel.setText(person['bio'] if person['bio'] else "暂无简介。")
+
+        # 加载详情档位缩略图，路径无效时回退至 Logo；setImage 会按图片尺寸重设控件大小，需恢复固定尺寸
+        self.photoLabel.setImage(thumbnail_cache.get_for(self, person['photo_url'], 'detail'))
+        self.photoLabel.setFixedSize(200, 280)
+
+        # 渲染其名下的影视作品列表
+        self.load_filmography(person['films'])
+
+    def load_filmography(self, films):
         """
-        影视作品加载逻辑：从 Person 对象中提取 MoviePerson 关联并按日期排序展示
+        影视作品渲染逻辑：展示已按上映日期排序的作品列表
         """
         # 第一步：清空界面上现有的作品卡片，防止重复堆叠
         while self.filmListLayout.count():
@@ -241,18 +288,11 @@ class PeopleDetailWidget(QWidget):
             if item.widget():
                 item.widget().deleteLater()
 
-        # 第二步：获取多对多关联数据并执行业务排序 (按上映日期从新到旧)
-        associations = person_obj.movie_associations
-        associations.sort(
-            key=lambda x: x.movie.release_date.strftime("%Y-%m-%d") if x.movie and x.movie.release_date else "0000",
-            reverse=True
-        )
-
-        count = len(associations)
+        count = len(films)
         self.filmCountLabel.setText(f"({count}部)")
 
-        # 第三步：空数据友好展示
-        if not associations:
+        # 第二步：空数据友好展示
+        if not films:
             empty_card = CardWidget(self)
             empty_layout = QHBoxLayout(empty_card)
             empty_icon = IconWidget(FluentIcon.INFO, self)
@@ -265,18 +305,13 @@ class PeopleDetailWidget(QWidget):
             self.filmListLayout.addWidget(empty_card)
             return
 
-        # 第四步：遍历关联结果并实例化卡片
-        for relation in associations:
-            movie = relation.movie
-            if not movie: continue
-
-            year_str = str(movie.release_date.year) if movie.release_date else "-"
-
+        # 第三步：遍历作品数据并实例化卡片
+        for film in films:
             card = FilmographyCard(
-                title=movie.title,
-                role=relation.role,
-                year=year_str,
-                poster_url=movie.poster_url,
+                title=film.title,
+                role=film.role,
+                year=film.year,
+                poster_url=film.poster_url,
                 parent=self
             )
-            self.filmListLayout.addWidget(card)
\ No newline at end of file
+            self.filmListLayout.addWidget(card)
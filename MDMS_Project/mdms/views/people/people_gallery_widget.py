@@ -1,12 +1,14 @@
 import sys
-import traceback
+from collections import namedtuple
+from functools import partial
 
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QSize
 from PySide6.QtWidgets import (QFrame, QVBoxLayout, QApplication, QWidget,
                                QHBoxLayout)
 from qfluentwidgets import (ElevatedCardWidget, ImageLabel, CaptionLabel,
                             SubtitleLabel, setFont, FlowLayout, ScrollArea, SmoothMode,
                             SearchLineEdit)
+from sqlalchemy.orm import Query
 
 # 导入底层数据模型与会话管理
 from mdms.database.session import SessionLocal
@@ -14,34 +16,65 @@ from mdms.database.models import Person
 
 # 导入通用的分页控制组件
 from mdms.common.fluent_paginator import FluentPaginator
+from mdms.common.keyset_pager import KeysetPager
+from mdms.common.count_cache import count_cache
+from mdms.common.page_cache import page_cache
+from mdms.common.data_loader import DataLoader
+from mdms.common.image_loader import image_loader
+from mdms.common.card_pool import CardPool
+from mdms.common.search_debouncer import SearchDebouncer
+from mdms.common.pinyin_search import pinyin_search
+from mdms.common.trigram_index import fuzzy_search
+from mdms.common.prefix_index import autocomplete, PrefixCompleter
+from mdms.common.suggestion_bar import SuggestionBar
+
+
+# 人员卡片所需的纯数据
+PersonCardData = namedtuple('PersonCardData', ['person_id', 'name', 'photo_url'])
+# 列表查询只投影卡片需要的列，不读取 bio 大字段
+PERSON_CARD_COLUMNS = (Person.person_id, Person.name, Person.photo_url)
+
+
+def fetch_people_page(session, query, pager, page, limit, total_items):
+    """
+    后台线程：执行一页人员查询
+    :return: (卡片数据列表, 是否存在下一页)
+    """
+    query = query.with_session(session)
+    if total_items is not None:
+        people = pager.fetch_page(query, page, limit, total_items)
+        has_next = page * limit < total_items
+    else:
+        people, has_next = pager.probe_page(query, page, limit)
+    return [PersonCardData._make(row) for row in people], has_next
 
 
 class PersonCard(ElevatedCardWidget):
     """
     演职人员展示卡片组件
     采用圆形头像设计，并提供悬浮阴影（Elevated）视觉效果。
+    卡片可通过 bind() 重新绑定到其他人员，供画廊翻页时复用。
     """
     # 点击卡片时向父组件发送人员唯一标识符 ID
     personClicked = Signal(str)
 
-    def __init__(self, person_id: str, photoPath: str, name: str, parent=None):
-        super().__init__(parent)
-        self.person_id = person_id
-        self.personName = name
+    # 头像解码尺寸（逻辑像素），相邻页预取时按同一尺寸解码
+    PHOTO_BOX = QSize(120, 120)
 
-        # 容错处理：若数据库中无照片路径，使用默认占位图
-        if not photoPath:
-            photoPath = ":/qfluentwidgets/images/logo.png"
+    def __init__(self, person_id: str = None, photoPath: str = None, name: str = "", parent=None):
+        super().__init__(parent)
+        self.person_id = None
+        self.personName = ""
 
         # 1. 头像组件配置
-        self.iconWidget = ImageLabel(photoPath, self)
+        self.iconWidget = ImageLabel(image_loader.placeholder(QSize(120, 120)), self)
         # 固定尺寸并设置 border-radius 为边长的一半，从而渲染为圆形
         self.iconWidget.setFixedSize(120, 120)
         self.iconWidget.setBorderRadius(60, 60, 60, 60)
         self.iconWidget.setScaledContents(True)
 
         # 2. 姓名标签配置
-        self.label = CaptionLabel(name, self)
+        self.label = CaptionLabel(self)
         self.label.setAlignment(Qt.AlignCenter)
 
         # 3. 内部布局：垂直居中排列头像与姓名
@@ -57,6 +90,25 @@ class PersonCard(ElevatedCardWidget):
         self.setFixedSize(160, 210)
         self.setCursor(Qt.PointingHandCursor)
 
+        if person_id is not None:
+            self.bind(person_id, name, photoPath)
+
+    def bind(self, person_id: str, name: str, photo_url: str):
+        """ 将卡片绑定到一位人员：更新姓名并重新异步加载头像 """
+        self.person_id = person_id
+        self.personName = name
+        self.label.setText(name)
+
+        # 先恢复占位图，照片在后台线程中按头像尺寸解码；若数据库中无照片路径或文件缺失，显示默认 Logo
+        self.iconWidget.setImage(image_loader.placeholder(QSize(120, 120)))
+        self.iconWidget.setFixedSize(120, 120)
+        image_loader.load(self.iconWidget, photo_url, self.PHOTO_BOX, self.on_image_loaded)
+
+    def on_image_loaded(self, image):
+        """ 后台解码完成：替换占位图并恢复头像的固定尺寸 """
+        self.iconWidget.setImage(image)
+        self.iconWidget.setFixedSize(120, 120)
+
     def mouseReleaseEvent(self, e):
         """ 捕获释放事件以触发自定义点击信号 """
         super().mouseReleaseEvent(e)
@@ -71,6 +123,9 @@ class PeopleGalleryWidget(QFrame):
     # 请求打开人员详细信息页面的信号
     requestOpenDetail = Signal(str)
 
+    # 画廊排序方式：按 (name, person_id) 键集排序
+    SORT_ORDER = 'name'
+
     def __init__(self, text: str, parent=None):
         super().__init__(parent=parent)
         self.setObjectName(text.replace(' ', '-'))
@@ -78,6 +133,12 @@ class PeopleGalleryWidget(QFrame):
         # 状态变量：维护当前搜索词以便分页查询时共享过滤状态
         self.current_search_text = ""
         self.cards = []
+        # 键集分页器：按 (name, person_id) 稳定排序，深页翻页无需 OFFSET 扫描
+        self.pager = KeysetPager([Person.name, Person.person_id])
+        # 后台计数完成后，若仍是当前过滤条件，则把分页器切换为精确页码
+        count_cache.countReady.connect(self.on_count_ready)
+        # 后台数据加载器：快速连续翻页时只保留最新一次请求的结果
+        self.loader = DataLoader(self)
 
         # 1. 构造用户界面
         self.init_ui(text)
@@ -99,10 +160,12 @@ class PeopleGalleryWidget(QFrame):
         self.searchEdit.setPlaceholderText("搜索导演/演员...")
         self.searchEdit.setFixedWidth(240)
 
-        # 绑定搜索逻辑：按下回车或点击搜索按钮均触发查询
-        self.searchEdit.searchSignal.connect(self.on_search_triggered)
-        self.searchEdit.returnPressed.connect(self.on_search_triggered)
-        self.searchEdit.textChanged.connect(self.on_search_text_changed)
+        # 绑定搜索逻辑：边输入边搜索（防抖），按下回车或点击搜索按钮立即查询
+        self.searchDebouncer = SearchDebouncer(self.searchEdit, self)
+        self.searchDebouncer.searchRequested.connect(self.on_search_requested)
+        # 输入时按姓名 / 拼音前缀补全人员，选中候选后立即搜索
+        self.searchCompleter = PrefixCompleter(self.searchEdit, autocomplete.complete_people, self)
+        self.searchCompleter.activated.connect(lambda text: self.searchDebouncer.flush())
 
         self.headerLayout.addWidget(self.titleLabel)
         self.headerLayout.addStretch(1)
@@ -111,6 +174,11 @@ class PeopleGalleryWidget(QFrame):
         self.mainLayout.addLayout(self.headerLayout)
         self.mainLayout.addSpacing(10)
 
+        # 搜索无结果时的“您是不是要找”建议
+        self.suggestionBar = SuggestionBar(self)
+        self.suggestionBar.suggestionClicked.connect(self.on_suggestion_clicked)
+        self.mainLayout.addWidget(self.suggestionBar)
+
         # 中间滚动区域：使用 FlowLayout 实现自动换行网格布局
         self.scrollArea = ScrollArea(self)
         self.scrollArea.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn) # 防止因滚动条出现导致的水平宽度抖动
@@ -122,11 +190,21 @@ class PeopleGalleryWidget(QFrame):
         self.scrollWidget = QWidget()
         self.scrollWidget.setStyleSheet("background: transparent;")
 
-        self.flowLayout = FlowLayout(self.scrollWidget)
+        # isTight=True：布局跳过卡片池中隐藏的备用卡片
+        self.flowLayout = FlowLayout(self.scrollWidget, isTight=True)
         self.flowLayout.setContentsMargins(0, 0, 0, 0)
         self.flowLayout.setVerticalSpacing(20)
         self.flowLayout.setHorizontalSpacing(20)
 
+        # 空状态反馈：常驻布局首位，按需显示
+        self.emptyLabel = CaptionLabel("未找到相关演职人员", self.scrollWidget)
+        self.emptyLabel.setAlignment(Qt.AlignCenter)
+        self.emptyLabel.setVisible(False)
+        self.flowLayout.addWidget(self.emptyLabel)
+
+        # 卡片复用池：翻页时重新绑定已有卡片，而不是销毁重建
+        self.cardPool = CardPool(self.scrollWidget, self.flowLayout, self.create_card)
+
         self.scrollArea.setWidget(self.scrollWidget)
         self.mainLayout.addWidget(self.scrollArea)
 
@@ -138,85 +216,200 @@ class PeopleGalleryWidget(QFrame):
 
         self.mainLayout.addWidget(self.paginator, 0, Qt.AlignBottom)
 
+    def build_query(self):
+        """ 根据当前搜索关键词构建未绑定会话的过滤查询 """
+        query = Query(PERSON_CARD_COLUMNS)
+        search = self.current_search_text
+        if search:
+            if pinyin_search.is_pinyin_query(search):
+                # 拼音 / 首字母前缀匹配，两列各走索引范围扫描；不再 OR 上 '%…%'，否则优化器只能逐行检查整个索引。
+                # 外文姓名的全拼检索键即姓名本身（小写、去掉空格），以关键词开头的外文姓名同样能命中
+                query = query.filter(pinyin_search.prefix_match(Person.name_pinyin, Person.name_initials, search))
+            else:
+                query = query.filter(Person.name.ilike(f"%{search}%"))
+        return query
+
     def load_data(self, page: int):
         """
         核心数据加载逻辑
-        执行基于 SQLAlchemy 的数据库过滤、统计与分页查询
+        在后台线程中执行数据库过滤与分页查询，结果返回后由 on_page_loaded 刷新界面
         """
         if SessionLocal is None:
             return
 
-        session = SessionLocal()
-        try:
-            # 构建基础查询语句
-            query = session.query(Person)
+        # 1. 构建基础查询语句（不绑定会话），应用模糊搜索过滤
+        query = self.build_query()
 
-            # 1. 应用模糊搜索过滤
-            if self.current_search_text:
-                query = query.filter(Person.name.ilike(f"%{self.current_search_text}%"))
+        # 2. 记录总数按搜索条件缓存，未命中时交给后台线程统计，不阻塞翻页
+        limit = self.paginator.get_page_size()
+        key = self.filter_key()
 
-            # 2. 获取符合条件的记录总数并同步给分页器
-            total_items = query.count()
-            self.paginator.set_total_items(total_items)
-            self.paginator.set_current_page(page)
+        # 浏览过或已预取的页：直接从缓存渲染
+        cached = page_cache.get(self.page_key(key, page, limit))
+        if cached is None and page == 1:
+            cached = self.narrow_search(key, limit)
+        if cached is not None:
+            self.loader.cancel('page')
+            self.on_page_loaded(key, page, limit, cached)
+            return
 
-            # 3. 计算偏移量并执行物理分页查询（提升大数据量下的加载性能）
-            limit = self.paginator.get_page_size()
-            offset = (page - 1) * limit
-            people = query.offset(offset).limit(limit).all()
+        total_items = count_cache.request(key, query.statement)
 
-            # 4. 刷新前端画廊界面展示
-            self.update_gallery(people)
+        # 3. 键集分页：按 (name, person_id) 从锚点 seek 取一页，深页延迟保持平稳
+        self.loader.submit(
+            'page', fetch_people_page,
+            partial(self.on_page_fetched, key, page, limit, page_cache.generation),
+            query, self.pager, page, limit, total_items,
+            action='people_gallery.page_load'
+        )
 
-            # 每次翻页后自动将视图滚动回顶部
-            self.scrollArea.verticalScrollBar().setValue(0)
+    def on_page_fetched(self, key, page, limit, generation, result):
+        """ 后台查询完成：写入分页缓存后刷新界面 """
+        page_cache.put(self.page_key(key, page, limit), result, generation)
+        self.on_page_loaded(key, page, limit, result)
 
-        except Exception as e:
-            print(f"载入人员数据失败: {e}")
-            traceback.print_exc()
-        finally:
-            session.close()
+    def on_page_loaded(self, key, page, limit, result):
+        """ 后台查询完成：同步分页器状态并刷新画廊 """
+        people, has_next = result
+        total_items = count_cache.get(key)
 
-    def update_gallery(self, people):
-        """ UI 刷新逻辑：安全地销毁旧卡片并渲染新数据 """
-        # 清空布局内现有的所有 widget，防止内存泄漏和重叠显示
-        while self.flowLayout.count():
-            item = self.flowLayout.takeAt(0)
-            widget = item.widget() if hasattr(item, 'widget') else item
-            if widget:
-                widget.deleteLater()
+        if total_items is None and not has_next and (people or page == 1):
+            # 已经到达末页，总数可以由行数精确推算
+            total_items = (page - 1) * limit + len(people)
+            count_cache.put(key, total_items)
 
-        self.cards.clear()
+        if total_items is not None:
+            self.paginator.set_total_items(total_items)
+            self.paginator.set_current_page(page)
+        else:
+            # 总数未知：分页器显示 “1 2 3 ... 更多”
+            self.paginator.set_open_ended(page, has_next)
+
+        # 4. 刷新前端画廊界面展示
+        self.update_gallery(people)
+        if page == 1:
+            self.update_suggestions(key, not people)
+
+        # 每次翻页后自动将视图滚动回顶部
+        self.scrollArea.verticalScrollBar().setValue(0)
+
+        # 空闲时预取前后两页
+        self.prefetch_adjacent(key, page, limit, has_next)
+
+    def prefetch_adjacent(self, key, page, limit, has_next):
+        """ 以空闲优先级预取相邻页的数据与头像 """
+        total_items = count_cache.get(key)
+        query = self.build_query()
+
+        for channel, target, exists in (('prefetch_next', page + 1, has_next),
+                                        ('prefetch_prev', page - 1, page > 1)):
+            if not exists or self.page_key(key, target, limit) in page_cache:
+                continue
+            self.loader.submit(
+                channel, fetch_people_page,
+                partial(self.on_page_prefetched, key, target, limit, page_cache.generation),
+                query, self.pager, target, limit, total_items,
+                action='people_gallery.prefetch', priority=DataLoader.IDLE_PRIORITY
+            )
 
-        # 空状态反馈
-        if not people:
-            no_data_label = CaptionLabel("未找到相关演职人员", self.scrollWidget)
-            no_data_label.setAlignment(Qt.AlignCenter)
-            self.flowLayout.addWidget(no_data_label)
+    def on_page_prefetched(self, key, page, limit, generation, result):
+        """ 预取完成：写入分页缓存，并继续在空闲时解码该页头像 """
+        page_cache.put(self.page_key(key, page, limit), result, generation)
+        if key != self.filter_key():
             return
 
-        # 循环实例化人员卡片并添加至流式布局
-        for person in people:
-            card = PersonCard(
-                person_id=person.person_id,
-                photoPath=person.photo_url,
-                name=person.name,
-                parent=self.scrollWidget
-            )
-            card.personClicked.connect(self.on_card_clicked)
-            self.flowLayout.addWidget(card)
-            self.cards.append(card)
+        scale = 2 if self.devicePixelRatioF() > 1 else 1
+        for person in result[0]:
+            image_loader.prefetch(id(self), person.photo_url, PersonCard.PHOTO_BOX, scale)
+
+    def create_card(self):
+        """ 卡片池工厂：创建一张空白人员卡片并绑定点击信号 """
+        card = PersonCard(parent=self.scrollWidget)
+        card.personClicked.connect(self.on_card_clicked)
+        return card
 
-    def on_search_triggered(self):
-        """ 搜索事件响应：重置页码为 1 并更新状态执行查询 """
-        self.current_search_text = self.searchEdit.text().strip()
+    def update_gallery(self, people):
+        """ UI 刷新逻辑：将新数据重新绑定到卡片池中的卡片 """
+        # 空状态反馈
+        self.emptyLabel.setVisible(not people)
+
+        # 复用已有卡片，只在数量不足时创建，多余的卡片隐藏备用
+        self.cards = self.cardPool.update(
+            people, lambda card, person: card.bind(person.person_id, person.name, person.photo_url)
+        )
+
+    def filter_key(self):
+        """ 当前过滤条件组合，作为总数缓存的键 """
+        return ('people_gallery', self.current_search_text)
+
+    def page_key(self, key, page, limit):
+        """ 分页缓存的键：搜索条件 + 排序 + 页码 + 每页数量 """
+        return key + (self.SORT_ORDER, page, limit)
+
+    def reset_paging(self):
+        """ 搜索条件变化后清空键集锚点与免计数模式下已浏览的页码 """
+        # 换用新的分页器，避免仍在后台执行的旧请求写入旧条件下的锚点
+        self.pager = KeysetPager([Person.name, Person.person_id])
+        self.paginator.reset_open_ended()
+        # 旧条件下尚未完成的预取全部作废
+        self.loader.cancel('prefetch_next')
+        self.loader.cancel('prefetch_prev')
+        image_loader.cancel_prefetch(id(self))
+
+    def on_count_ready(self, key, total):
+        """ 后台计数完成：若仍是当前搜索条件，则切换为精确页码 """
+        if key != self.filter_key() or not self.paginator.is_open_ended():
+            return
+        page = self.paginator.get_current_page()
+        self.paginator.set_total_items(total)
+        self.paginator.set_current_page(page)
+
+    def on_search_requested(self, text):
+        """ 防抖后的搜索请求：重置页码为 1 并更新状态执行查询 """
+        if text == self.current_search_text:
+            return
+        self.current_search_text = text
+        self.reset_paging()
         self.load_data(page=1)
 
-    def on_search_text_changed(self, text):
-        """ 交互增强：当搜索框被手动清空时，自动恢复完整列表展示 """
-        if not text.strip() and self.current_search_text:
-            self.current_search_text = ""
-            self.load_data(page=1)
+    def narrow_search(self, key, limit):
+        """
+        搜索前缀缓存：较短关键词的结果已完整缓存（不足一页）时，直接在内存中过滤出更长关键词的结果
+        """
+        namespace, search = key
+        needle = search.lower()
+        by_pinyin = pinyin_search.is_pinyin_query(search)
+        for end in range(len(search) - 1, 0, -1):
+            # 拼音关键词只做前缀匹配、其余关键词只做包含匹配，两种方式的结果互不为子集，只能由同一方式的前缀推导
+            if pinyin_search.is_pinyin_query(search[:end]) != by_pinyin:
+                continue
+            prefix_key = (namespace, search[:end])
+            total = count_cache.get(prefix_key)
+            page_key = self.page_key(prefix_key, 1, limit)
+            if total is None or total > limit or page_key not in page_cache:
+                continue
+            people, _ = page_cache.get(page_key)
+            # 与 build_query 的条件一致：拼音关键词只做检索键前缀匹配，其余为姓名包含关键词
+            people = [p for p in people
+                      if (pinyin_search.matches(p.name, search) if by_pinyin else needle in p.name.lower())]
+            count_cache.put(key, len(people))
+            page_cache.put(self.page_key(key, 1, limit), (people, False))
+            return people, False
+        return None
+
+    def update_suggestions(self, key, empty):
+        """ 搜索没有结果时，从内存中的容错搜索索引取出相似的姓名作为建议 """
+        search = key[1]
+        if not empty or not search:
+            self.suggestionBar.clear()
+            return
+        names = [name for _, name in fuzzy_search.suggest_people(search) if name.lower() != search.lower()]
+        self.suggestionBar.set_suggestions(search, names)
+
+    def on_suggestion_clicked(self, name):
+        """ 事件槽：点击建议，以建议的姓名立即搜索 """
+        self.searchEdit.setText(name)
+        self.searchDebouncer.flush()
 
     def on_card_clicked(self, person_id: str):
         """ 转发点击信号：通知主框架跳转至特定人员的详情页面 """
@@ -1,4 +1,6 @@
 import sys
+from collections import namedtuple
+
 from PySide6.QtCore import Qt, Signal, QSize
 from PySide6.QtWidgets import QFrame, QVBoxLayout, QApplication, QWidget, QHBoxLayout
 from qfluentwidgets import (SubtitleLabel, setFont, FlowLayout, ScrollArea, SmoothMode,
@@ -7,17 +9,42 @@ from sqlalchemy import and_
 
 from mdms.database.session import SessionLocal
 from mdms.database.models import Movie
+from mdms.common.data_loader import DataLoader
+from mdms.common.image_loader import image_loader
+from mdms.common.card_pool import CardPool
+
+
+# 榜单卡片所需的纯数据
+Top100CardData = namedtuple('Top100CardData', ['movie_id', 'title', 'poster_url', 'average_rating'])
+# 榜单查询只投影卡片需要的列
+TOP100_CARD_COLUMNS = (Movie.movie_id, Movie.title, Movie.poster_url, Movie.average_rating)
+
+
+def fetch_top100(session):
+    """ 后台线程：查询 TOP100 电影 """
+    # 只选择有评分且评分大于0的电影，按平均评分降序排序
+    rows = session.query(*TOP100_CARD_COLUMNS).filter(
+        and_(
+            Movie.average_rating > 0,
+            Movie.rating_count > 0  # 确保至少有一个评分
+        )
+    ).order_by(
+        Movie.average_rating.desc()  # 只按评分排序
+    ).limit(100).all()
+    return [Top100CardData._make(row) for row in rows]
 
 
 class Top100MovieCard(QFrame):
     """
     自定义TOP100电影卡片组件 - 专门为TOP100页面优化显示
+    卡片可通过 bind() 重新绑定到其他电影，刷新榜单时复用
     """
     movieClicked = Signal(str)
 
-    def __init__(self, movie_id: str, iconPath: str, name: str, rank: int, rating: float, parent=None):
+    def __init__(self, movie_id: str = None, iconPath: str = None, name: str = "",
+                 rank: int = 0, rating: float = 0.0, parent=None):
         super().__init__(parent)
-        self.movie_id = movie_id
+        self.movie_id = None
         self.setFixedSize(160, 240)
         self.setCursor(Qt.PointingHandCursor)
 
@@ -34,12 +61,9 @@ class Top100MovieCard(QFrame):
             }
         """)
 
-        if not iconPath:
-            iconPath = ":/qfluentwidgets/images/logo.png"
-
         # 1. 排名标签 (保持不变)
         from qfluentwidgets import CaptionLabel
-        self.rankLabel = CaptionLabel(f"#{rank}", self)
+        self.rankLabel = CaptionLabel(self)
         self.rankLabel.setAlignment(Qt.AlignCenter)
         self.rankLabel.setStyleSheet("""
             background-color: #ff6b00;
@@ -52,7 +76,7 @@ class Top100MovieCard(QFrame):
 
         # 2. 封面图片
         from qfluentwidgets import ImageLabel
-        self.iconWidget = ImageLabel(iconPath, self)
+        self.iconWidget = ImageLabel(image_loader.placeholder(QSize(144, 120)), self)
         # 明确固定图片大小
         # 卡片宽度160 - 左右边距各8 = 144宽度。高度固定为120。
         self.iconWidget.setFixedSize(144, 120)
@@ -61,18 +85,17 @@ class Top100MovieCard(QFrame):
         self.iconWidget.setBorderRadius(8, 8, 8, 8)
 
         # 3. 电影名称
-        self.titleLabel = CaptionLabel(name, self)
+        self.titleLabel = CaptionLabel(self)
         self.titleLabel.setAlignment(Qt.AlignCenter)
         # 允许换行
         self.titleLabel.setWordWrap(True)
         # 移除硬性的最大高度限制，让布局决定高度
         # self.titleLabel.setMaximumHeight(40)
-        self.titleLabel.setToolTip(name)
         # 可以设置一个最小高度确保至少显示一行
         self.titleLabel.setMinimumHeight(20)
 
         # 4. 评分标签 (保持不变)
-        self.ratingLabel = CaptionLabel(f"⭐ {rating:.1f}", self)
+        self.ratingLabel = CaptionLabel(self)
         self.ratingLabel.setAlignment(Qt.AlignCenter)
         self.ratingLabel.setStyleSheet("color: #ff6b00; font-weight: bold; margin-bottom: 5px;")
 
@@ -91,6 +114,27 @@ class Top100MovieCard(QFrame):
         self.vBoxLayout.addWidget(self.titleLabel, 1, Qt.AlignCenter) # stretch=1
         self.vBoxLayout.addWidget(self.ratingLabel, 0, Qt.AlignCenter)
 
+        if movie_id is not None:
+            self.bind(movie_id, name, iconPath, rank, rating)
+
+    def bind(self, movie_id: str, title: str, poster_url: str, rank: int, rating: float):
+        """ 将卡片绑定到一部电影：更新排名、标题、评分并重新异步加载封面 """
+        self.movie_id = movie_id
+        self.rankLabel.setText(f"#{rank}")
+        self.titleLabel.setText(title)
+        self.titleLabel.setToolTip(title)
+        self.ratingLabel.setText(f"⭐ {rating:.1f}")
+
+        # 先恢复占位图，封面在后台线程中按目标尺寸解码后再替换
+        self.iconWidget.setImage(image_loader.placeholder(QSize(144, 120)))
+        self.iconWidget.setFixedSize(144, 120)
+        image_loader.load(self.iconWidget, poster_url, QSize(144, 120), self.on_image_loaded)
+
+    def on_image_loaded(self, image):
+        """ 后台解码完成：替换占位图，setImage 会重设控件尺寸，需恢复固定大小 """
+        self.iconWidget.setImage(image)
+        self.iconWidget.setFixedSize(144, 120)
+
     def mouseReleaseEvent(self, e):
         super().mouseReleaseEvent(e)
         self.movieClicked.emit(self.movie_id)
@@ -109,6 +153,8 @@ class Top100GalleryWidget(QFrame):
 
         # 状态变量
         self.cards = []
+        # 后台数据加载器：连续点击刷新时只保留最新一次请求的结果
+        self.loader = DataLoader(self)
 
         # 初始化UI
         self.init_ui(text)
@@ -163,11 +209,22 @@ class Top100GalleryWidget(QFrame):
         self.scrollWidget = QWidget()
         self.scrollWidget.setStyleSheet("background: transparent;")
 
-        self.flowLayout = FlowLayout(self.scrollWidget)
+        # isTight=True：布局跳过卡片池中隐藏的备用卡片
+        self.flowLayout = FlowLayout(self.scrollWidget, isTight=True)
         self.flowLayout.setContentsMargins(0, 0, 0, 0)
         self.flowLayout.setVerticalSpacing(20)
         self.flowLayout.setHorizontalSpacing(20)
 
+        # 空数据提示：常驻布局首位，按需显示
+        self.emptyLabel = CaptionLabel("暂无评分数据", self.scrollWidget)
+        self.emptyLabel.setAlignment(Qt.AlignCenter)
+        self.emptyLabel.setStyleSheet("font-size: 16px; color: #999; padding: 50px;")
+        self.emptyLabel.setVisible(False)
+        self.flowLayout.addWidget(self.emptyLabel)
+
+        # 卡片复用池：刷新榜单时重新绑定已有卡片，而不是销毁重建
+        self.cardPool = CardPool(self.scrollWidget, self.flowLayout, self.create_card)
+
         self.scrollArea.setWidget(self.scrollWidget)
         self.mainLayout.addWidget(self.scrollArea)
 
@@ -180,83 +237,31 @@ class Top100GalleryWidget(QFrame):
         self.load_top100_data()
 
     def load_top100_data(self):
-        """加载TOP100电影数据"""
+        """加载TOP100电影数据：查询在后台线程执行，完成后刷新界面"""
         if SessionLocal is None:
             print("Warning: Database SessionLocal is None.")
             return
 
-        session = SessionLocal()
-        try:
-            # 查询TOP100电影：只选择有评分且评分大于0的电影，按平均评分降序排序
-            movies = session.query(Movie).filter(
-                and_(
-                    Movie.average_rating > 0,
-                    Movie.rating_count > 0  # 确保至少有一个评分
-                )
-            ).order_by(
-                Movie.average_rating.desc()  # 只按评分排序
-            ).limit(100).all()
-
-            # 渲染界面
-            self.update_gallery(movies)
-
-        except Exception as e:
-            print(f"加载TOP100电影失败: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            session.close()
+        self.loader.submit('top100', fetch_top100, self.update_gallery, action='top100.load')
 
-    def update_gallery(self, movies):
-        """清除旧卡片并显示新卡片"""
-
-        # 1. 清空 FlowLayout (修复版)
-        # qfluentwidgets 的 FlowLayout.takeAt() 有时直接返回 Widget，而不是 QLayoutItem
-        if self.flowLayout:
-            # 如果组件支持 removeAllWidgets (新版特性)，优先使用
-            if hasattr(self.flowLayout, 'removeAllWidgets'):
-                self.flowLayout.removeAllWidgets()
-            else:
-                # 兼容性手动清空
-                while self.flowLayout.count():
-                    item = self.flowLayout.takeAt(0)
-                    if item is None:
-                        break
-
-                    # 关键修改：判断取出来的是 Widget 本身还是 LayoutItem
-                    if isinstance(item, QWidget):
-                        # 如果直接是 Widget (Top100MovieCard)
-                        item.deleteLater()
-                    elif hasattr(item, 'widget'):
-                        # 如果是 QLayoutItem 包装器
-                        widget = item.widget()
-                        if widget:
-                            widget.deleteLater()
-
-        self.cards.clear()
-
-        # 2. 创建新卡片
-        if not movies:
-            no_data_label = CaptionLabel("暂无评分数据", self.scrollWidget)
-            no_data_label.setAlignment(Qt.AlignCenter)
-            no_data_label.setStyleSheet("font-size: 16px; color: #999; padding: 50px;")
-            self.flowLayout.addWidget(no_data_label)
-            return
+    def create_card(self):
+        """卡片池工厂：创建一张空白卡片并绑定点击信号"""
+        card = Top100MovieCard(parent=self.scrollWidget)
+        card.movieClicked.connect(self.on_card_clicked)
+        return card
 
-        for index, movie in enumerate(movies):
-            # 创建电影卡片
-            card = Top100MovieCard(
-                movie_id=movie.movie_id,
-                iconPath=movie.poster_url,
-                name=movie.title,
-                rank=index + 1,
-                rating=float(movie.average_rating),
-                parent=self.scrollWidget
-            )
-
-            card.movieClicked.connect(self.on_card_clicked)
-            self.flowLayout.addWidget(card)
-            self.cards.append(card)
+    def update_gallery(self, movies):
+        """将榜单数据重新绑定到卡片池中的卡片"""
+        # 空数据提示
+        self.emptyLabel.setVisible(not movies)
+
+        # 复用已有卡片，排名由数据顺序决定
+        ranked = list(enumerate(movies, start=1))
+        self.cards = self.cardPool.update(
+            ranked,
+            lambda card, item: card.bind(item[1].movie_id, item[1].title, item[1].poster_url,
+                                         item[0], float(item[1].average_rating))
+        )
 
     def on_card_clicked(self, movie_id: str):
         """处理卡片点击事件"""